@@ -7,11 +7,13 @@ import logging
 # Load environment variables
 load_dotenv()
 
-# Import routes
-from src.routes.reviews import reviews_bp
-from src.routes.auth import auth_bp
-
 def create_app():
+    # Imported here rather than at module level: spawned helper processes (the password
+    # hashing pool) re-import __main__, and the route modules build every controller
+    from src.routes.reviews import reviews_bp
+    from src.routes.auth import auth_bp
+    from src.routes.system import system_bp
+    
     app = Flask(__name__)
     CORS(app)
     
@@ -21,6 +23,7 @@ def create_app():
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(reviews_bp, url_prefix='/api/reviews')
+    app.register_blueprint(system_bp, url_prefix='/api/system')
     
     @app.route('/health')
     def health_check():
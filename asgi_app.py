@@ -0,0 +1,61 @@
+"""ASGI serving mode: the Flask app's routes on Quart.
+
+The handlers call the same controller and service methods as the Flask app,
+running their blocking MongoDB and upstream I/O on the event loop's default
+executor, which is sized by ASGI_SYNC_WORKERS (default 64).
+
+    hypercorn 'asgi_app:create_asgi_app()' --bind 0.0.0.0:5000
+    uvicorn --factory asgi_app:create_asgi_app --port 5000
+"""
+from concurrent.futures import ThreadPoolExecutor
+from quart import Quart
+from dotenv import load_dotenv
+import asyncio
+import os
+import logging
+
+# Load environment variables
+load_dotenv()
+
+try:
+    from quart_cors import cors
+except ImportError:  # CORS headers are optional in the async mode
+    cors = None
+
+def create_asgi_app():
+    # Imported lazily for the same reason as in app.create_app
+    from src.aio.routes import auth_bp, reviews_bp, system_bp, reviews_controller
+    
+    app = Quart(__name__)
+    if cors is not None:
+        app = cors(app)
+    
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+    
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(reviews_bp, url_prefix='/api/reviews')
+    app.register_blueprint(system_bp, url_prefix='/api/system')
+    
+    @app.before_serving
+    async def startup():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+            max_workers=int(os.getenv('ASGI_SYNC_WORKERS', 64)),
+            thread_name_prefix='asgi-sync'
+        ))
+    
+    @app.after_serving
+    async def shutdown():
+        reviews_controller.reviews_service.upstream.close()
+    
+    @app.route('/health')
+    async def health_check():
+        return {'status': 'healthy'}
+    
+    return app
+
+if __name__ == '__main__':
+    app = create_asgi_app()
+    port = int(os.getenv('PORT', 5000))
+    app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,97 @@
+"""Measure parsing throughput and memory for upstream review payloads, comparing
+per-entry Review.from_google_review calls with the Review.from_google_reviews
+batch parser, and holding a whole location in memory with parsing page by page.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_review_parsing [--rows 100000] [--page-size 50]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from src.modal.review import Review
+
+STAR_RATINGS = ('ONE', 'TWO', 'THREE', 'FOUR', 'FIVE')
+LOCATION = 'accounts/1/locations/1'
+
+
+def make_payload(rows: int):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    reviews = []
+    for index in range(rows):
+        timestamp = (base + timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        reviews.append({
+            'reviewId': f"review-{index}",
+            'reviewer': {'displayName': f"Reviewer {index}", 'profilePhotoUrl': f"https://example.com/{index}.png"},
+            'starRating': STAR_RATINGS[index % 5],
+            'comment': 'Great service and friendly staff. ' * 4,
+            'createTime': timestamp,
+            'updateTime': timestamp
+        })
+    return reviews
+
+
+def pages(reviews, page_size: int):
+    for start in range(0, len(reviews), page_size):
+        yield reviews[start:start + page_size]
+
+
+def per_entry(page):
+    return [Review.from_google_review(review_data, LOCATION) for review_data in page]
+
+
+def batch(page):
+    return Review.from_google_reviews(page, LOCATION)
+
+
+def throughput(parse, reviews, page_size: int) -> float:
+    started = time.perf_counter()
+    for page in pages(reviews, page_size):
+        parse(page)
+    return time.perf_counter() - started
+
+
+def peak_memory(reviews, page_size: int, keep_all: bool) -> int:
+    """Peak bytes allocated while parsing, beyond the payload itself"""
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for page in pages(reviews, page_size):
+        models = batch(page)
+        if keep_all:
+            kept.extend(models)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    reviews = make_payload(args.rows)
+    sample = reviews[:args.page_size]
+    assert per_entry(sample) == batch(sample)
+
+    print(f"rows: {args.rows}, rows per page: {args.page_size}")
+    results = {}
+    for name, parse in (('per entry', per_entry), ('batch', batch)):
+        seconds = min(throughput(parse, reviews, args.page_size) for _ in range(3))
+        results[name] = seconds
+        print(f"{name:>17}: {args.rows / seconds:11,.0f} reviews/s")
+    print(f"{'speedup':>17}: {results['per entry'] / results['batch']:11.1f}x")
+
+    whole = peak_memory(reviews, args.page_size, keep_all=True)
+    paged = peak_memory(reviews, args.page_size, keep_all=False)
+    print(f"{'model size':>17}: {whole / args.rows:11.0f} bytes/review")
+    print(f"{'whole location':>17}: {whole / 1024:11,.0f} KiB peak")
+    print(f"{'page by page':>17}: {paged / 1024:11,.0f} KiB peak")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""Measure review search latency on a synthetic corpus: the in-process inverted
+index used by REVIEWS_SEARCH_BACKEND=memory and, given a MongoDB URI, the $text
+index used by REVIEWS_SEARCH_BACKEND=text.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_review_search [--rows 1000000] [--repeat 20]
+        [--mongodb-uri mongodb://localhost:27017 --database ai_hub_bench]
+
+The MongoDB run loads the corpus into ``--database`` and drops it afterwards;
+never point it at a database holding real reviews.
+"""
+import argparse
+import random
+import resource
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.migrations.schema import INDEX_SCHEMA
+from src.services.review_search import TextIndexSearch, _IndexSnapshot
+
+LOCATIONS = [f"accounts/1/locations/{index}" for index in range(20)]
+COMMON_WORDS = ('great', 'service', 'food', 'staff', 'friendly', 'place', 'good', 'time', 'order', 'price')
+# Searched for below, at decreasing frequency
+RARE_WORDS = ('parking', 'refund', 'allergy', 'sommelier')
+FILLER = [f"word{index}" for index in range(5000)]
+
+QUERIES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ('common term', 'service', {}),
+    ('rare term', 'sommelier', {}),
+    ('two terms', 'refund parking', {}),
+    ('reviewer name', 'reviewer42', {}),
+    ('term + rating', 'food', {'rating': {'$lte': 2}}),
+    ('term + location', 'allergy', {'location': LOCATIONS[3]}),
+    ('term + dates', 'staff', {'created_at': {'$gte': datetime(2024, 6, 1), '$lte': datetime(2024, 6, 30)}}),
+]
+
+
+def make_documents(rows: int, seed: int = 7):
+    generator = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    for index in range(rows):
+        words = generator.choices(COMMON_WORDS, k=4) + generator.choices(FILLER, k=8)
+        for position, word in enumerate(RARE_WORDS):
+            if generator.random() < 0.1 / 10 ** position:
+                words.append(word)
+        generator.shuffle(words)
+        yield {
+            'external_id': f"review-{index}",
+            'reviewer': {'name': f"Reviewer{index % 10000}"},
+            'rating': generator.randint(1, 5),
+            'content': ' '.join(words),
+            'created_at': base + timedelta(seconds=index * 31),
+            'location': LOCATIONS[index % len(LOCATIONS)],
+            'platform': 'google'
+        }
+
+
+def latencies(search: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        search()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def report(name: str, search: Callable[[str, Dict[str, Any]], int], repeat: int):
+    print(f"\n{name}")
+    print(f"{'query':>17}  {'matches':>9}  {'p50 ms':>8}  {'p95 ms':>8}")
+    for label, text, query in QUERIES:
+        matches = search(text, query)
+        p50, p95 = latencies(lambda: search(text, query), repeat)
+        print(f"{label:>17}  {matches:>9,}  {p50:8.2f}  {p95:8.2f}")
+
+
+def bench_memory(rows: int, repeat: int, limit: int):
+    started = time.perf_counter()
+    snapshot = _IndexSnapshot(generation=0)
+    for document in make_documents(rows):
+        snapshot.add(document)
+    snapshot.index.freeze()
+    build_seconds = time.perf_counter() - started
+    print(f"inverted index: {rows:,} reviews, {snapshot.index.term_count:,} terms, "
+          f"built in {build_seconds:.1f}s, process peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MiB")
+
+    def search(text: str, query: Dict[str, Any]) -> int:
+        total_count, _ = snapshot.index.search(text, limit, 0, snapshot.matcher(query))
+        return total_count
+
+    report('memory backend (ranking and filtering, excluding the page fetch)', search, repeat)
+
+
+def bench_text(uri: str, database: str, rows: int, repeat: int, limit: int):
+    from pymongo import MongoClient
+
+    client = MongoClient(uri)
+    db = client[database]
+    if db.reviews.estimated_document_count():
+        client.close()
+        raise SystemExit(f"{database}.reviews is not empty; choose an unused --database")
+    try:
+        collection = db.reviews
+        batch = []
+        started = time.perf_counter()
+        for document in make_documents(rows):
+            batch.append(document)
+            if len(batch) == 10000:
+                collection.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            collection.insert_many(batch, ordered=False)
+        collection.create_indexes([spec.to_index_model() for spec in INDEX_SCHEMA['reviews']])
+        print(f"\nloaded and indexed {rows:,} reviews in {time.perf_counter() - started:.1f}s")
+
+        backend = TextIndexSearch(collection)
+
+        def search(text: str, query: Dict[str, Any]) -> int:
+            _, total_count, _ = backend.search(text, query, 0, limit, {'external_id': 1, 'content': 1, 'rating': 1})
+            return total_count
+
+        report('text backend (page fetch and exact count)', search, repeat)
+    finally:
+        client.drop_database(database)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=25, help='results per page')
+    parser.add_argument('--mongodb-uri', help='also benchmark the $text backend against this server')
+    parser.add_argument('--database', default='ai_hub_bench')
+    args = parser.parse_args()
+
+    bench_memory(args.rows, args.repeat, args.limit)
+    if args.mongodb_uri:
+        bench_text(args.mongodb_uri, args.database, args.rows, args.repeat, args.limit)
+
+
+if __name__ == '__main__':
+    main()
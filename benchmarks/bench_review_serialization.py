@@ -0,0 +1,72 @@
+"""Compare the Review model round trip against the direct document path used by
+ReviewsService.find_reviews when serializing a page of stored reviews.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_review_serialization [--rows 100] [--repeat 2000]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from src.modal.review import Review
+from src.services.reviews_service import ReviewsService
+from src.utils.json_response import dumps, isoformat_utc, orjson
+from src.utils.review_filters import LEAN_REVIEW_FIELDS
+
+
+def make_documents(rows: int):
+    base = datetime(2024, 1, 1)
+    documents = []
+    for index in range(rows):
+        created_at = base + timedelta(minutes=index)
+        documents.append({
+            '_id': ObjectId(),
+            'external_id': f"review-{index}",
+            'reviewer': {'name': f"Reviewer {index}", 'profile_photo': f"https://example.com/{index}.png"},
+            'rating': index % 5 + 1,
+            'content': 'Great service and friendly staff. ' * 4,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'platform': 'google',
+            'location': 'accounts/1/locations/1'
+        })
+    return documents
+
+
+def model_path(documents):
+    reviews = []
+    for document in documents:
+        review_dict = Review.from_dict(document).to_dict()
+        reviews.append({field: review_dict[field] for field in LEAN_REVIEW_FIELDS})
+    return json.dumps({'reviews': reviews}, default=isoformat_utc).encode('utf-8')
+
+
+def direct_path(documents):
+    reviews = [ReviewsService._to_response_dict(document, LEAN_REVIEW_FIELDS) for document in documents]
+    return dumps({'reviews': reviews})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    documents = make_documents(args.rows)
+    assert json.loads(model_path(documents)) == json.loads(direct_path(documents))
+
+    print(f"encoder: {'orjson' if orjson else 'json'}, rows per page: {args.rows}, pages: {args.repeat}")
+    results = {}
+    for name, func in (('model round trip', model_path), ('direct', direct_path)):
+        seconds = min(timeit.repeat(lambda: func(documents), number=args.repeat, repeat=3))
+        results[name] = seconds
+        print(f"{name:>17}: {seconds / args.repeat * 1e6:9.1f} us/page")
+    print(f"{'speedup':>17}: {results['model round trip'] / results['direct']:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
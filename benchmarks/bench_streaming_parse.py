@@ -0,0 +1,67 @@
+"""Compare peak memory and time for one large upstream page: decoding the whole
+body with json and building every Review, against streaming the body through
+StreamedObject and building Reviews batch by batch as ReviewsService.pull_reviews does.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_streaming_parse [--rows 50000] [--batch-size 500] [--chunk-size 65536]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.bench_review_parsing import LOCATION, make_payload
+from src.modal.review import Review
+from src.utils.json_stream import StreamedObject
+
+
+def chunks(body: bytes, chunk_size: int):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+def buffered(body: bytes, batch_size: int, chunk_size: int) -> int:
+    data = json.loads(body)
+    reviews = Review.from_google_reviews(data.get('reviews', []), LOCATION)
+    return len(reviews)
+
+
+def streamed(body: bytes, batch_size: int, chunk_size: int) -> int:
+    count = 0
+    page = StreamedObject(chunks(body, chunk_size), 'reviews', batch_size)
+    for batch in page.batches():
+        count += len(Review.from_google_reviews(batch, LOCATION))
+    return count
+
+
+def measure(parse, body: bytes, batch_size: int, chunk_size: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = parse(body, batch_size, chunk_size)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    body = json.dumps({'reviews': make_payload(args.rows), 'nextPageToken': 'next'}).encode('utf-8')
+    print(f"rows: {args.rows}, body: {len(body) / 1024 / 1024:.1f} MiB, "
+          f"batch size: {args.batch_size}, chunk size: {args.chunk_size}")
+    for name, parse in (('buffered', buffered), ('streamed', streamed)):
+        count, seconds, peak = measure(parse, body, args.batch_size, args.chunk_size)
+        assert count == args.rows
+        print(f"{name:>9}: {seconds:6.2f}s, {peak / 1024 / 1024:8.1f} MiB peak beyond the body")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Load test comparing the WSGI (Flask) and ASGI (Quart) serving modes.
+
+Start both servers against the same database, e.g.
+
+    gunicorn 'app:create_app()' --workers 4 --threads 8 --bind 127.0.0.1:5000
+    hypercorn 'asgi_app:create_asgi_app()' --workers 4 --bind 127.0.0.1:5001
+
+then run from the repository root:
+
+    python -m benchmarks.load_test --token <access token> \
+        --target wsgi=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:5001
+
+Each target is hit with ``--concurrency`` simultaneous clients for ``--duration``
+seconds and the throughput and latency percentiles are printed side by side.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+async def run_target(base_url: str, path: str, token: str, concurrency: int, duration: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    headers = {'Authorization': f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99)
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Compare serving modes under concurrent load')
+    parser.add_argument('--target', action='append', required=True, help='name=base_url, repeatable')
+    parser.add_argument('--path', default='/api/reviews/?limit=24')
+    parser.add_argument('--token', default='', help='access token for authenticated paths')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=30.0)
+    args = parser.parse_args()
+
+    columns = ('requests', 'errors', 'rps', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms')
+    print(f"{'target':>8} " + ' '.join(f"{column:>10}" for column in columns))
+    for target in args.target:
+        name, _, base_url = target.partition('=')
+        result = await run_target(base_url, args.path, args.token, args.concurrency, args.duration)
+        print(f"{name:>8} " + ' '.join(
+            f"{result[column]:>10.1f}" if isinstance(result[column], float) else f"{result[column]:>10}"
+            for column in columns
+        ))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
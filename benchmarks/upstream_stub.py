@@ -0,0 +1,140 @@
+"""Local stand-in for the upstream reviews API, for exercising timeouts, retries
+and rate limiting without touching the real service.
+
+Run from the repository root:
+
+    python -m benchmarks.upstream_stub [--port 8081] [--pages 20] [--page-size 50]
+        [--latency 0.05] [--fail-rate 0.1] [--throttle-rate 0.1] [--retry-after 1]
+        [--max-rps 20]
+
+then point the application at it with ``REVIEWS_API_URL=http://127.0.0.1:8081``.
+POST /google/getReviews serves deterministic synthetic pages per location.
+A ``--fail-rate`` fraction of requests get a 503 and a ``--throttle-rate``
+fraction get a 429 with Retry-After. Requests beyond ``--max-rps`` per second
+also get a 429. Request counts by status are printed on exit.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAR_RATINGS = ('ONE', 'TWO', 'THREE', 'FOUR', 'FIVE')
+
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.statuses = Counter()
+        self.window_started = time.monotonic()
+        self.window_requests = 0
+        self.lock = threading.Lock()
+
+    def over_rate(self) -> bool:
+        if not self.args.max_rps:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_started >= 1:
+                self.window_started = now
+                self.window_requests = 0
+            self.window_requests += 1
+            return self.window_requests > self.args.max_rps
+
+    def record(self, status: int):
+        with self.lock:
+            self.statuses[status] += 1
+
+
+def make_page(location: str, page: int, page_size: int, pages: int):
+    newest = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    reviews = []
+    for offset in range(page_size):
+        index = page * page_size + offset
+        timestamp = (newest - timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        reviews.append({
+            'reviewId': f"{location}-{index}",
+            'reviewer': {'displayName': f"Reviewer {index}", 'profilePhotoUrl': f"https://example.com/{index}.png"},
+            'starRating': STAR_RATINGS[index % 5],
+            'comment': 'Great service and friendly staff.',
+            'createTime': timestamp,
+            'updateTime': timestamp
+        })
+    data = {'reviews': reviews}
+    if page + 1 < pages:
+        data['nextPageToken'] = str(page + 1)
+    return data
+
+
+def make_handler(state: StubState):
+    args = state.args
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.path != '/google/getReviews':
+                return self.respond(404, {'error': 'not found'})
+            if args.latency:
+                time.sleep(args.latency)
+            if state.over_rate() or random.random() < args.throttle_rate:
+                return self.respond(429, {'error': 'rate limited'}, {'Retry-After': str(args.retry_after)})
+            if random.random() < args.fail_rate:
+                return self.respond(503, {'error': 'unavailable'})
+
+            payload = json.loads(body or b'{}')
+            page = int(payload.get('pageToken') or 0)
+            self.respond(200, make_page(payload.get('selectedLocation', 'stub'), page, args.page_size, args.pages))
+
+        def respond(self, status, data, headers=None):
+            encoded = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(encoded)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            try:
+                self.wfile.write(encoded)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up, e.g. its read timeout fired during --latency
+                return state.record('disconnected')
+            state.record(status)
+
+        def log_message(self, format, *log_args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--max-rps', type=int, default=0, help='answer 429 beyond this many requests per second')
+    args = parser.parse_args()
+
+    state = StubState(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"upstream stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"responses by status: {dict(state.statuses)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from quart import request, jsonify
+from quart.utils import run_sync
+from src.controllers.auth_controller import BUSY_HEADERS, AuthController
+from src.services.password_service import PasswordHasherBusy
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncAuthController(AuthController):
+    """Quart front end over AuthController's shared methods.
+
+    The request body is read on the event loop. The shared methods do blocking
+    MongoDB and password-pool work, so they run on the loop's default executor.
+    Both serving modes therefore share the user cache, revocation list and
+    REFRESH_TOKEN_MODE handling.
+    """
+
+    async def register(self):
+        try:
+            body, status = await run_sync(self.register_body)(await request.get_json(silent=True))
+            return jsonify(body), status
+
+        except PasswordHasherBusy:
+            return jsonify(self.busy_body()), 503, BUSY_HEADERS
+        except Exception as e:
+            logger.error(f"Registration error: {str(e)}")
+            return jsonify({'error': 'Registration failed'}), 500
+
+    async def login(self):
+        try:
+            body, status = await run_sync(self.login_body)(await request.get_json(silent=True))
+            return jsonify(body), status
+
+        except PasswordHasherBusy:
+            return jsonify(self.busy_body()), 503, BUSY_HEADERS
+        except Exception as e:
+            logger.error(f"Login error: {str(e)}")
+            return jsonify({'error': 'Login failed'}), 500
+
+    async def refresh_token(self):
+        try:
+            body, status = await run_sync(self.refresh_token_body)(await request.get_json(silent=True))
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Token refresh error: {str(e)}")
+            return jsonify({'error': 'Token refresh failed'}), 500
+
+    async def logout(self):
+        try:
+            body, status = await run_sync(self.logout_body)(await request.get_json(silent=True))
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Logout error: {str(e)}")
+            return jsonify({'error': 'Logout failed'}), 500
+
+    async def deactivate_user(self, email: str):
+        try:
+            body, status = await run_sync(self.deactivate_user_body)(email)
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Deactivate user error: {str(e)}")
+            return jsonify({'error': 'Failed to update user'}), 500
+
+    async def update_user_role(self, email: str):
+        try:
+            body, status = await run_sync(self.update_user_role_body)(email, await request.get_json(silent=True))
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Update user role error: {str(e)}")
+            return jsonify({'error': 'Failed to update user'}), 500
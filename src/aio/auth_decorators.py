@@ -0,0 +1,41 @@
+from functools import wraps
+from quart import request, jsonify, g
+from src.utils.auth_decorators import verify_authorization_header
+
+def _verify_request_token():
+    """Return the verified access token payload, or an error response tuple"""
+    payload, error = verify_authorization_header(request.headers.get('Authorization'))
+    if error:
+        return None, (jsonify({'error': error}), 401)
+    return payload, None
+
+def require_auth(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        payload, error = _verify_request_token()
+        if error:
+            return error
+        
+        g.current_user_email = payload['email']
+        g.current_user_role = payload['role']
+        
+        return await f(*args, **kwargs)
+    
+    return decorated_function
+
+def require_admin(f):
+    @wraps(f)
+    async def decorated_function(*args, **kwargs):
+        payload, error = _verify_request_token()
+        if error:
+            return error
+        
+        if payload.get('role') != 'admin':
+            return jsonify({'error': 'Admin access required'}), 403
+        
+        g.current_user_email = payload['email']
+        g.current_user_role = payload['role']
+        
+        return await f(*args, **kwargs)
+    
+    return decorated_function
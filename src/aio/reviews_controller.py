@@ -0,0 +1,183 @@
+from quart import request, jsonify, Response, g
+from quart.utils import run_sync, run_sync_iterable
+from src.controllers.reviews_controller import (
+    SEARCH_RETRY_AFTER, ReviewsController, parse_export_args, parse_listing_args, parse_pull_request, parse_search_args
+)
+from src.services.review_search import SearchIndexUnavailable
+from src.utils.review_filters import parse_stats_params
+import logging
+from typing import AsyncIterator, Iterator
+
+logger = logging.getLogger(__name__)
+
+class AsyncReviewsController(ReviewsController):
+    """Quart front end over ReviewsController's shared methods.
+
+    Arguments are parsed on the event loop. The shared methods do blocking
+    MongoDB and cache I/O, so they run on the loop's default executor, which
+    asgi_app sizes with ASGI_SYNC_WORKERS.
+    """
+
+    async def pull_reviews(self):
+        try:
+            try:
+                locations, incremental = parse_pull_request(
+                    await request.get_json(silent=True),
+                    self.default_locations,
+                    allow_unlisted=g.current_user_role == 'admin'
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except PermissionError as e:
+                return jsonify({'error': str(e)}), 403
+
+            return jsonify(await run_sync(self.queue_pull)(locations, incremental, request.path)), 202
+
+        except Exception as e:
+            logger.error(f"Reviews controller error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    async def get_pull_job(self, job_id: str):
+        try:
+            body = await run_sync(self.pull_job_body)(job_id)
+
+            if not body:
+                return jsonify({'error': 'Pull job not found'}), 404
+
+            return jsonify(body)
+
+        except Exception as e:
+            logger.error(f"Get pull job error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    async def get_reviews(self):
+        try:
+            try:
+                params = parse_listing_args(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+
+            etag, body = await run_sync(self.listing_body)(params)
+            return self._conditional_json(body, etag)
+
+        except Exception as e:
+            logger.error(f"Get reviews error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    async def search_reviews(self):
+        try:
+            try:
+                params = parse_search_args(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+
+            etag, body = await run_sync(self.search_body)(params)
+            return self._conditional_json(body, etag)
+
+        except SearchIndexUnavailable:
+            return self._search_unavailable_response()
+        except Exception as e:
+            logger.error(f"Search reviews error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    def _search_unavailable_response(self):
+        response = jsonify({'error': 'Search index is still being built, please retry shortly'})
+        response.headers['Retry-After'] = SEARCH_RETRY_AFTER
+        return response, 503
+
+    async def get_review_stats(self):
+        try:
+            try:
+                params = parse_stats_params(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+
+            etag, body = await run_sync(self.stats_body)(params)
+            return self._conditional_json(body, etag)
+
+        except Exception as e:
+            logger.error(f"Get review stats error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    @staticmethod
+    def _conditional_json(body: bytes, etag: str) -> Response:
+        """See ReviewsController._conditional_json"""
+        if request.if_none_match.contains(etag):
+            response = Response(b'', status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    async def get_review_raw(self, external_id: str):
+        try:
+            body = await run_sync(self.raw_review_body)(external_id)
+
+            if not body:
+                return jsonify({'error': 'Review not found'}), 404
+
+            return jsonify(body)
+
+        except Exception as e:
+            logger.error(f"Get raw review error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    async def export_reviews(self):
+        try:
+            try:
+                params = parse_export_args(request.args)
+            except ValueError as e:
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+
+            chunks, mimetype, headers = await run_sync(self.export_chunks)(**params)
+            return Response(self._stream_in_executor(chunks), mimetype=mimetype, headers=headers)
+
+        except Exception as e:
+            logger.error(f"Export reviews error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+
+    @staticmethod
+    async def _stream_in_executor(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        # Each chunk is produced on the executor; closing releases the cursor when the client goes away
+        try:
+            async for chunk in run_sync_iterable(chunks):
+                yield chunk
+        finally:
+            await run_sync(chunks.close)()
@@ -0,0 +1,79 @@
+from quart import Blueprint
+from src.aio.auth_controller import AsyncAuthController
+from src.aio.auth_decorators import require_auth, require_admin
+from src.aio.reviews_controller import AsyncReviewsController
+from src.aio.system_controller import AsyncSystemController
+
+auth_controller = AsyncAuthController()
+reviews_controller = AsyncReviewsController()
+system_controller = AsyncSystemController(reviews_controller)
+
+auth_bp = Blueprint('auth', __name__)
+reviews_bp = Blueprint('reviews', __name__)
+system_bp = Blueprint('system', __name__)
+
+@auth_bp.route('/register', methods=['POST'])
+async def register():
+    return await auth_controller.register()
+
+@auth_bp.route('/login', methods=['POST'])
+async def login():
+    return await auth_controller.login()
+
+@auth_bp.route('/refresh', methods=['POST'])
+async def refresh_token():
+    return await auth_controller.refresh_token()
+
+@auth_bp.route('/logout', methods=['POST'])
+async def logout():
+    return await auth_controller.logout()
+
+@auth_bp.route('/users/<email>/deactivate', methods=['POST'])
+@require_admin
+async def deactivate_user(email):
+    return await auth_controller.deactivate_user(email)
+
+@auth_bp.route('/users/<email>/role', methods=['PUT'])
+@require_admin
+async def update_user_role(email):
+    return await auth_controller.update_user_role(email)
+
+@reviews_bp.route('/pull', methods=['POST'])
+@require_auth
+async def pull_reviews():
+    return await reviews_controller.pull_reviews()
+
+@reviews_bp.route('/pull/<job_id>', methods=['GET'])
+@require_auth
+async def get_pull_job(job_id):
+    return await reviews_controller.get_pull_job(job_id)
+
+@reviews_bp.route('/', methods=['GET'])
+@require_auth
+async def get_reviews():
+    return await reviews_controller.get_reviews()
+
+@reviews_bp.route('/search', methods=['GET'])
+@require_auth
+async def search_reviews():
+    return await reviews_controller.search_reviews()
+
+@reviews_bp.route('/stats', methods=['GET'])
+@require_auth
+async def get_review_stats():
+    return await reviews_controller.get_review_stats()
+
+@reviews_bp.route('/export', methods=['GET'])
+@require_auth
+async def export_reviews():
+    return await reviews_controller.export_reviews()
+
+@reviews_bp.route('/<external_id>/raw', methods=['GET'])
+@require_auth
+async def get_review_raw(external_id):
+    return await reviews_controller.get_review_raw(external_id)
+
+@system_bp.route('/pool-stats', methods=['GET'])
+@require_admin
+async def get_pool_stats():
+    return await system_controller.get_pool_stats()
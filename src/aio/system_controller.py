@@ -0,0 +1,19 @@
+from quart import jsonify
+from src.controllers.system_controller import SystemController
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AsyncSystemController(SystemController):
+    """Quart front end over SystemController's shared methods"""
+
+    async def get_pool_stats(self):
+        try:
+            return jsonify(self.pool_stats_body())
+
+        except Exception as e:
+            logger.error(f"Pool stats error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
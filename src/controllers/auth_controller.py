@@ -1,135 +1,200 @@
 from flask import request, jsonify
 from src.services.auth_service import AuthService
+from src.services.password_service import PasswordHasherBusy
+from typing import Any, Dict, Optional, Tuple
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+USER_UPDATE_ERROR_STATUSES = {
+    'User not found': 404,
+    'Invalid role. Must be "user" or "admin"': 400
+}
+
+# Sent with the 503 returned while the password hashing pool is saturated
+BUSY_HEADERS = {'Retry-After': '1'}
+
 class AuthController:
+    """Auth endpoints for the Flask app.
+
+    Validation and the service calls live in the *_body methods, which take
+    the parsed JSON instead of the request and return (body, status). They
+    raise PasswordHasherBusy when the hashing pool is saturated; answer it
+    with busy_body() and BUSY_HEADERS. The ASGI controller in src/aio calls
+    the same methods, so both serving modes return the same responses.
+    """
+
     def __init__(self):
         self.auth_service = AuthService()
-    
+
+    def register_body(self, data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        if not data:
+            return {'error': 'No data provided'}, 400
+
+        email = data.get('email', '').strip().lower()
+        password = data.get('password', '')
+
+        # Validate input
+        if not email or not password:
+            return {'error': 'Email and password are required'}, 400
+
+        if not self._is_valid_email(email):
+            return {'error': 'Invalid email format'}, 400
+
+        if len(password) < 6:
+            return {'error': 'Password must be at least 6 characters long'}, 400
+
+        # Self-registration always creates a plain user; admins promote through update_user_role
+        result = self.auth_service.register_user(email, password, 'user')
+
+        if not result['success']:
+            return {'error': result['error']}, 400
+
+        return {
+            'success': True,
+            'message': result['message']
+        }, 201
+
+    def login_body(self, data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        if not data:
+            return {'error': 'No data provided'}, 400
+
+        email = data.get('email', '').strip().lower()
+        password = data.get('password', '')
+
+        if not email or not password:
+            return {'error': 'Email and password are required'}, 400
+
+        result = self.auth_service.login_user(email, password)
+
+        if not result['success']:
+            return {'error': result['error']}, 401
+
+        return {
+            'success': True,
+            'access_token': result['access_token'],
+            'refresh_token': result['refresh_token'],
+            'user': result['user']
+        }, 200
+
+    def refresh_token_body(self, data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        if not data:
+            return {'error': 'No data provided'}, 400
+
+        refresh_token = data.get('refresh_token')
+
+        if not refresh_token:
+            return {'error': 'Refresh token is required'}, 400
+
+        result = self.auth_service.refresh_access_token(refresh_token)
+
+        if not result['success']:
+            return {'error': result['error']}, 401
+
+        return {
+            'success': True,
+            'access_token': result['access_token']
+        }, 200
+
+    def logout_body(self, data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        if not data:
+            return {'error': 'No data provided'}, 400
+
+        refresh_token = data.get('refresh_token')
+
+        if not refresh_token:
+            return {'error': 'Refresh token is required'}, 400
+
+        result = self.auth_service.logout_user(refresh_token)
+
+        if not result['success']:
+            return {'error': result['error']}, 400
+
+        return {
+            'success': True,
+            'message': result['message']
+        }, 200
+
+    def deactivate_user_body(self, email: str) -> Tuple[Dict[str, Any], int]:
+        return self._user_update_body(self.auth_service.deactivate_user(email.strip().lower()))
+
+    def update_user_role_body(self, email: str, data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        if not data:
+            return {'error': 'No data provided'}, 400
+
+        return self._user_update_body(self.auth_service.update_user_role(email.strip().lower(), data.get('role')))
+
+    def busy_body(self) -> Dict[str, Any]:
+        logger.warning("Password hashing pool saturated, rejecting request")
+        return {'error': 'Server busy, please retry shortly'}
+
     def register(self):
         try:
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({'error': 'No data provided'}), 400
-            
-            email = data.get('email', '').strip().lower()
-            password = data.get('password', '')
-            role = "user"
-            
-            # Validate input
-            if not email or not password:
-                return jsonify({'error': 'Email and password are required'}), 400
-            
-            if not self._is_valid_email(email):
-                return jsonify({'error': 'Invalid email format'}), 400
-            
-            if len(password) < 6:
-                return jsonify({'error': 'Password must be at least 6 characters long'}), 400
-            
-            if role not in ['user', 'admin']:
-                return jsonify({'error': 'Invalid role. Must be "user" or "admin"'}), 400
-            
-            # Register user
-            result = self.auth_service.register_user(email, password, role)
-            
-            if not result['success']:
-                return jsonify({'error': result['error']}), 400
-            
-            return jsonify({
-                'success': True,
-                'message': result['message']
-            }), 201
-            
+            body, status = self.register_body(request.get_json(silent=True))
+            return jsonify(body), status
+
+        except PasswordHasherBusy:
+            return jsonify(self.busy_body()), 503, BUSY_HEADERS
         except Exception as e:
             logger.error(f"Registration error: {str(e)}")
             return jsonify({'error': 'Registration failed'}), 500
-    
+
     def login(self):
         try:
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({'error': 'No data provided'}), 400
-            
-            email = data.get('email', '').strip().lower()
-            password = data.get('password', '')
-            
-            if not email or not password:
-                return jsonify({'error': 'Email and password are required'}), 400
-            
-            # Login user
-            result = self.auth_service.login_user(email, password)
-            
-            if not result['success']:
-                return jsonify({'error': result['error']}), 401
-            
-            return jsonify({
-                'success': True,
-                'access_token': result['access_token'],
-                'refresh_token': result['refresh_token'],
-                'user': result['user']
-            })
-            
+            body, status = self.login_body(request.get_json(silent=True))
+            return jsonify(body), status
+
+        except PasswordHasherBusy:
+            return jsonify(self.busy_body()), 503, BUSY_HEADERS
         except Exception as e:
             logger.error(f"Login error: {str(e)}")
             return jsonify({'error': 'Login failed'}), 500
-    
+
     def refresh_token(self):
         try:
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({'error': 'No data provided'}), 400
-            
-            refresh_token = data.get('refresh_token')
-            
-            if not refresh_token:
-                return jsonify({'error': 'Refresh token is required'}), 400
-            
-            result = self.auth_service.refresh_access_token(refresh_token)
-            
-            if not result['success']:
-                return jsonify({'error': result['error']}), 401
-            
-            return jsonify({
-                'success': True,
-                'access_token': result['access_token']
-            })
-            
+            body, status = self.refresh_token_body(request.get_json(silent=True))
+            return jsonify(body), status
+
         except Exception as e:
             logger.error(f"Token refresh error: {str(e)}")
             return jsonify({'error': 'Token refresh failed'}), 500
-    
+
     def logout(self):
         try:
-            data = request.get_json()
-            
-            if not data:
-                return jsonify({'error': 'No data provided'}), 400
-            
-            refresh_token = data.get('refresh_token')
-            
-            if not refresh_token:
-                return jsonify({'error': 'Refresh token is required'}), 400
-            
-            result = self.auth_service.logout_user(refresh_token)
-            
-            if not result['success']:
-                return jsonify({'error': result['error']}), 400
-            
-            return jsonify({
-                'success': True,
-                'message': result['message']
-            })
-            
+            body, status = self.logout_body(request.get_json(silent=True))
+            return jsonify(body), status
+
         except Exception as e:
             logger.error(f"Logout error: {str(e)}")
             return jsonify({'error': 'Logout failed'}), 500
-    
+
+    def deactivate_user(self, email: str):
+        try:
+            body, status = self.deactivate_user_body(email)
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Deactivate user error: {str(e)}")
+            return jsonify({'error': 'Failed to update user'}), 500
+
+    def update_user_role(self, email: str):
+        try:
+            body, status = self.update_user_role_body(email, request.get_json(silent=True))
+            return jsonify(body), status
+
+        except Exception as e:
+            logger.error(f"Update user role error: {str(e)}")
+            return jsonify({'error': 'Failed to update user'}), 500
+
+    def _user_update_body(self, result: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        if result['success']:
+            return {
+                'success': True,
+                'message': result['message']
+            }, 200
+        return {'error': result['error']}, USER_UPDATE_ERROR_STATUSES.get(result['error'], 500)
+
     def _is_valid_email(self, email: str) -> bool:
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
\ No newline at end of file
+        return re.match(pattern, email) is not None
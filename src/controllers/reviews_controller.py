@@ -1,40 +1,329 @@
-from flask import request, jsonify
+from flask import request, jsonify, Response, g, stream_with_context
 from src.services.reviews_service import ReviewsService
+from src.services.pull_engine import ReviewsPullEngine
+from src.services.pull_job_service import PullJobService
+from src.services.response_cache import create_response_cache
+from src.services.review_search import SearchIndexUnavailable
+from src.utils.export_formats import EXPORT_FORMATS, ndjson_chunks, csv_chunks, gzip_chunks
+from src.utils.json_response import dumps
+from src.utils.pagination import decode_cursor
+from src.utils.review_filters import build_review_query, cursor_sort_key, parse_review_fields, parse_stats_params
 import logging
+import os
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 logger = logging.getLogger(__name__)
 
+DEFAULT_LOCATION = "accounts/114352055335928504389/locations/2304352560750351356"
+COUNT_MODES = ('exact', 'estimated', 'none')
+SEARCH_COUNT_MODES = ('exact', 'none')
+MAX_SEARCH_LENGTH = 200
+# Seconds a client is asked to wait while the in-memory search index is first built
+SEARCH_RETRY_AFTER = '5'
+MAX_PULL_LOCATIONS = int(os.getenv('REVIEWS_PULL_MAX_LOCATIONS', 1000))
+
+def configured_locations() -> List[str]:
+    return [
+        location.strip()
+        for location in os.getenv('REVIEWS_LOCATIONS', DEFAULT_LOCATION).split(',')
+        if location.strip()
+    ]
+
+def parse_pull_request(
+    data: Optional[Dict[str, Any]],
+    default_locations: List[str],
+    allow_unlisted: bool = False,
+    max_locations: int = MAX_PULL_LOCATIONS
+) -> Tuple[List[str], bool]:
+    """Return the locations and incremental flag of a pull request body.
+
+    Client-supplied ``locations`` are de-duplicated, capped at ``max_locations``
+    and, unless ``allow_unlisted``, limited to ``default_locations``. Raises
+    ValueError if the body is invalid and PermissionError for unlisted locations.
+    """
+    data = data or {}
+    locations = data.get('locations')
+    if not locations:
+        return default_locations, bool(data.get('incremental', False))
+    if not isinstance(locations, list) or not all(isinstance(location, str) and location for location in locations):
+        raise ValueError('locations must be a list of location names')
+    locations = list(dict.fromkeys(locations))
+    if len(locations) > max_locations:
+        raise ValueError(f"At most {max_locations} locations can be pulled at once")
+    if not allow_unlisted:
+        configured = set(default_locations)
+        unlisted = [location for location in locations if location not in configured]
+        if unlisted:
+            raise PermissionError(f"Only admins can pull locations outside REVIEWS_LOCATIONS: {', '.join(unlisted[:5])}")
+    return locations, bool(data.get('incremental', False))
+
+def parse_page_args(args: Mapping[str, str]) -> Tuple[int, int]:
+    """Return the page number and page size, clamping the size to 1-100"""
+    try:
+        page = int(args.get('page', 1))
+        limit = int(args.get('limit', 24))
+    except ValueError:
+        raise ValueError('Page and limit must be valid integers')
+    
+    if page < 1:
+        page = 1
+    if limit < 1:
+        limit = 24
+    if limit > 100: 
+        limit = 100
+    return page, limit
+
+def parse_listing_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Validate review listing query parameters into ReviewsService.find_reviews arguments.
+
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    page, limit = parse_page_args(args)
+    
+    count = args.get('count')
+    if count is not None and count not in COUNT_MODES:
+        raise ValueError(f"count must be one of: {', '.join(COUNT_MODES)}")
+    
+    query, sort_field, sort_direction = build_review_query(args)
+    fields = parse_review_fields(args.get('fields'))
+    
+    after = None
+    after_token = args.get('after')
+    if after_token:
+        try:
+            after = decode_cursor(after_token, cursor_sort_key(sort_field, sort_direction))
+        except ValueError:
+            raise ValueError('after must be a cursor returned by a previous page with the same sort')
+    
+    return {
+        'page': page,
+        'limit': limit,
+        'query': query,
+        'after': after,
+        'count': count,
+        'sort_field': sort_field,
+        'sort_direction': sort_direction,
+        'fields': fields
+    }
+
+def parse_search_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Validate review search query parameters into ReviewsService.search_reviews arguments.
+
+    ``q`` is required; the listing filters, ``page``, ``limit``, ``fields`` and
+    ``count`` ('exact' or 'none') apply as for listings. Results are always
+    ranked by relevance, so ``sort``, ``order`` and ``after`` are not used.
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    text = (args.get('q') or '').strip()
+    if not text:
+        raise ValueError('q is required')
+    if len(text) > MAX_SEARCH_LENGTH:
+        raise ValueError(f"q must be at most {MAX_SEARCH_LENGTH} characters")
+    
+    page, limit = parse_page_args(args)
+    count = args.get('count', 'exact')
+    if count not in SEARCH_COUNT_MODES:
+        raise ValueError(f"count must be one of: {', '.join(SEARCH_COUNT_MODES)}")
+    query, _, _ = build_review_query(args)
+    
+    return {
+        'text': text,
+        'page': page,
+        'limit': limit,
+        'query': query,
+        'count': count,
+        'fields': parse_review_fields(args.get('fields'))
+    }
+
+def parse_export_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Validate review export query parameters into ReviewsController.export_chunks arguments.
+
+    ``format`` is one of EXPORT_FORMATS and ``gzip`` compresses the stream; the
+    listing filters, sort and ``fields`` apply as for listings. Raises
+    ValueError with a client-facing message on invalid input.
+    """
+    export_format = args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    query, sort_field, sort_direction = build_review_query(args)
+    return {
+        'export_format': export_format,
+        'use_gzip': args.get('gzip', '').lower() in ('1', 'true', 'yes'),
+        'query': query,
+        'sort_field': sort_field,
+        'sort_direction': sort_direction,
+        'fields': parse_review_fields(args.get('fields'))
+    }
+
 class ReviewsController:
+    """Review endpoints for the Flask app.
+
+    Everything past argument parsing lives in the methods that do not touch the
+    request (queue_pull, listing_body, export_chunks, ...). The ASGI controller
+    in src/aio calls the same methods, so both serving modes return the same
+    responses.
+    """
+
     def __init__(self):
         self.reviews_service = ReviewsService()
+        self.pull_engine = ReviewsPullEngine(self.reviews_service)
+        self.pull_job_service = PullJobService(self.pull_engine, self.reviews_service.mongodb_service)
+        self.default_locations = configured_locations()
+        self.response_cache = create_response_cache(self.reviews_service.generation)
+
+    def queue_pull(self, locations: List[str], incremental: bool, path: str) -> Dict[str, Any]:
+        """Enqueue a pull job and return the 202 response body"""
+        logger.info(f"Queueing review pull for {len(locations)} locations (incremental={incremental})")
+
+        job = self.pull_job_service.enqueue(locations, {'incremental': incremental})
+
+        return {
+            'success': True,
+            'job_id': job.job_id,
+            'status': 'queued',
+            'status_url': f"{path.rstrip('/')}/{job.job_id}",
+            'metadata': {
+                'selected_locations': locations,
+                'incremental': incremental,
+                'queued_at': job.created_at.isoformat()
+            }
+        }
+
+    def pull_job_body(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.pull_job_service.get_job(job_id)
+        if not job:
+            return None
+        return {
+            'success': True,
+            **job.to_status_dict()
+        }
+
+    def listing_body(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Return the ETag and encoded body of a review page, from the response cache when possible"""
+        cache_key = self.response_cache.key(params)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self.reviews_service.find_reviews(**params)
+        body = dumps({
+            'success': True,
+            'total_count': result['total_count'],
+            'page': result['current_page'],
+            'limit': params['limit'],
+            'total_pages': result['total_pages'],
+            'next_cursor': result['next_cursor'],
+            'has_more': result['has_more'],
+            'reviews': result['reviews']
+        })
+        # A failed lookup yields an empty page that must not be cached
+        if 'error' in result:
+            return self.response_cache.etag(body), body
+        return self.response_cache.put(cache_key, body), body
+
+    def search_body(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Return the ETag and encoded body of a page of search results"""
+        cache_key = self.response_cache.key({'search': params})
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self.reviews_service.search_reviews(**params)
+        body = dumps({
+            'success': True,
+            'query': params['text'],
+            'total_count': result['total_count'],
+            'page': result['current_page'],
+            'limit': params['limit'],
+            'total_pages': result['total_pages'],
+            'has_more': result['has_more'],
+            'reviews': result['reviews']
+        })
+        # Results from an index that is still catching up must not outlive the rebuild
+        if 'error' in result or result.get('stale'):
+            return self.response_cache.etag(body), body
+        return self.response_cache.put(cache_key, body), body
+
+    def stats_body(self, params: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Return the ETag and encoded body of the review stats"""
+        cache_key = self.response_cache.key({'stats': params})
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        stats = self.reviews_service.stats.get_stats(**params)
+        body = dumps({'success': True, **stats})
+        return self.response_cache.put(cache_key, body), body
+
+    def raw_review_body(self, external_id: str) -> Optional[Dict[str, Any]]:
+        review = self.reviews_service.get_review_raw(external_id)
+        if not review:
+            return None
+        return {
+            'success': True,
+            'external_id': review['external_id'],
+            'platform': review.get('platform'),
+            'original_data': review.get('original_data', {})
+        }
+
+    def export_chunks(
+        self,
+        export_format: str,
+        use_gzip: bool,
+        query: Dict[str, Any],
+        sort_field: str,
+        sort_direction: int,
+        fields: Tuple[str, ...]
+    ) -> Tuple[Iterator[bytes], str, Dict[str, str]]:
+        """Return the encoded export stream with its mimetype and headers"""
+        reviews = self.reviews_service.iter_reviews(query, fields, sort_field, sort_direction)
+        if export_format == 'csv':
+            chunks = csv_chunks(reviews, fields)
+        else:
+            chunks = ndjson_chunks(reviews)
+
+        filename = f"reviews-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{export_format}"
+        headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+        if use_gzip:
+            chunks = gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+
+        logger.info(f"Exporting reviews as {export_format} (gzip={use_gzip})")
+        return chunks, EXPORT_FORMATS[export_format], headers
 
     def pull_reviews(self):
         try:
-            selected_location = "accounts/114352055335928504389/locations/2304352560750351356"
+            try:
+                locations, incremental = parse_pull_request(
+                    request.get_json(silent=True),
+                    self.default_locations,
+                    allow_unlisted=g.current_user_role == 'admin'
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except PermissionError as e:
+                return jsonify({'error': str(e)}), 403
 
-            logger.info(f"Fetching reviews for: {selected_location}")
+            return jsonify(self.queue_pull(locations, incremental, request.path)), 202
 
-            result = self.reviews_service.pull_reviews(selected_location)
+        except Exception as e:
+            logger.error(f"Reviews controller error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+        
+    def get_pull_job(self, job_id: str):
+        try:
+            body = self.pull_job_body(job_id)
 
-            if not result['success']:
-                return jsonify({
-                    'error': 'Failed to fetch reviews',
-                    'details': result['error']
-                }), 500
+            if not body:
+                return jsonify({'error': 'Pull job not found'}), 404
 
-            return jsonify({
-                'success': True,
-                'total_count': len(result['reviews']),
-                'saved_count': result['saved_count'],
-                'skipped_count': result['skipped_count'],
-                'metadata': {
-                    'selected_location': selected_location,
-                    'pulled_at': datetime.utcnow().isoformat()
-                }
-            })
+            return jsonify(body)
 
         except Exception as e:
-            logger.error(f"Reviews controller error: {str(e)}")
+            logger.error(f"Get pull job error: {str(e)}")
             return jsonify({
                 'error': 'Internal server error',
                 'message': str(e)
@@ -42,36 +331,118 @@ class ReviewsController:
         
     def get_reviews(self):
         try:
-            page = int(request.args.get('page', 1))
-            limit = int(request.args.get('limit', 24))
+            try:
+                params = parse_listing_args(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
             
-            if page < 1:
-                page = 1
-            if limit < 1:
-                limit = 24
-            if limit > 100: 
-                limit = 100
-                
-            result = self.reviews_service.find_reviews(page=page, limit=limit)
+            etag, body = self.listing_body(params)
+            return self._conditional_json(body, etag)
+
+        except Exception as e:
+            logger.error(f"Get reviews error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+    
+    def search_reviews(self):
+        try:
+            try:
+                params = parse_search_args(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+            
+            etag, body = self.search_body(params)
+            return self._conditional_json(body, etag)
+
+        except SearchIndexUnavailable:
+            return self._search_unavailable_response()
+        except Exception as e:
+            logger.error(f"Search reviews error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+    
+    def _search_unavailable_response(self):
+        response = jsonify({'error': 'Search index is still being built, please retry shortly'})
+        response.headers['Retry-After'] = SEARCH_RETRY_AFTER
+        return response, 503
+    
+    def get_review_stats(self):
+        try:
+            try:
+                params = parse_stats_params(request.args)
+            except ValueError as e:
+                logger.error(f"Invalid query parameters: {str(e)}")
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
             
+            etag, body = self.stats_body(params)
+            return self._conditional_json(body, etag)
+
+        except Exception as e:
+            logger.error(f"Get review stats error: {str(e)}")
             return jsonify({
-                'success': True,
-                'total_count': result['total_count'],
-                'page': page,
-                'limit': limit,
-                'total_pages': result['total_pages'],
-                'reviews': result['reviews']
-            })
-
-        except ValueError as e:
-            logger.error(f"Invalid query parameters: {str(e)}")
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+    
+    @staticmethod
+    def _conditional_json(body: bytes, etag: str) -> Response:
+        """Answer a matching If-None-Match with 304, otherwise send the body with its ETag"""
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Clients may keep the response but must revalidate it before reuse
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    def get_review_raw(self, external_id: str):
+        try:
+            body = self.raw_review_body(external_id)
+            
+            if not body:
+                return jsonify({'error': 'Review not found'}), 404
+            
+            return jsonify(body)
+
+        except Exception as e:
+            logger.error(f"Get raw review error: {str(e)}")
             return jsonify({
-                'error': 'Invalid query parameters',
-                'message': 'Page and limit must be valid integers'
-            }), 400
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
+    
+    def export_reviews(self):
+        try:
+            try:
+                params = parse_export_args(request.args)
+            except ValueError as e:
+                return jsonify({
+                    'error': 'Invalid query parameters',
+                    'message': str(e)
+                }), 400
+            
+            chunks, mimetype, headers = self.export_chunks(**params)
+            return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
         except Exception as e:
-            logger.error(f"Get reviews error: {str(e)}")
+            logger.error(f"Export reviews error: {str(e)}")
             return jsonify({
                 'error': 'Internal server error',
                 'message': str(e)
-            }), 500
\ No newline at end of file
+            }), 500
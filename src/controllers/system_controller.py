@@ -0,0 +1,35 @@
+from flask import jsonify
+from src.services.mongodb_service import pool_stats
+from src.services.user_cache import user_cache
+from src.services.revocation_service import revocation_list
+from src.utils.auth_decorators import token_cache
+from typing import Any, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SystemController:
+    def __init__(self, reviews_controller):
+        self.reviews_controller = reviews_controller
+
+    def pool_stats_body(self) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'mongodb_pool': pool_stats(),
+            'token_cache': token_cache.stats(),
+            'user_cache': user_cache.stats(),
+            'refresh_token_revocations': revocation_list.stats(),
+            'response_cache': self.reviews_controller.response_cache.stats(),
+            'review_search': self.reviews_controller.reviews_service.search_backend.stats()
+        }
+
+    def get_pool_stats(self):
+        try:
+            return jsonify(self.pool_stats_body())
+
+        except Exception as e:
+            logger.error(f"Pool stats error: {str(e)}")
+            return jsonify({
+                'error': 'Internal server error',
+                'message': str(e)
+            }), 500
@@ -0,0 +1,66 @@
+"""Schema migration CLI.
+
+    python -m src.migrations status              # compare live indexes with the declared schema
+    python -m src.migrations apply               # build missing indexes and record the schema version
+    python -m src.migrations datetimes-status    # count documents still holding string timestamps
+    python -m src.migrations datetimes           # convert string timestamps to BSON dates
+        [--collection NAME ...] [--batch-size N] [--pause SECONDS]
+    python -m src.migrations rebuild-stats       # recompute the daily review stats buckets
+        [--location NAME]
+"""
+import argparse
+import json
+import logging
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.migrations.datetime_migration import DatetimeMigration, DATETIME_FIELDS
+from src.migrations.index_manager import IndexMigrationManager
+from src.services.mongodb_service import get_client, close_client
+from src.services.response_cache import GenerationCounter, REVIEWS_GENERATION
+from src.services.review_stats_service import ReviewStatsService
+import os
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.migrations', description='Manage MongoDB indexes and stored data')
+    parser.add_argument('command', choices=['status', 'apply', 'datetimes-status', 'datetimes', 'rebuild-stats'])
+    parser.add_argument('--collection', action='append', choices=list(DATETIME_FIELDS),
+                        help='limit the datetime migration to these collections (repeatable)')
+    parser.add_argument('--batch-size', type=int, default=500, help='documents converted per bulk write')
+    parser.add_argument('--pause', type=float, default=0.1, help='seconds to sleep between batches')
+    parser.add_argument('--location', help='limit rebuild-stats to one location')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = get_client()[os.getenv('DATABASE_NAME', 'ai_hub')]
+
+    try:
+        if args.command in ('status', 'apply'):
+            manager = IndexMigrationManager(db)
+            result = manager.status() if args.command == 'status' else manager.apply()
+            failed = bool(result['conflicts'])
+        elif args.command == 'rebuild-stats':
+            result = ReviewStatsService(db.reviews, db.review_daily_stats).rebuild(args.location)
+            # Cached stats responses were computed from the replaced buckets
+            GenerationCounter(db.cache_generations, REVIEWS_GENERATION).bump()
+            failed = False
+        else:
+            migration = DatetimeMigration(db, batch_size=args.batch_size, pause_seconds=args.pause)
+            if args.command == 'datetimes-status':
+                result = migration.status(args.collection)
+                failed = False
+            else:
+                result = migration.run(args.collection)
+                failed = any(counts['failed'] for counts in result.values())
+    finally:
+        close_client()
+
+    print(json.dumps(result, indent=2, default=str))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+logger = logging.getLogger(__name__)
+
+# Timestamp fields that older releases stored as ISO 8601 strings
+DATETIME_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'reviews': ('created_at', 'updated_at'),
+    'users': ('created_at', 'updated_at'),
+    'refresh_tokens': ('expires_at', 'created_at'),
+    'review_sync_state': ('latest_update_time', 'synced_at'),
+    'pull_jobs': ('created_at', 'started_at', 'finished_at'),
+    'schema_metadata': ('applied_at',),
+}
+
+class DatetimeMigration:
+    """Rewrites string timestamps as BSON dates in _id order, one batch at a time.
+
+    Progress is checkpointed per collection in schema_metadata, so an
+    interrupted run resumes after the last converted batch; the checkpoint is
+    cleared once a collection is finished. Each update is conditional on the
+    old string value, so documents rewritten concurrently by the application
+    are left alone. ``pause_seconds`` is slept between batches to limit the
+    load on a live cluster.
+    """
+
+    CHECKPOINT_PREFIX = 'datetimes:'
+    COMPLETED_ID = 'datetimes'
+
+    def __init__(self, db: Database, batch_size: int = 500, pause_seconds: float = 0.1):
+        self.db = db
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.metadata_collection = db.schema_metadata
+
+    def status(self, collections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Count the documents in each collection that still hold string timestamps"""
+        return {
+            name: {
+                'pending': self.db[name].count_documents(self._pending_filter(DATETIME_FIELDS[name])),
+                'resume_after': self._checkpoint(name)
+            }
+            for name in self._collection_names(collections)
+        }
+
+    def run(self, collections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        return {name: self.migrate_collection(name) for name in self._collection_names(collections)}
+
+    def ensure(self):
+        """Convert every collection unless an earlier run recorded that it finished"""
+        if self.metadata_collection.find_one({'_id': self.COMPLETED_ID}) is not None:
+            return
+        result = self.run()
+        failed = sum(counts['failed'] for counts in result.values())
+        if failed:
+            logger.warning(f"{failed} timestamps could not be parsed; see datetimes-status")
+        self.metadata_collection.update_one(
+            {'_id': self.COMPLETED_ID},
+            {'$set': {'completed_at': datetime.utcnow(), 'result': result}},
+            upsert=True
+        )
+        logger.info(f"Stored timestamps converted: {result}")
+
+    def migrate_collection(self, name: str) -> Dict[str, int]:
+        fields = DATETIME_FIELDS[name]
+        collection = self.db[name]
+        last_id = self._checkpoint(name)
+        converted = 0
+        failed = 0
+
+        while True:
+            query = self._pending_filter(fields)
+            if last_id is not None:
+                query['_id'] = {'$gt': last_id}
+            batch = list(collection.find(query, {field: 1 for field in fields}).sort('_id', 1).limit(self.batch_size))
+            if not batch:
+                break
+
+            operations = []
+            for document in batch:
+                changes, unparsed = self._converted_fields(document, fields)
+                failed += len(unparsed)
+                for field in unparsed:
+                    logger.warning(f"{name} {document['_id']}: cannot parse {field}={document[field]!r}")
+                if changes:
+                    expected = {field: document[field] for field in changes}
+                    operations.append(UpdateOne({'_id': document['_id'], **expected}, {'$set': changes}))
+            if operations:
+                converted += collection.bulk_write(operations, ordered=False).modified_count
+
+            last_id = batch[-1]['_id']
+            self._save_checkpoint(name, last_id)
+            logger.info(f"{name}: converted {converted} documents so far")
+            if len(batch) < self.batch_size:
+                break
+            time.sleep(self.pause_seconds)
+
+        self.metadata_collection.delete_one({'_id': self.CHECKPOINT_PREFIX + name})
+        return {'converted': converted, 'failed': failed}
+
+    @staticmethod
+    def _pending_filter(fields: Tuple[str, ...]) -> Dict[str, Any]:
+        return {'$or': [{field: {'$type': 'string'}} for field in fields]}
+
+    @staticmethod
+    def _converted_fields(document: Dict[str, Any], fields: Tuple[str, ...]) -> Tuple[Dict[str, datetime], List[str]]:
+        changes = {}
+        unparsed = []
+        for field in fields:
+            value = document.get(field)
+            if not isinstance(value, str):
+                continue
+            parsed = parse_legacy_datetime(value)
+            if parsed is None:
+                unparsed.append(field)
+            else:
+                changes[field] = parsed
+        return changes, unparsed
+
+    def _collection_names(self, collections: Optional[Iterable[str]]) -> List[str]:
+        names = list(collections) if collections else list(DATETIME_FIELDS)
+        unknown = [name for name in names if name not in DATETIME_FIELDS]
+        if unknown:
+            raise ValueError(f"No datetime fields declared for: {', '.join(unknown)}")
+        return names
+
+    def _checkpoint(self, name: str):
+        checkpoint = self.metadata_collection.find_one({'_id': self.CHECKPOINT_PREFIX + name})
+        return checkpoint.get('last_id') if checkpoint else None
+
+    def _save_checkpoint(self, name: str, last_id: Any):
+        self.metadata_collection.update_one(
+            {'_id': self.CHECKPOINT_PREFIX + name},
+            {'$set': {'last_id': last_id, 'updated_at': datetime.utcnow()}},
+            upsert=True
+        )
+
+
+def parse_legacy_datetime(value: str) -> Optional[datetime]:
+    """Parse a stored ISO 8601 string into a naive UTC datetime, or None if it is malformed"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
@@ -0,0 +1,148 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo.database import Database
+from src.migrations.datetime_migration import DatetimeMigration
+from src.migrations.review_stats_backfill import ReviewStatsBackfill
+from src.migrations.schema import INDEX_SCHEMA, SCHEMA_VERSION, TEXT_INDEX_KEY, IndexSpec
+from src.services.password_service import in_hashing_process
+
+logger = logging.getLogger(__name__)
+
+# Options that change index semantics; a mismatch needs a manual drop and rebuild
+COMPARED_OPTIONS = ('unique', 'expireAfterSeconds', 'sparse', 'partialFilterExpression')
+
+class IndexMigrationManager:
+    """Compares the live indexes against INDEX_SCHEMA and builds the missing ones.
+
+    The applied schema version is recorded in the schema_metadata collection so
+    processes that find it up to date skip the list_indexes comparison entirely.
+    """
+
+    METADATA_ID = 'indexes'
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.metadata_collection = db.schema_metadata
+
+    def applied_version(self) -> Optional[int]:
+        metadata = self.metadata_collection.find_one({'_id': self.METADATA_ID})
+        return metadata.get('version') if metadata else None
+
+    def plan(self) -> Tuple[Dict[str, List[IndexSpec]], List[str]]:
+        """Return the missing indexes per collection and descriptions of conflicting ones"""
+        missing: Dict[str, List[IndexSpec]] = {}
+        conflicts: List[str] = []
+        for collection_name, specs in INDEX_SCHEMA.items():
+            existing = self._existing_indexes(collection_name)
+            for spec in specs:
+                index = existing.get(spec.key_tuple)
+                if index is None:
+                    missing.setdefault(collection_name, []).append(spec)
+                    continue
+                for option in COMPARED_OPTIONS:
+                    if index.get(option) != spec.options.get(option):
+                        conflicts.append(
+                            f"{collection_name} index {index['name']} has {option}={index.get(option)}, "
+                            f"expected {spec.options.get(option)}"
+                        )
+        return missing, conflicts
+
+    def status(self) -> Dict[str, Any]:
+        missing, conflicts = self.plan()
+        return {
+            'declared_version': SCHEMA_VERSION,
+            'applied_version': self.applied_version(),
+            'missing': {name: [str(spec) for spec in specs] for name, specs in missing.items()},
+            'conflicts': conflicts
+        }
+
+    def apply(self) -> Dict[str, Any]:
+        """Build every missing index and record the schema version when nothing conflicts"""
+        missing, conflicts = self.plan()
+        created = {}
+        for collection_name, specs in missing.items():
+            names = self.db[collection_name].create_indexes([spec.to_index_model() for spec in specs])
+            created[collection_name] = names
+            logger.info(f"Created indexes on {collection_name}: {', '.join(names)}")
+
+        for conflict in conflicts:
+            logger.warning(f"Index conflict, not applied: {conflict}")
+        if not conflicts:
+            self.metadata_collection.update_one(
+                {'_id': self.METADATA_ID},
+                {'$set': {'version': SCHEMA_VERSION, 'applied_at': datetime.utcnow()}},
+                upsert=True
+            )
+
+        return {
+            'version': SCHEMA_VERSION,
+            'created': created,
+            'conflicts': conflicts
+        }
+
+    def ensure(self):
+        """Apply the schema unless the recorded version is already current"""
+        applied_version = self.applied_version()
+        if applied_version is not None and applied_version >= SCHEMA_VERSION:
+            logger.info(f"Index schema version {applied_version} is up to date")
+            return
+        result = self.apply()
+        logger.info(f"Index schema migrated to version {result['version']}")
+
+    def _existing_indexes(self, collection_name: str) -> Dict[Tuple[Tuple[str, int], ...], Dict[str, Any]]:
+        existing = {}
+        for index in self.db[collection_name].list_indexes():
+            key = tuple((name, int(direction)) if isinstance(direction, (int, float)) else (name, direction)
+                        for name, direction in index['key'].items())
+            if any(direction == 'text' for _, direction in key):
+                key = TEXT_INDEX_KEY
+            existing[key] = index
+        return existing
+
+
+_started_pid: Optional[int] = None
+_started_lock = threading.Lock()
+
+
+def ensure_indexes_in_background(db: Database):
+    """Run the startup index check once per process on a daemon thread.
+
+    After the indexes, string timestamps left by older releases are converted
+    once per database (see DatetimeMigration.ensure), and the daily review
+    stats are backfilled for reviews saved by older releases (see
+    ReviewStatsBackfill.ensure). Never blocks the caller,
+    so worker boot does not wait on the database.
+    Set MONGODB_AUTO_MIGRATE=false to rely on ``python -m src.migrations apply``,
+    ``python -m src.migrations datetimes`` and
+    ``python -m src.migrations rebuild-stats`` instead.
+    """
+    global _started_pid
+    if os.getenv('MONGODB_AUTO_MIGRATE', 'true').lower() in ('0', 'false', 'no'):
+        return
+    # Only the hashing pool is skipped: uvicorn/hypercorn --workers children serve requests
+    if in_hashing_process():
+        return
+    pid = os.getpid()
+    with _started_lock:
+        if _started_pid == pid:
+            return
+        _started_pid = pid
+
+    def run():
+        try:
+            IndexMigrationManager(db).ensure()
+        except Exception as e:
+            logger.error(f"Index migration failed: {str(e)}")
+        try:
+            DatetimeMigration(db).ensure()
+        except Exception as e:
+            logger.error(f"Datetime migration failed: {str(e)}")
+        try:
+            ReviewStatsBackfill(db).ensure()
+        except Exception as e:
+            logger.error(f"Review stats backfill failed: {str(e)}")
+
+    threading.Thread(target=run, name='index-migration', daemon=True).start()
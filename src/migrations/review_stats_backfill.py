@@ -0,0 +1,36 @@
+import logging
+from datetime import datetime
+from pymongo.database import Database
+from src.services.response_cache import GenerationCounter, REVIEWS_GENERATION
+from src.services.review_stats_service import ReviewStatsService
+
+logger = logging.getLogger(__name__)
+
+class ReviewStatsBackfill:
+    """Builds review_daily_stats for reviews saved before the save path maintained it.
+
+    Runs a full ReviewStatsService.rebuild once per database and records that
+    it finished in schema_metadata. Until then, a rating edit on an older
+    review applies its delta to a bucket that was never counted; the rebuild
+    replaces those buckets with the true totals.
+    """
+
+    COMPLETED_ID = 'review_stats'
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.metadata_collection = db.schema_metadata
+
+    def ensure(self):
+        """Rebuild every bucket unless an earlier run recorded that it finished"""
+        if self.metadata_collection.find_one({'_id': self.COMPLETED_ID}) is not None:
+            return
+        result = ReviewStatsService(self.db.reviews, self.db.review_daily_stats).rebuild()
+        # Cached stats responses were computed from the partial buckets
+        GenerationCounter(self.db.cache_generations, REVIEWS_GENERATION).bump()
+        self.metadata_collection.update_one(
+            {'_id': self.COMPLETED_ID},
+            {'$set': {'completed_at': datetime.utcnow(), 'result': result}},
+            upsert=True
+        )
+        logger.info(f"Review stats backfilled: {result}")
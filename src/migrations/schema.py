@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple, Union
+from pymongo import IndexModel
+
+# Bump whenever INDEX_SCHEMA changes so running deployments re-check their indexes
+SCHEMA_VERSION = 7
+
+# Relative weight of each field in review search relevance, for both search backends
+REVIEW_TEXT_WEIGHTS = {'content': 1, 'reviewer.name': 2}
+
+# MongoDB lists every text index under these internal keys, whatever fields it covers
+TEXT_INDEX_KEY = (('_fts', 'text'), ('_ftsx', 1))
+
+@dataclass
+class IndexSpec:
+    keys: List[Tuple[str, Union[int, str]]]
+    options: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def key_tuple(self) -> Tuple[Tuple[str, Union[int, str]], ...]:
+        if any(direction == 'text' for _, direction in self.keys):
+            return TEXT_INDEX_KEY
+        return tuple(self.keys)
+    
+    def to_index_model(self) -> IndexModel:
+        return IndexModel(self.keys, **self.options)
+    
+    def __str__(self) -> str:
+        keys = ', '.join(f"{name}: {direction}" for name, direction in self.keys)
+        options = ''.join(f", {name}={value}" for name, value in self.options.items())
+        return f"{{{keys}}}{options}"
+
+
+# Review listing indexes follow equality field, then sort field, then _id
+# (equality, sort, range), so a listing with at most one of the equality filters
+# (location, platform, reviewer, rating) and any sort is served in index order
+# without an in-memory sort. Range filters (min_rating/max_rating, since/until)
+# are checked against the documents the sort index yields rather than leading
+# an index: a range ahead of the sort key would force an in-memory sort. Combining
+# several equality filters uses one of these indexes and filters the rest.
+INDEX_SCHEMA: Dict[str, List[IndexSpec]] = {
+    'reviews': [
+        IndexSpec([("external_id", 1)], {'unique': True}),
+        IndexSpec([("created_at", -1), ("_id", -1)]),
+        IndexSpec([("updated_at", -1), ("_id", -1)]),
+        IndexSpec([("rating", -1), ("_id", -1)]),
+        IndexSpec([("location", 1), ("created_at", -1), ("_id", -1)]),
+        IndexSpec([("location", 1), ("updated_at", -1), ("_id", -1)]),
+        IndexSpec([("location", 1), ("rating", -1), ("_id", -1)]),
+        IndexSpec([("platform", 1), ("created_at", -1), ("_id", -1)]),
+        IndexSpec([("platform", 1), ("updated_at", -1), ("_id", -1)]),
+        IndexSpec([("platform", 1), ("rating", -1), ("_id", -1)]),
+        IndexSpec([("reviewer.name", 1), ("created_at", -1), ("_id", -1)]),
+        IndexSpec([("reviewer.name", 1), ("updated_at", -1), ("_id", -1)]),
+        IndexSpec([("reviewer.name", 1), ("rating", -1), ("_id", -1)]),
+        IndexSpec([("rating", 1), ("created_at", -1), ("_id", -1)]),
+        IndexSpec([("rating", 1), ("updated_at", -1), ("_id", -1)]),
+        IndexSpec(
+            [("content", "text"), ("reviewer.name", "text")],
+            {'weights': REVIEW_TEXT_WEIGHTS, 'default_language': 'english', 'name': 'review_text'}
+        ),
+    ],
+    'review_revisions': [
+        IndexSpec([("external_id", 1), ("superseded_at", -1)]),
+    ],
+    'review_daily_stats': [
+        IndexSpec([("location", 1), ("day", 1)], {'unique': True}),
+    ],
+    'users': [
+        IndexSpec([("email", 1)], {'unique': True}),
+    ],
+    'refresh_tokens': [
+        IndexSpec([("token", 1)], {'unique': True}),
+        IndexSpec([("expires_at", 1)], {'expireAfterSeconds': 0}),
+    ],
+    'review_sync_state': [
+        IndexSpec([("location", 1)], {'unique': True}),
+    ],
+    'pull_jobs': [
+        IndexSpec([("job_id", 1)], {'unique': True}),
+        IndexSpec([("status", 1), ("created_at", 1)]),
+    ],
+    'user_invalidations': [
+        IndexSpec([("created_at", 1)], {'expireAfterSeconds': 3600}),
+    ],
+    'refresh_token_revocations': [
+        IndexSpec([("jti", 1)], {'unique': True}),
+        IndexSpec([("created_at", 1)]),
+        IndexSpec([("expires_at", 1)], {'expireAfterSeconds': 0}),
+    ],
+}
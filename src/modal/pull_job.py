@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, field
+import uuid
+
+@dataclass
+class PullJob:
+    job_id: str
+    locations: List[str]
+    options: Dict[str, Any] = field(default_factory=dict)
+    status: str = 'queued'  # 'queued', 'running', 'completed' or 'failed'
+    completed_locations: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        if self.created_at is None:
+            self.created_at = datetime.utcnow()
+    
+    @classmethod
+    def create_job(cls, locations: List[str], options: Dict[str, Any] = None) -> 'PullJob':
+        """Create a new queued pull job"""
+        return cls(
+            job_id=uuid.uuid4().hex,
+            locations=list(locations),
+            options=options or {}
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for MongoDB storage"""
+        return {
+            'job_id': self.job_id,
+            'locations': self.locations,
+            'options': self.options,
+            'status': self.status,
+            'completed_locations': self.completed_locations,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+    
+    def to_status_dict(self) -> Dict[str, Any]:
+        """Public view of the job for status polling"""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'progress': {
+                'completed_locations': self.completed_locations,
+                'total_locations': len(self.locations)
+            },
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    @classmethod
+    def from_dict(cls, job_dict: Dict[str, Any]) -> 'PullJob':
+        """Create from dictionary"""
+        return cls(
+            job_id=job_dict.get('job_id', ''),
+            locations=job_dict.get('locations', []),
+            options=job_dict.get('options', {}),
+            status=job_dict.get('status', 'queued'),
+            completed_locations=job_dict.get('completed_locations', 0),
+            result=job_dict.get('result'),
+            error=job_dict.get('error'),
+            created_at=job_dict.get('created_at'),
+            started_at=job_dict.get('started_at'),
+            finished_at=job_dict.get('finished_at')
+        )
+    
+    def __str__(self) -> str:
+        return f"PullJob(job_id={self.job_id}, status={self.status})"
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 import secrets
+from src.migrations.datetime_migration import parse_legacy_datetime
 
 @dataclass
 class RefreshToken:
@@ -41,8 +42,8 @@ class RefreshToken:
         return {
             'token': self.token,
             'user_email': self.user_email,
-            'expires_at': self.expires_at.isoformat(),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at,
+            'created_at': self.created_at,
             'is_revoked': self.is_revoked
         }
     
@@ -52,18 +53,16 @@ class RefreshToken:
         token = cls(
             token=token_dict.get('token', ''),
             user_email=token_dict.get('user_email', ''),
-            expires_at=cls._parse_datetime(token_dict.get('expires_at')),
-            created_at=cls._parse_datetime(token_dict.get('created_at')),
+            expires_at=_stored_datetime(token_dict.get('expires_at')) or datetime.utcnow(),
+            created_at=_stored_datetime(token_dict.get('created_at')),
             is_revoked=token_dict.get('is_revoked', False)
         )
         token._id = str(token_dict.get('_id', ''))
         return token
-    
-    @staticmethod
-    def _parse_datetime(date_input: Any) -> datetime:
-        """Parse datetime string"""
-        if isinstance(date_input, datetime):
-            return date_input
-        if isinstance(date_input, str):
-            return datetime.fromisoformat(date_input)
-        return datetime.utcnow()
\ No newline at end of file
+
+
+def _stored_datetime(value: Any) -> Optional[datetime]:
+    # Tokens written before the datetime migration hold ISO strings; unparseable ones count as expired
+    if isinstance(value, str):
+        return parse_legacy_datetime(value)
+    return value
@@ -1,13 +1,32 @@
-from datetime import datetime
-from typing import Optional, Dict, Any
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Optional, Dict, Any, List
 from dataclasses import dataclass
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+RATING_MAP = {
+    'ONE': 1,
+    'TWO': 2,
+    'THREE': 3,
+    'FOUR': 4,
+    'FIVE': 5
+}
+
+# Everything to_dict stores; original_data carries edits such as owner replies
+CONTENT_HASH_FIELDS = (
+    'external_id', 'reviewer', 'rating', 'content', 'created_at',
+    'updated_at', 'platform', 'location', 'original_data'
+)
+
+@dataclass(frozen=True, slots=True)
 class Reviewer:
     name: str
     profile_photo: Optional[str] = None
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Review:
     external_id: str
     reviewer: Reviewer
@@ -17,6 +36,7 @@ class Review:
     updated_at: Optional[datetime]
     platform: str
     original_data: Dict[str, Any]
+    location: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -27,12 +47,24 @@ class Review:
             },
             'rating': self.rating,
             'content': self.content,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
             'platform': self.platform,
+            'location': self.location,
             'original_data': self.original_data
         }
     
+    @staticmethod
+    def content_hash(review_dict: Dict[str, Any]) -> str:
+        """Stable digest of a document produced by to_dict, used to detect edited reviews.
+
+        Timestamps are hashed as UTC at millisecond precision so the digest
+        survives a round trip through BSON.
+        """
+        fields = {field: review_dict.get(field) for field in CONTENT_HASH_FIELDS}
+        encoded = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=_hash_default)
+        return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+    
     @classmethod
     def from_dict(cls, review_dict: Dict[str, Any]) -> 'Review':
         reviewer_data = review_dict.get('reviewer', {})
@@ -46,17 +78,25 @@ class Review:
             reviewer=reviewer,
             rating=review_dict.get('rating', 0),
             content=review_dict.get('content', ''),
-            created_at=cls._parse_datetime(review_dict.get('created_at')),
-            updated_at=cls._parse_datetime(review_dict.get('updated_at')),
+            created_at=review_dict.get('created_at'),
+            updated_at=review_dict.get('updated_at'),
             platform=review_dict.get('platform', 'unknown'),
-            original_data=review_dict.get('original_data', {})
+            original_data=review_dict.get('original_data', {}),
+            location=review_dict.get('location')
         )
 
     @classmethod
-    def from_google_review(cls, review_data: Dict[str, Any]) -> 'Review':
+    def from_google_review(
+        cls,
+        review_data: Dict[str, Any],
+        location: Optional[str] = None,
+        parse_datetime: Optional[Callable[[Any], Optional[datetime]]] = None
+    ) -> 'Review':
+        parse_datetime = parse_datetime or cls._parse_datetime
+        reviewer_data = review_data.get('reviewer') or {}
         reviewer = Reviewer(
-            name=review_data.get('reviewer', {}).get('displayName', 'Anonymous'),
-            profile_photo=review_data.get('reviewer', {}).get('profilePhotoUrl')
+            name=reviewer_data.get('displayName', 'Anonymous'),
+            profile_photo=reviewer_data.get('profilePhotoUrl')
         )
         
         return cls(
@@ -64,30 +104,48 @@ class Review:
             reviewer=reviewer,
             rating=cls._normalize_rating(review_data.get('starRating')),
             content=review_data.get('comment', review_data.get('text', '')),
-            created_at=cls._parse_datetime(review_data.get('createTime')),
-            updated_at=cls._parse_datetime(review_data.get('updateTime')),
+            created_at=parse_datetime(review_data.get('createTime')),
+            updated_at=parse_datetime(review_data.get('updateTime')),
             platform='google',
-            original_data=review_data
+            original_data=review_data,
+            location=location
         )
     
+    @classmethod
+    def from_google_reviews(cls, reviews_data: List[Dict[str, Any]], location: Optional[str] = None) -> List['Review']:
+        """Convert a whole upstream page with from_google_review, skipping malformed entries.
+
+        Timestamps are parsed once per distinct string across the page, since
+        createTime and updateTime are usually identical.
+        """
+        parsed_times: Dict[str, Optional[datetime]] = {}
+        
+        def parse_datetime(value: Any) -> Optional[datetime]:
+            if not isinstance(value, str):
+                return cls._parse_datetime(value)
+            if value not in parsed_times:
+                parsed_times[value] = cls._parse_datetime(value)
+            return parsed_times[value]
+        
+        reviews = []
+        for review_data in reviews_data:
+            try:
+                reviews.append(cls.from_google_review(review_data, location, parse_datetime))
+            except Exception as e:
+                logger.warning(f"Error creating review model: {str(e)}")
+        
+        return reviews
+    
     @staticmethod
     def _normalize_rating(star_rating: Any) -> int:
         """Convert star rating to numeric value"""
         if isinstance(star_rating, (int, float)):
             return int(star_rating)
-            
-        rating_map = {
-            'ONE': 1,
-            'TWO': 2,
-            'THREE': 3,
-            'FOUR': 4,
-            'FIVE': 5
-        }
-        return rating_map.get(star_rating, 0)
+        return RATING_MAP.get(star_rating, 0)
     
     @staticmethod
     def _parse_datetime(date_input: Any) -> Optional[datetime]:
-        """Parse datetime string or return datetime object"""
+        """Parse an upstream timestamp string or return datetime object"""
         if not date_input:
             return None
             
@@ -111,4 +169,12 @@ class Review:
         return f"Review(external_id={self.external_id}, rating={self.rating}, reviewer={self.reviewer.name})"
     
     def __repr__(self) -> str:
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
+
+
+def _hash_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat(timespec='milliseconds')
+    return str(value)
\ No newline at end of file
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+from dataclasses import dataclass
+
+@dataclass
+class ReviewSyncState:
+    location: str
+    latest_update_time: Optional[datetime] = None
+    last_page_token: Optional[str] = None
+    synced_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        if self.synced_at is None:
+            self.synced_at = datetime.utcnow()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for MongoDB storage"""
+        return {
+            'location': self.location,
+            'latest_update_time': self.latest_update_time,
+            'last_page_token': self.last_page_token,
+            'synced_at': self.synced_at
+        }
+    
+    @classmethod
+    def from_dict(cls, state_dict: Dict[str, Any]) -> 'ReviewSyncState':
+        """Create from dictionary"""
+        return cls(
+            location=state_dict.get('location', ''),
+            latest_update_time=state_dict.get('latest_update_time'),
+            last_page_token=state_dict.get('last_page_token'),
+            synced_at=state_dict.get('synced_at')
+        )
+    
+    def __str__(self) -> str:
+        return f"ReviewSyncState(location={self.location}, latest_update_time={self.latest_update_time})"
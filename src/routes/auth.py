@@ -1,5 +1,6 @@
 from flask import Blueprint
 from src.controllers.auth_controller import AuthController
+from src.utils.auth_decorators import require_admin
 
 auth_bp = Blueprint('auth', __name__)
 auth_controller = AuthController()
@@ -18,4 +19,14 @@ def refresh_token():
 
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
-    return auth_controller.logout()
\ No newline at end of file
+    return auth_controller.logout()
+
+@auth_bp.route('/users/<email>/deactivate', methods=['POST'])
+@require_admin
+def deactivate_user(email):
+    return auth_controller.deactivate_user(email)
+
+@auth_bp.route('/users/<email>/role', methods=['PUT'])
+@require_admin
+def update_user_role(email):
+    return auth_controller.update_user_role(email)
\ No newline at end of file
@@ -6,10 +6,36 @@ reviews_bp = Blueprint('reviews', __name__)
 reviews_controller = ReviewsController()
 
 @reviews_bp.route('/pull', methods=['POST'])
+@require_auth
 def pull_reviews():
     return reviews_controller.pull_reviews()
 
+@reviews_bp.route('/pull/<job_id>', methods=['GET'])
+@require_auth
+def get_pull_job(job_id):
+    return reviews_controller.get_pull_job(job_id)
+
 @reviews_bp.route('/', methods=['GET'])
 @require_auth
 def get_reviews():
-    return reviews_controller.get_reviews()
\ No newline at end of file
+    return reviews_controller.get_reviews()
+
+@reviews_bp.route('/search', methods=['GET'])
+@require_auth
+def search_reviews():
+    return reviews_controller.search_reviews()
+
+@reviews_bp.route('/stats', methods=['GET'])
+@require_auth
+def get_review_stats():
+    return reviews_controller.get_review_stats()
+
+@reviews_bp.route('/export', methods=['GET'])
+@require_auth
+def export_reviews():
+    return reviews_controller.export_reviews()
+
+@reviews_bp.route('/<external_id>/raw', methods=['GET'])
+@require_auth
+def get_review_raw(external_id):
+    return reviews_controller.get_review_raw(external_id)
\ No newline at end of file
@@ -0,0 +1,12 @@
+from flask import Blueprint
+from src.controllers.system_controller import SystemController
+from src.routes.reviews import reviews_controller
+from src.utils.auth_decorators import require_admin
+
+system_bp = Blueprint('system', __name__)
+system_controller = SystemController(reviews_controller)
+
+@system_bp.route('/pool-stats', methods=['GET'])
+@require_admin
+def get_pool_stats():
+    return system_controller.get_pool_stats()
@@ -1,9 +1,15 @@
+import os
+import secrets
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 import logging
 from src.modal.user import User
 from src.modal.refresh_token import RefreshToken
 from src.services.mongodb_service import MongoDBService
 from src.services.jwt_service import JWTService
+from src.services.password_service import password_service, PasswordHasherBusy
+from src.services.user_cache import user_cache, attach_invalidation_channel
+from src.services.revocation_service import revocation_list
 from pymongo.errors import DuplicateKeyError
 
 logger = logging.getLogger(__name__)
@@ -12,6 +18,16 @@ class AuthService:
     def __init__(self):
         self.mongodb_service = MongoDBService()
         self.jwt_service = JWTService()
+        self.password_service = password_service
+        self.user_cache = user_cache
+        attach_invalidation_channel(self.mongodb_service)
+        # 'stored' keeps one refresh_tokens document per login; 'stateless' issues signed
+        # refresh JWTs and only records revocations
+        self.refresh_token_mode = os.getenv('REFRESH_TOKEN_MODE', 'stored')
+        self.refresh_token_days = int(os.getenv('REFRESH_TOKEN_EXPIRY_DAYS', 30))
+        self.revocation_list = revocation_list
+        if self.refresh_token_mode == 'stateless':
+            self.revocation_list.attach(self.mongodb_service)
     
     def register_user(self, email: str, password: str, role: str = 'user') -> Dict[str, Any]:
         try:
@@ -21,10 +37,15 @@ class AuthService:
                     'error': 'Invalid role. Must be "user" or "admin"'
                 }
             
-            user = User.create_user(email=email, password=password, role=role)
+            user = User(
+                email=email,
+                password_hash=self.password_service.hash_password(password),
+                role=role
+            )
             
             user_dict = user.to_dict()
             self.mongodb_service.users_collection.insert_one(user_dict)
+            self.user_cache.invalidate(email)
             
             logger.info(f"User registered successfully: {email}")
             return {
@@ -37,6 +58,8 @@ class AuthService:
                 'success': False,
                 'error': 'User with this email already exists'
             }
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"Error registering user: {str(e)}")
             return {
@@ -46,43 +69,44 @@ class AuthService:
     
     def login_user(self, email: str, password: str) -> Dict[str, Any]:
         try:
-            user_dict = self.mongodb_service.users_collection.find_one({'email': email})
-            if not user_dict:
+            user = self._find_user(email)
+            if not user:
                 return {
                     'success': False,
                     'error': 'Invalid email or password'
                 }
             
-            user = User.from_dict(user_dict)
-            
             if not user.is_active:
                 return {
                     'success': False,
                     'error': 'User account is deactivated'
                 }
             
-            if not user.check_password(password):
+            if not self.password_service.verify_password(user.password_hash, password):
                 return {
                     'success': False,
                     'error': 'Invalid email or password'
                 }
             
-            access_token = self.jwt_service.generate_access_token(user.email, user.role)
-            refresh_token = RefreshToken.create_token(user.email)
+            if self.password_service.needs_rehash(user.password_hash):
+                self._rehash_password(user, password)
             
-            self.mongodb_service.refresh_tokens_collection.insert_one(refresh_token.to_dict())
+            access_token = self.jwt_service.generate_access_token(user.email, user.role)
+            refresh_token = self._issue_refresh_token(user.email)
             
             logger.info(f"User logged in successfully: {email}")
             return {
                 'success': True,
                 'access_token': access_token,
-                'refresh_token': refresh_token.token,
+                'refresh_token': refresh_token,
                 'user': {
                     'email': user.email,
                     'role': user.role
                 }
             }
             
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"Error during login: {str(e)}")
             return {
@@ -90,8 +114,37 @@ class AuthService:
                 'error': 'Login failed'
             }
     
+    def _rehash_password(self, user: User, password: str):
+        """Upgrade a stored hash made with outdated parameters; failures leave the old hash in place"""
+        try:
+            password_hash = self.password_service.hash_password(password)
+            self.mongodb_service.users_collection.update_one(
+                {'email': user.email, 'password_hash': user.password_hash},
+                {'$set': {'password_hash': password_hash, 'updated_at': datetime.utcnow()}}
+            )
+            self.user_cache.invalidate(user.email)
+            logger.info(f"Rehashed password for {user.email} with {self.password_service.method}")
+        except Exception as e:
+            logger.warning(f"Could not rehash password for {user.email}: {str(e)}")
+    
+    def _issue_refresh_token(self, user_email: str) -> str:
+        if self.refresh_token_mode == 'stateless':
+            expires_at = datetime.utcnow() + timedelta(days=self.refresh_token_days)
+            return self.jwt_service.generate_refresh_token(user_email, secrets.token_urlsafe(16), expires_at)
+        
+        refresh_token = RefreshToken.create_token(user_email, self.refresh_token_days)
+        self.mongodb_service.refresh_tokens_collection.insert_one(refresh_token.to_dict())
+        return refresh_token.token
+    
+    def _is_stateless_token(self, refresh_token_str: str) -> bool:
+        # Opaque tokens issued before switching modes stay valid until they expire
+        return self.refresh_token_mode == 'stateless' and refresh_token_str.count('.') == 2
+    
     def refresh_access_token(self, refresh_token_str: str) -> Dict[str, Any]:
         try:
+            if self._is_stateless_token(refresh_token_str):
+                return self._refresh_stateless(refresh_token_str)
+            
             token_dict = self.mongodb_service.refresh_tokens_collection.find_one({
                 'token': refresh_token_str
             })
@@ -110,17 +163,19 @@ class AuthService:
                     'error': 'Refresh token expired or revoked'
                 }
             
-            user_dict = self.mongodb_service.users_collection.find_one({
-                'email': refresh_token.user_email
-            })
+            user = self._find_user(refresh_token.user_email)
             
-            if not user_dict:
+            if not user:
                 return {
                     'success': False,
                     'error': 'User not found'
                 }
             
-            user = User.from_dict(user_dict)
+            if not user.is_active:
+                return {
+                    'success': False,
+                    'error': 'User account is deactivated'
+                }
             
             access_token = self.jwt_service.generate_access_token(user.email, user.role)
             
@@ -136,8 +191,45 @@ class AuthService:
                 'error': 'Failed to refresh token'
             }
     
+    def _refresh_stateless(self, refresh_token_str: str) -> Dict[str, Any]:
+        payload = self.jwt_service.verify_refresh_token(refresh_token_str)
+        
+        if not payload:
+            return {
+                'success': False,
+                'error': 'Invalid refresh token'
+            }
+        
+        if self.revocation_list.is_revoked(payload['jti']):
+            return {
+                'success': False,
+                'error': 'Refresh token expired or revoked'
+            }
+        
+        user = self._find_user(payload['email'])
+        
+        if not user:
+            return {
+                'success': False,
+                'error': 'User not found'
+            }
+        
+        if not user.is_active:
+            return {
+                'success': False,
+                'error': 'User account is deactivated'
+            }
+        
+        return {
+            'success': True,
+            'access_token': self.jwt_service.generate_access_token(user.email, user.role)
+        }
+    
     def logout_user(self, refresh_token_str: str) -> Dict[str, Any]:
         try:
+            if self._is_stateless_token(refresh_token_str):
+                return self._logout_stateless(refresh_token_str)
+            
             result = self.mongodb_service.refresh_tokens_collection.update_one(
                 {'token': refresh_token_str},
                 {'$set': {'is_revoked': True}}
@@ -161,12 +253,75 @@ class AuthService:
                 'error': 'Logout failed'
             }
     
+    def _logout_stateless(self, refresh_token_str: str) -> Dict[str, Any]:
+        payload = self.jwt_service.verify_refresh_token(refresh_token_str)
+        
+        if not payload or not self.revocation_list.revoke(
+            payload['jti'],
+            payload['email'],
+            datetime.utcfromtimestamp(payload['exp'])
+        ):
+            return {
+                'success': False,
+                'error': 'Invalid refresh token'
+            }
+        
+        return {
+            'success': True,
+            'message': 'Logged out successfully'
+        }
+    
     def get_user_by_email(self, email: str) -> Optional[User]:
         try:
-            user_dict = self.mongodb_service.users_collection.find_one({'email': email})
-            if user_dict:
-                return User.from_dict(user_dict)
-            return None
+            return self._find_user(email)
         except Exception as e:
             logger.error(f"Error getting user: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+    
+    def deactivate_user(self, email: str) -> Dict[str, Any]:
+        return self._update_user(email, {'is_active': False}, 'User deactivated')
+    
+    def update_user_role(self, email: str, role: str) -> Dict[str, Any]:
+        if role not in ['user', 'admin']:
+            return {
+                'success': False,
+                'error': 'Invalid role. Must be "user" or "admin"'
+            }
+        return self._update_user(email, {'role': role}, 'User role updated')
+    
+    def _update_user(self, email: str, changes: Dict[str, Any], message: str) -> Dict[str, Any]:
+        try:
+            result = self.mongodb_service.users_collection.update_one(
+                {'email': email},
+                {'$set': {**changes, 'updated_at': datetime.utcnow()}}
+            )
+            self.user_cache.invalidate(email)
+            
+            if result.matched_count == 0:
+                return {
+                    'success': False,
+                    'error': 'User not found'
+                }
+            
+            logger.info(f"{message}: {email}")
+            return {
+                'success': True,
+                'message': message
+            }
+            
+        except Exception as e:
+            logger.error(f"Error updating user {email}: {str(e)}")
+            return {
+                'success': False,
+                'error': 'Failed to update user'
+            }
+    
+    def _find_user(self, email: str) -> Optional[User]:
+        user = self.user_cache.get(email)
+        if user is None:
+            user_dict = self.mongodb_service.users_collection.find_one({'email': email})
+            if not user_dict:
+                return None
+            user = User.from_dict(user_dict)
+            self.user_cache.set(user)
+        return user
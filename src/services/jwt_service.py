@@ -39,6 +39,38 @@ class JWTService:
             logger.warning(f"Invalid access token: {str(e)}")
             return None
     
+    def generate_refresh_token(self, user_email: str, jti: str, expires_at: datetime) -> str:
+        payload = {
+            'email': user_email,
+            'jti': jti,
+            'exp': expires_at,
+            'iat': datetime.utcnow(),
+            'type': 'refresh'
+        }
+        
+        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+    
+    def verify_refresh_token(self, token: str, verify_exp: bool = True) -> Optional[Dict[str, Any]]:
+        try:
+            payload = jwt.decode(
+                token,
+                self.secret_key,
+                algorithms=[self.algorithm],
+                options={'verify_exp': verify_exp, 'require': ['exp', 'jti', 'email']}
+            )
+            
+            if payload.get('type') != 'refresh':
+                return None
+                
+            return payload
+            
+        except jwt.ExpiredSignatureError:
+            logger.warning("Refresh token has expired")
+            return None
+        except jwt.InvalidTokenError as e:
+            logger.warning(f"Invalid refresh token: {str(e)}")
+            return None
+    
     def extract_token_from_header(self, auth_header: str) -> Optional[str]:
         if not auth_header:
             return None
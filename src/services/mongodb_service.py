@@ -1,32 +1,211 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
+from pymongo.collection import Collection
+from pymongo.database import Database
 import os
 import logging
+import threading
+from typing import Any, Dict, Optional
+from src.migrations.index_manager import ensure_indexes_in_background
 
 logger = logging.getLogger(__name__)
 
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Tracks connection pool activity of the shared client for the pool-stats endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                'pools': 0,
+                'open_connections': 0,
+                'checked_out': 0,
+                'total_checkouts': 0,
+                'checkout_failures': 0,
+                'pool_clears': 0
+            }
+
+    def _add(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def pool_created(self, event):
+        self._add('pools')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._add('pool_clears')
+
+    def pool_closed(self, event):
+        self._add('pools', -1)
+
+    def connection_created(self, event):
+        self._add('open_connections')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add('open_connections', -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._add('checkout_failures')
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.counters['checked_out'] += 1
+            self.counters['total_checkouts'] += 1
+
+    def connection_checked_in(self, event):
+        self._add('checked_out', -1)
+
+
+pool_stats_listener = PoolStatsListener()
+_client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def client_options() -> Dict[str, Any]:
+    options = {
+        'maxPoolSize': int(os.getenv('MONGODB_MAX_POOL_SIZE', 100)),
+        'minPoolSize': int(os.getenv('MONGODB_MIN_POOL_SIZE', 0)),
+        'event_listeners': [pool_stats_listener]
+    }
+    wait_queue_timeout = os.getenv('MONGODB_WAIT_QUEUE_TIMEOUT_MS')
+    if wait_queue_timeout:
+        options['waitQueueTimeoutMS'] = int(wait_queue_timeout)
+    # e.g. "zstd,snappy,zlib"; zstd and snappy need the zstandard / python-snappy packages
+    compressors = os.getenv('MONGODB_COMPRESSORS')
+    if compressors:
+        options['compressors'] = compressors
+    return options
+
+
+def get_client() -> MongoClient:
+    """Return the process-wide MongoClient, creating it on first use in each process.
+
+    Clients must not be shared across fork(), so a client inherited from a
+    parent process (e.g. under gunicorn --preload) is replaced in the child.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != pid:
+            _client = MongoClient(os.getenv('MONGODB_URL', 'mongodb://localhost:27017'), **client_options())
+            _client_pid = pid
+            logger.info(f"Created MongoDB client for process {pid}")
+        return _client
+
+
+def close_client():
+    """Close the process-wide MongoClient"""
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+            logger.info("MongoDB connection closed")
+        _client = None
+        _client_pid = None
+
+
+def _reset_after_fork():
+    global _client, _client_pid
+    _client = None
+    _client_pid = None
+    pool_stats_listener.reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def pool_stats() -> Dict[str, Any]:
+    options = client_options()
+    return {
+        'pid': os.getpid(),
+        'connected': _client is not None and _client_pid == os.getpid(),
+        'max_pool_size': options['maxPoolSize'],
+        'min_pool_size': options['minPoolSize'],
+        'wait_queue_timeout_ms': options.get('waitQueueTimeoutMS'),
+        'compressors': options.get('compressors'),
+        **pool_stats_listener.stats()
+    }
+
+
+class ProcessLocalCollection:
+    """Handle on a collection of the process-wide client that survives fork().
+
+    Every attribute lookup goes through get_client(), so services constructed
+    at import time (e.g. in the gunicorn --preload master) use the forked
+    worker's own client afterwards rather than the one inherited from the parent.
+    """
+
+    def __init__(self, database_name: str, name: str):
+        self.database_name = database_name
+        self.name = name
+        self._client: Optional[MongoClient] = None
+        self._collection: Optional[Collection] = None
+
+    def resolve(self) -> Collection:
+        client = get_client()
+        if self._client is not client:
+            self._collection = client[self.database_name][self.name]
+            self._client = client
+        return self._collection
+
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute.startswith('_'):
+            raise AttributeError(attribute)
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self) -> str:
+        return f"ProcessLocalCollection({self.database_name}.{self.name})"
+
+
 class MongoDBService:
     def __init__(self):
-        self.mongo_url = os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
         self.database_name = os.getenv('DATABASE_NAME', 'ai_hub')
-        self.client = None
-        self.db = None
-        self.reviews_collection = None
-        self.users_collection = None
-        self.refresh_tokens_collection = None
+        # Resolved through get_client() on every use, so they stay valid across fork()
+        self.reviews_collection = self._collection('reviews')
+        self.users_collection = self._collection('users')
+        self.refresh_tokens_collection = self._collection('refresh_tokens')
+        self.sync_state_collection = self._collection('review_sync_state')
+        self.pull_jobs_collection = self._collection('pull_jobs')
+        self.user_invalidations_collection = self._collection('user_invalidations')
+        self.refresh_token_revocations_collection = self._collection('refresh_token_revocations')
+        self.review_revisions_collection = self._collection('review_revisions')
+        self.cache_generations_collection = self._collection('cache_generations')
+        self.review_stats_collection = self._collection('review_daily_stats')
         self._connect()
 
+    def _collection(self, name: str) -> ProcessLocalCollection:
+        return ProcessLocalCollection(self.database_name, name)
+
+    @property
+    def client(self) -> MongoClient:
+        return get_client()
+
+    @property
+    def db(self) -> Database:
+        return self.client[self.database_name]
+
     def _connect(self):
         try:
-            self.client = MongoClient(self.mongo_url)
-            self.db = self.client[self.database_name]
-            self.reviews_collection = self.db.reviews
-            self.users_collection = self.db.users
-            self.refresh_tokens_collection = self.db.refresh_tokens
-            
-            self.reviews_collection.create_index("external_id", unique=True)
-            self.users_collection.create_index("email", unique=True)
-            self.refresh_tokens_collection.create_index("token", unique=True)
-            self.refresh_tokens_collection.create_index("expires_at", expireAfterSeconds=0)
+            # Index creation runs once per process off the request path; see src/migrations
+            ensure_indexes_in_background(self.db)
             
             logger.info("Connected to MongoDB successfully")
         except Exception as e:
@@ -35,6 +214,4 @@ class MongoDBService:
 
     def close_connection(self):
         """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
\ No newline at end of file
+        close_client()
@@ -0,0 +1,115 @@
+import os
+import logging
+import threading
+import multiprocessing
+from multiprocessing.context import SpawnContext, SpawnProcess
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from werkzeug.security import generate_password_hash, check_password_hash
+
+logger = logging.getLogger(__name__)
+
+# current_process().name of every hashing pool worker starts with this
+HASHING_PROCESS_PREFIX = 'password-hasher'
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool already has its maximum number of pending jobs, or a job outlives the timeout"""
+
+
+class _HashingProcess(SpawnProcess):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = f"{HASHING_PROCESS_PREFIX}-{self.name}"
+
+
+class _HashingContext(SpawnContext):
+    # spawn sends the name to the child before it re-imports __main__, so module-level code can check it
+    Process = _HashingProcess
+
+
+def in_hashing_process() -> bool:
+    """True inside a hashing pool worker, which re-imports the app but serves no requests"""
+    return multiprocessing.current_process().name.startswith(HASHING_PROCESS_PREFIX)
+
+
+class PasswordService:
+    """Runs password hashing on a dedicated process pool so it never holds a request thread's GIL.
+
+    PASSWORD_HASH_METHOD takes a full werkzeug method string (e.g. 'scrypt:32768:8:1'
+    or 'pbkdf2:sha256:600000'); stored hashes made with any other method are
+    reported by needs_rehash. At most PASSWORD_HASH_MAX_PENDING jobs may be queued
+    or running; beyond that calls fail fast with PasswordHasherBusy. A call whose
+    job is not done within PASSWORD_HASH_TIMEOUT_SECONDS raises it too.
+    """
+
+    def __init__(self):
+        self.method = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        self.salt_length = int(os.getenv('PASSWORD_SALT_LENGTH', 16))
+        self.workers = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+        self.max_pending = int(os.getenv('PASSWORD_HASH_MAX_PENDING', self.workers * 4))
+        self.timeout = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', 10))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Pools are per process; one inherited across a gunicorn fork is unusable
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=_HashingContext()
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+    def _submit(self, func: Callable[..., Any], *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Password hashing queue is full')
+        try:
+            future = self._pool().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the worker is done with the job, not until the caller stops waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, func: Callable[..., Any], *args) -> Any:
+        try:
+            return self._wait(self._submit(func, *args))
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool; start a fresh one and retry once
+            logger.warning("Password hashing pool broken, restarting it")
+            self.shutdown()
+            return self._wait(self._submit(func, *args))
+
+    def _wait(self, future: Future) -> Any:
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # A job this slow means the pool is overloaded, so callers answer it like a full queue
+            raise PasswordHasherBusy(f"Password hashing took longer than {self.timeout}s") from None
+
+    def hash_password(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify_password(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
+
+
+password_service = PasswordService()
@@ -0,0 +1,79 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional
+from src.services.reviews_service import ReviewsService, UpstreamPaginationError
+
+logger = logging.getLogger(__name__)
+
+class ReviewsPullEngine:
+    """Pulls many locations in parallel over the shared ReviewsService upstream client.
+
+    Upstream requests are capped and rate limited per host by the UpstreamClient,
+    and each location streams its pages into the bulk persistence path as they arrive.
+    """
+
+    COUNT_KEYS = ('total_count', 'saved_count', 'updated_count', 'skipped_count', 'error_count')
+
+    def __init__(self, reviews_service: ReviewsService, max_workers: int = None):
+        self.reviews_service = reviews_service
+        self.max_workers = max_workers or int(os.getenv('REVIEWS_PULL_MAX_WORKERS', 16))
+
+    def pull_locations(
+        self,
+        locations: List[str],
+        options: Dict = None,
+        on_location_done: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        if options is None:
+            options = {}
+
+        started = time.perf_counter()
+        results = []
+        workers = max(1, min(self.max_workers, len(locations)))
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reviews-pull') as executor:
+            futures = {
+                executor.submit(self._pull_location, location, options): location
+                for location in locations
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_location_done:
+                    on_location_done(result)
+
+        totals = {key: sum(result.get(key, 0) for result in results) for key in self.COUNT_KEYS}
+        elapsed = time.perf_counter() - started
+        logger.info(f"Pulled {len(locations)} locations in {elapsed:.2f}s: {totals}")
+
+        return {
+            'success': all(result['success'] for result in results),
+            'locations': results,
+            'elapsed_seconds': round(elapsed, 3),
+            **totals
+        }
+
+    def _pull_location(self, location: str, options: Dict) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = self.reviews_service.pull_reviews(location, options)
+        except UpstreamPaginationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error pulling location {location}: {str(e)}")
+            result = {'success': False, 'error': str(e)}
+        elapsed = time.perf_counter() - started
+
+        summary = {
+            'location': location,
+            'success': result['success'],
+            'elapsed_seconds': round(elapsed, 3)
+        }
+        if result['success']:
+            summary.update({key: result[key] for key in self.COUNT_KEYS})
+            summary['pages_fetched'] = result['pages_fetched']
+        else:
+            summary['error'] = result['error']
+        return summary
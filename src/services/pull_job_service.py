@@ -0,0 +1,258 @@
+import os
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from pymongo import ReturnDocument
+from src.modal.pull_job import PullJob
+from src.services.mongodb_service import MongoDBService
+from src.services.pull_engine import ReviewsPullEngine
+
+logger = logging.getLogger(__name__)
+
+class MemoryPullJobStore:
+    """Per-process job queue; finished jobs beyond ``max_finished`` are evicted oldest first."""
+
+    # Jobs cannot outlive the process that runs them, so they need no lease
+    lease_seconds = None
+
+    def __init__(self, max_finished: int = 1000):
+        self.max_finished = max_finished
+        self._jobs: 'OrderedDict[str, PullJob]' = OrderedDict()
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def add(self, job: PullJob):
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._queue.put(job.job_id)
+
+    def claim_next(self, timeout: float) -> Optional[PullJob]:
+        try:
+            job_id = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            return job
+
+    def get(self, job_id: str) -> Optional[PullJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def update(self, job: PullJob):
+        with self._lock:
+            self._jobs[job.job_id] = job
+            if job.status in ('completed', 'failed'):
+                self._evict_finished()
+
+    def renew(self, job: PullJob):
+        pass
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ('completed', 'failed')]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+class MongoPullJobStore:
+    """Job queue shared by every worker process through the pull_jobs collection.
+
+    Claiming a job leases it to the claiming worker for ``lease_seconds``, and
+    every update or renew() extends the lease. A job whose worker died or was
+    recycled is claimed again once its lease runs out, up to ``max_attempts``
+    claims in total; after that it is marked failed. Updates from a worker
+    whose job has been claimed again are dropped.
+    """
+
+    def __init__(self, collection, poll_interval: float, lease_seconds: float = 120, max_attempts: int = 3):
+        self.collection = collection
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._claims: Dict[str, str] = {}
+        self._wakeup = threading.Event()
+
+    def add(self, job: PullJob):
+        self.collection.insert_one(job.to_dict())
+        self._wakeup.set()
+
+    def claim_next(self, timeout: float) -> Optional[PullJob]:
+        now = datetime.utcnow()
+        claim_id = uuid.uuid4().hex
+        job_dict = self.collection.find_one_and_update(
+            {'$or': [
+                {'status': 'queued'},
+                # $not also matches running jobs without a lease, left by releases before leases existed
+                {'status': 'running', 'lease_until': {'$not': {'$gte': now}}, 'attempts': {'$not': {'$gte': self.max_attempts}}}
+            ]},
+            {
+                '$set': {
+                    'status': 'running',
+                    'started_at': now,
+                    'completed_locations': 0,
+                    'claim_id': claim_id,
+                    'lease_until': self._lease_until()
+                },
+                '$inc': {'attempts': 1}
+            },
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job_dict:
+            if job_dict['attempts'] > 1:
+                logger.warning(f"Reclaimed pull job {job_dict['job_id']} after its lease expired (attempt {job_dict['attempts']})")
+            self._claims[job_dict['job_id']] = claim_id
+            return PullJob.from_dict(job_dict)
+        self._fail_abandoned(now)
+        self._wakeup.wait(min(timeout, self.poll_interval))
+        self._wakeup.clear()
+        return None
+
+    def get(self, job_id: str) -> Optional[PullJob]:
+        job_dict = self.collection.find_one({'job_id': job_id})
+        if job_dict:
+            return PullJob.from_dict(job_dict)
+        return None
+
+    def update(self, job: PullJob):
+        self._write(job, {**job.to_dict(), 'lease_until': self._lease_until()})
+        if job.status in ('completed', 'failed'):
+            self._claims.pop(job.job_id, None)
+
+    def renew(self, job: PullJob):
+        """Extend the lease of a job this worker is still running"""
+        self._write(job, {'lease_until': self._lease_until()})
+
+    def _write(self, job: PullJob, fields: Dict[str, Any]):
+        result = self.collection.update_one(
+            {'job_id': job.job_id, 'claim_id': self._claims.get(job.job_id)},
+            {'$set': fields}
+        )
+        if result.matched_count == 0:
+            logger.warning(f"Pull job {job.job_id} was claimed by another worker, dropping this worker's update")
+
+    def _fail_abandoned(self, now: datetime):
+        result = self.collection.update_many(
+            {'status': 'running', 'lease_until': {'$lt': now}, 'attempts': {'$gte': self.max_attempts}},
+            {'$set': {
+                'status': 'failed',
+                'error': f"Abandoned by its worker {self.max_attempts} times",
+                'finished_at': now
+            }}
+        )
+        if result.modified_count:
+            logger.error(f"Marked {result.modified_count} abandoned pull jobs as failed")
+
+    def _lease_until(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+
+
+class PullJobService:
+    """Runs review pulls on background worker threads and tracks their progress.
+
+    ``PULL_JOBS_BACKEND=mongo`` stores jobs in MongoDB so every gunicorn worker
+    claims from one shared queue; the default keeps the queue in process memory.
+    Worker threads are started lazily, and again after a fork, by the first
+    enqueue or status lookup in each process.
+    """
+
+    def __init__(self, pull_engine: ReviewsPullEngine, mongodb_service: MongoDBService):
+        self.pull_engine = pull_engine
+        self.worker_count = int(os.getenv('PULL_JOB_WORKERS', 2))
+        self.poll_interval = float(os.getenv('PULL_JOB_POLL_SECONDS', 2))
+        self.backend = os.getenv('PULL_JOBS_BACKEND', 'memory')
+
+        if self.backend == 'mongo':
+            self.store = MongoPullJobStore(
+                mongodb_service.pull_jobs_collection,
+                self.poll_interval,
+                float(os.getenv('PULL_JOB_LEASE_SECONDS', 120)),
+                int(os.getenv('PULL_JOB_MAX_ATTEMPTS', 3))
+            )
+        else:
+            self.store = MemoryPullJobStore()
+
+        self._workers_pid = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, locations: List[str], options: Dict[str, Any] = None) -> PullJob:
+        self._ensure_workers()
+        job = PullJob.create_job(locations, options)
+        self.store.add(job)
+        logger.info(f"Queued pull job {job.job_id} for {len(locations)} locations")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[PullJob]:
+        self._ensure_workers()
+        return self.store.get(job_id)
+
+    def _ensure_workers(self):
+        pid = os.getpid()
+        if self._workers_pid == pid:
+            return
+        with self._lock:
+            if self._workers_pid == pid:
+                return
+            for index in range(self.worker_count):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"pull-job-worker-{index}",
+                    daemon=True
+                )
+                worker.start()
+            self._workers_pid = pid
+
+    def _worker_loop(self):
+        while True:
+            try:
+                job = self.store.claim_next(timeout=self.poll_interval)
+                if job:
+                    self._run_job(job)
+            except Exception as e:
+                logger.error(f"Pull job worker error: {str(e)}")
+
+    def _run_job(self, job: PullJob):
+        logger.info(f"Running pull job {job.job_id}")
+
+        def on_location_done(location_result: Dict[str, Any]):
+            job.completed_locations += 1
+            self.store.update(job)
+
+        # A single location can take longer than the lease, so renew it between progress updates too
+        stop_renewing = threading.Event()
+        renewer = threading.Thread(
+            target=self._renew_lease,
+            args=(job, stop_renewing),
+            name=f"pull-job-lease-{job.job_id[:8]}",
+            daemon=True
+        )
+        renewer.start()
+        try:
+            job.result = self.pull_engine.pull_locations(job.locations, job.options, on_location_done)
+            job.status = 'completed'
+        except Exception as e:
+            logger.error(f"Pull job {job.job_id} failed: {str(e)}")
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            stop_renewing.set()
+
+        job.finished_at = datetime.utcnow()
+        self.store.update(job)
+
+    def _renew_lease(self, job: PullJob, stop: threading.Event):
+        if not self.store.lease_seconds:
+            return
+        while not stop.wait(self.store.lease_seconds / 3):
+            try:
+                self.store.renew(job)
+            except Exception as e:
+                logger.warning(f"Could not renew the lease of pull job {job.job_id}: {str(e)}")
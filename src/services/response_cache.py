@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+from pymongo import ReturnDocument
+from src.utils.ttl_cache import TTLCache
+
+try:
+    import redis
+except ImportError:  # redis is optional; only needed for REVIEWS_CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+REVIEWS_GENERATION = 'reviews'
+
+class GenerationCounter:
+    """Per-collection generation number shared between processes through MongoDB.
+
+    Writers bump it after changing the collection; cache keys include it, so a
+    bump retires every cached response at once. Readers re-read the stored value
+    at most every ``check_interval`` seconds, which bounds how long another
+    process can keep serving responses from before a bump.
+    """
+
+    def __init__(self, collection, name: str, check_interval: float = 1.0):
+        self.collection = collection
+        self.name = name
+        self.check_interval = check_interval
+        self._generation = 0
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._generation
+        stored = self.collection.find_one({'_id': self.name}, {'generation': 1})
+        with self._lock:
+            self._generation = stored.get('generation', 0) if stored else 0
+            self._checked_at = time.monotonic()
+            return self._generation
+
+    def bump(self):
+        stored = self.collection.find_one_and_update(
+            {'_id': self.name},
+            {'$inc': {'generation': 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        with self._lock:
+            self._generation = stored['generation']
+            self._checked_at = time.monotonic()
+
+
+class MemoryCacheBackend:
+    """In-process LRU of (etag, body) entries with a TTL"""
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 300):
+        self._entries = TTLCache(max_size, ttl_seconds)
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        return self._entries.get(key)
+
+    def set(self, key: str, etag: str, body: bytes):
+        self._entries.set(key, (etag, body))
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._entries.stats()
+
+
+class RedisCacheBackend:
+    """Cache shared by every worker; takes any client with redis-py's get/set(ex=) API"""
+
+    def __init__(self, client, ttl_seconds: float = 300, prefix: str = 'response-cache:'):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b'\n')
+        return etag.decode('ascii'), body
+
+    def set(self, key: str, etag: str, body: bytes):
+        self.client.set(self.prefix + key, etag.encode('ascii') + b'\n' + body, ex=max(1, int(self.ttl_seconds)))
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """Caches encoded responses keyed on normalized request parameters and the collection generation.
+
+    With no backend nothing is stored, but ETags are still computed so
+    clients can revalidate.
+    """
+
+    def __init__(self, backend, generation: GenerationCounter):
+        self.backend = backend
+        self.generation = generation
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, params: Dict[str, Any]) -> str:
+        """Cache key for a request; capture it once per request so get and put agree"""
+        encoded = json.dumps(
+            {'generation': self.generation.current(), 'params': params},
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        if self.backend is None:
+            return None
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, body: bytes) -> str:
+        """Store a response body and return its strong ETag"""
+        etag = self.etag(body)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, etag, body)
+            except Exception as e:
+                logger.warning(f"Response cache write failed: {str(e)}")
+        return etag
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'backend': type(self.backend).__name__ if self.backend is not None else None,
+            'generation': self.generation.current(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+        if isinstance(self.backend, MemoryCacheBackend):
+            stats['entries'] = self.backend.stats()
+        return stats
+
+
+def create_response_cache(generation: GenerationCounter) -> ResponseCache:
+    """Build the cache selected by REVIEWS_CACHE_BACKEND ('memory', 'redis' or 'none')"""
+    backend_name = os.getenv('REVIEWS_CACHE_BACKEND', 'memory')
+    ttl_seconds = float(os.getenv('REVIEWS_CACHE_TTL_SECONDS', 300))
+    backend = None
+    if backend_name == 'memory':
+        backend = MemoryCacheBackend(int(os.getenv('REVIEWS_CACHE_MAX_ENTRIES', 1000)), ttl_seconds)
+    elif backend_name == 'redis':
+        if redis is None:
+            raise RuntimeError("REVIEWS_CACHE_BACKEND=redis requires the 'redis' package")
+        client = redis.Redis.from_url(os.getenv('REVIEWS_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+        backend = RedisCacheBackend(client, ttl_seconds)
+    return ResponseCache(backend, generation)
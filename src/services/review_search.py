@@ -0,0 +1,262 @@
+import os
+import math
+import logging
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.migrations.schema import REVIEW_TEXT_WEIGHTS
+from src.services.response_cache import GenerationCounter
+from src.utils.inverted_index import InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+SEARCH_BACKENDS = ('text', 'memory')
+
+class SearchIndexUnavailable(Exception):
+    """Raised while a process's in-memory search index has not been built yet"""
+
+class TextIndexSearch:
+    """Ranks reviews with MongoDB's $text operator over the review_text index.
+
+    Requires the text index declared in src/migrations/schema.py. Supports the
+    full $text syntax, including "quoted phrases" and -negated terms.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def search(
+        self,
+        text: str,
+        query: Dict[str, Any],
+        skip: int,
+        limit: int,
+        projection: Dict[str, int],
+        count: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """Return (documents with a 'score' field, total matches or None, whether the results may be stale)"""
+        find_query = {**query, '$text': {'$search': text}}
+        score = {'$meta': 'textScore'}
+        documents = list(
+            self.collection.find(find_query, {**projection, 'score': score})
+            .sort([('score', score), ('_id', -1)])
+            .skip(skip)
+            .limit(limit)
+        )
+        total_count = self.collection.count_documents(find_query) if count else None
+        return documents, total_count, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'text'}
+
+
+class _Codes:
+    """Interns repeated strings (locations, platforms, reviewer names) as small integers"""
+
+    MISSING = 0
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.column = array('I')
+
+    def append(self, value: Optional[str]):
+        if value is None:
+            self.column.append(self.MISSING)
+            return
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes) + 1
+        self.column.append(code)
+
+
+class _IndexSnapshot:
+    """An InvertedIndex plus the columns needed to apply listing filters to its matches"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.index = InvertedIndex()
+        self.external_ids: List[str] = []
+        self.ratings = array('b')
+        self.created_at = array('d')
+        self.coded: Dict[str, _Codes] = {field: _Codes() for field in ('location', 'platform', 'reviewer.name')}
+
+    def add(self, document: Dict[str, Any]):
+        reviewer_name = (document.get('reviewer') or {}).get('name')
+        self.index.add([
+            (document.get('content'), REVIEW_TEXT_WEIGHTS['content']),
+            (reviewer_name, REVIEW_TEXT_WEIGHTS['reviewer.name'])
+        ])
+        self.external_ids.append(document['external_id'])
+        rating = document.get('rating')
+        self.ratings.append(rating if isinstance(rating, int) and 0 <= rating <= 5 else 0)
+        created_at = document.get('created_at')
+        self.created_at.append(_timestamp(created_at) if isinstance(created_at, datetime) else math.nan)
+        self.coded['location'].append(document.get('location'))
+        self.coded['platform'].append(document.get('platform'))
+        self.coded['reviewer.name'].append(reviewer_name)
+
+    def matcher(self, query: Dict[str, Any]) -> Optional[Callable[[int], bool]]:
+        """Compile a build_review_query filter into a predicate over document numbers"""
+        checks = []
+        for field, condition in query.items():
+            if field == 'rating':
+                checks.append(_range_check(self.ratings, condition, int))
+            elif field == 'created_at':
+                checks.append(_range_check(self.created_at, condition, _timestamp))
+            elif field in self.coded:
+                codes = self.coded[field]
+                code = codes.codes.get(condition)
+                if code is None:
+                    return lambda document: False
+                column = codes.column
+                checks.append(lambda document, column=column, code=code: column[document] == code)
+            else:
+                raise ValueError(f"Unsupported search filter: {field}")
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda document: all(check(document) for check in checks)
+
+
+class InvertedIndexSearch:
+    """Ranks reviews with an in-process inverted index for deployments without a text index.
+
+    The index is built from a full scan of the reviews collection on a
+    background thread started with the process, and rebuilt when the reviews
+    cache generation moves, at most once per REVIEWS_SEARCH_REBUILD_SECONDS.
+    Searches never wait for a build: until the first one finishes they raise
+    SearchIndexUnavailable, and afterwards they use the previous index while a
+    rebuild runs. Quoted phrases and negation are not supported: any query
+    term matches.
+    """
+
+    def __init__(self, collection, generation: GenerationCounter, batch_size: int = 1000):
+        self.collection = collection
+        self.generation = generation
+        self.batch_size = batch_size
+        self.rebuild_interval = float(os.getenv('REVIEWS_SEARCH_REBUILD_SECONDS', 60))
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._lock = threading.Lock()
+        self._rebuilding_pid: Optional[int] = None
+        self._last_build_started = -math.inf
+        self._rebuild_in_background()
+
+    def search(
+        self,
+        text: str,
+        query: Dict[str, Any],
+        skip: int,
+        limit: int,
+        projection: Dict[str, int],
+        count: bool = True
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+        """Return (documents with a 'score' field, total matches or None, whether the results may be stale)"""
+        generation = self.generation.current()
+        snapshot = self._snapshot
+        if snapshot is None:
+            self._rebuild_in_background()
+            raise SearchIndexUnavailable('Review search index is still being built')
+        if snapshot.generation != generation:
+            self._rebuild_in_background()
+        total_count, hits = snapshot.index.search(text, limit, skip, snapshot.matcher(query), count)
+        external_ids = [snapshot.external_ids[document] for document, _ in hits]
+        stored = {
+            document['external_id']: document
+            for document in self.collection.find(
+                {'external_id': {'$in': external_ids}},
+                {**projection, '_id': 0, 'external_id': 1}
+            )
+        }
+        # Reviews indexed by the previous generation may have been deleted since
+        documents = [
+            {**stored[external_id], 'score': score}
+            for external_id, (_, score) in zip(external_ids, hits)
+            if external_id in stored
+        ]
+        return documents, total_count, snapshot.generation != generation
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            'backend': 'memory',
+            'documents': len(snapshot.index) if snapshot else 0,
+            'terms': snapshot.index.term_count if snapshot else 0,
+            'generation': snapshot.generation if snapshot else None,
+            'rebuilding': self._rebuilding_pid == os.getpid()
+        }
+
+    def _rebuild_in_background(self):
+        pid = os.getpid()
+        with self._lock:
+            # A marker inherited across a fork names a build thread that does not exist in this process
+            if self._rebuilding_pid == pid:
+                return
+            # Each rebuild is a full scan, so a steady stream of writes must not trigger one per search
+            now = time.monotonic()
+            if self._snapshot is not None and now - self._last_build_started < self.rebuild_interval:
+                return
+            self._rebuilding_pid = pid
+            self._last_build_started = now
+
+        def run():
+            try:
+                self._snapshot = self._build(self.generation.current())
+            except Exception as e:
+                logger.error(f"Review search index build failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._rebuilding_pid = None
+
+        threading.Thread(target=run, name='review-search-index', daemon=True).start()
+
+    def _build(self, generation: int) -> _IndexSnapshot:
+        # The generation is read before the scan, so writes during the scan trigger another rebuild
+        snapshot = _IndexSnapshot(generation)
+        cursor = self.collection.find(
+            {},
+            {'_id': 0, 'external_id': 1, 'content': 1, 'reviewer.name': 1, 'rating': 1,
+             'created_at': 1, 'location': 1, 'platform': 1}
+        ).batch_size(self.batch_size)
+        try:
+            for document in cursor:
+                snapshot.add(document)
+        finally:
+            cursor.close()
+        snapshot.index.freeze()
+        logger.info(
+            f"Built review search index over {len(snapshot.index)} reviews "
+            f"and {snapshot.index.term_count} terms (generation {generation})"
+        )
+        return snapshot
+
+
+def _timestamp(value: datetime) -> float:
+    # Stored dates and filter bounds are naive UTC
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _range_check(column: array, condition: Any, convert: Callable[[Any], Any]) -> Callable[[int], bool]:
+    if not isinstance(condition, dict):
+        value = convert(condition)
+        return lambda document: column[document] == value
+    unsupported = set(condition) - {'$gte', '$lte', '$lt'}
+    if unsupported:
+        raise ValueError(f"Unsupported search filter operators: {', '.join(sorted(unsupported))}")
+    low = convert(condition['$gte']) if '$gte' in condition else -math.inf
+    high = convert(condition['$lte']) if '$lte' in condition else math.inf
+    below = convert(condition['$lt']) if '$lt' in condition else math.inf
+    # NaN (a missing created_at) fails every comparison, like a missing field in MongoDB
+    return lambda document: low <= column[document] <= high and column[document] < below
+
+
+def create_review_search(collection, generation: GenerationCounter, batch_size: int = 1000):
+    """Build the search backend selected by REVIEWS_SEARCH_BACKEND ('text' or 'memory')"""
+    backend_name = os.getenv('REVIEWS_SEARCH_BACKEND', 'text')
+    if backend_name == 'memory':
+        return InvertedIndexSearch(collection, generation, batch_size)
+    if backend_name != 'text':
+        raise ValueError(f"REVIEWS_SEARCH_BACKEND must be one of: {', '.join(SEARCH_BACKENDS)}")
+    return TextIndexSearch(collection)
@@ -0,0 +1,198 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import ReplaceOne, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+STAR_VALUES = ('1', '2', '3', '4', '5')
+
+BUCKET_FIELDS = {'_id': 0, 'day': 1, 'count': 1, 'rated_count': 1, 'rating_sum': 1, 'stars': 1}
+
+BucketKey = Tuple[Optional[str], datetime]
+
+class ReviewStatsService:
+    """Maintains review_daily_stats, one document per location and UTC day of created_at.
+
+    Each bucket holds the review count, the count and sum of 1-5 star ratings
+    and the per-star distribution. The save path applies deltas to just the
+    buckets a batch touched, and rebuild() recomputes buckets from the reviews
+    collection to repair any drift. Stats queries read buckets only, so their
+    cost grows with the number of days covered rather than the number of reviews.
+    """
+
+    def __init__(self, reviews_collection, stats_collection):
+        self.reviews_collection = reviews_collection
+        self.stats_collection = stats_collection
+
+    def apply_changes(self, changes: Iterable[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]):
+        """Apply (stored document or None, new document) pairs to their buckets"""
+        operations = self.delta_operations(self.bucket_deltas(changes))
+        if operations:
+            self.stats_collection.bulk_write(operations, ordered=False)
+
+    @staticmethod
+    def bucket_deltas(changes: Iterable[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]) -> Dict[BucketKey, Dict[str, int]]:
+        deltas: Dict[BucketKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for old, new in changes:
+            for document, sign in ((old, -1), (new, 1)):
+                if document is None or not isinstance(document.get('created_at'), datetime):
+                    continue
+                delta = deltas[(document.get('location'), _day(document['created_at']))]
+                delta['count'] += sign
+                rating = document.get('rating')
+                if str(rating) in STAR_VALUES:
+                    delta['rated_count'] += sign
+                    delta['rating_sum'] += sign * rating
+                    delta[f"stars.{rating}"] += sign
+        return deltas
+
+    @staticmethod
+    def delta_operations(deltas: Dict[BucketKey, Dict[str, int]]) -> List[UpdateOne]:
+        operations = []
+        for (location, day), delta in deltas.items():
+            increments = {field: value for field, value in delta.items() if value}
+            if increments:
+                operations.append(UpdateOne(
+                    {'location': location, 'day': day},
+                    {'$inc': increments, '$set': {'updated_at': datetime.utcnow()}},
+                    upsert=True
+                ))
+        return operations
+
+    def rebuild(self, location: Optional[str] = None) -> Dict[str, int]:
+        """Recompute the buckets of one location, or all of them, from the reviews collection"""
+        match: Dict[str, Any] = {'created_at': {'$type': 'date'}}
+        if location is not None:
+            match['location'] = location
+        group: Dict[str, Any] = {
+            '_id': {
+                'location': '$location',
+                'year': {'$year': '$created_at'},
+                'month': {'$month': '$created_at'},
+                'day': {'$dayOfMonth': '$created_at'}
+            },
+            'count': {'$sum': 1},
+            'rated_count': {'$sum': {'$cond': [_is_star_rating(), 1, 0]}},
+            'rating_sum': {'$sum': {'$cond': [_is_star_rating(), '$rating', 0]}}
+        }
+        for star in STAR_VALUES:
+            group[f"star_{star}"] = {'$sum': {'$cond': [{'$eq': ['$rating', int(star)]}, 1, 0]}}
+
+        rebuilt_at = datetime.utcnow()
+        operations = []
+        for row in self.reviews_collection.aggregate([{'$match': match}, {'$group': group}], allowDiskUse=True):
+            key = {
+                'location': row['_id']['location'],
+                'day': datetime(row['_id']['year'], row['_id']['month'], row['_id']['day'])
+            }
+            operations.append(ReplaceOne(key, {
+                **key,
+                'count': row['count'],
+                'rated_count': row['rated_count'],
+                'rating_sum': row['rating_sum'],
+                'stars': {star: row[f"star_{star}"] for star in STAR_VALUES},
+                'updated_at': rebuilt_at
+            }, upsert=True))
+
+        # Buckets are replaced in place rather than dropped and reinserted, so
+        # deltas upserted by concurrent saves never meet a missing or duplicate key
+        if operations:
+            self.stats_collection.bulk_write(operations, ordered=False)
+        # What is left from before the rebuild covers days that no longer have reviews;
+        # buckets a save touched since then carry a newer updated_at and are kept
+        stale: Dict[str, Any] = {'$or': [{'updated_at': {'$lt': rebuilt_at}}, {'updated_at': {'$exists': False}}]}
+        if location is not None:
+            stale['location'] = location
+        removed = self.stats_collection.delete_many(stale).deleted_count
+        logger.info(f"Rebuilt {len(operations)} review stats buckets (removed {removed} stale)")
+        return {'buckets': len(operations), 'removed': removed}
+
+    def get_stats(
+        self,
+        location: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        interval: str = 'day'
+    ) -> Dict[str, Any]:
+        """Totals and a per-interval series over the matching daily buckets.
+
+        ``interval`` is 'day', 'week' (starting Monday) or 'month'; periods are
+        reported by their first day.
+        """
+        buckets = self.stats_collection.find(
+            self.bucket_query(location, since, until), BUCKET_FIELDS
+        )
+        return self.summarize(buckets, location, interval)
+
+    @staticmethod
+    def bucket_query(location: Optional[str], since: Optional[datetime], until: Optional[datetime]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if location is not None:
+            query['location'] = location
+        if since is not None or until is not None:
+            query['day'] = {}
+            if since is not None:
+                query['day']['$gte'] = _day(since)
+            if until is not None:
+                query['day']['$lte'] = until
+        return query
+
+    @staticmethod
+    def summarize(buckets: Iterable[Dict[str, Any]], location: Optional[str], interval: str) -> Dict[str, Any]:
+        totals = _empty_summary()
+        periods: Dict[datetime, Dict[str, Any]] = {}
+        for bucket in buckets:
+            period = _period_start(bucket['day'], interval)
+            if period not in periods:
+                periods[period] = _empty_summary()
+            for summary in (totals, periods[period]):
+                _add_bucket(summary, bucket)
+
+        return {
+            'location': location,
+            'interval': interval,
+            **_finish_summary(totals),
+            'series': [
+                {'period': period.date().isoformat(), **_finish_summary(periods[period])}
+                for period in sorted(periods)
+            ]
+        }
+
+def _day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def _period_start(day: datetime, interval: str) -> datetime:
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _is_star_rating() -> Dict[str, Any]:
+    return {'$and': [{'$gte': ['$rating', 1]}, {'$lte': ['$rating', 5]}]}
+
+
+def _empty_summary() -> Dict[str, Any]:
+    return {'count': 0, 'rated_count': 0, 'rating_sum': 0, 'stars': dict.fromkeys(STAR_VALUES, 0)}
+
+
+def _add_bucket(summary: Dict[str, Any], bucket: Dict[str, Any]):
+    summary['count'] += bucket.get('count', 0)
+    summary['rated_count'] += bucket.get('rated_count', 0)
+    summary['rating_sum'] += bucket.get('rating_sum', 0)
+    for star, count in (bucket.get('stars') or {}).items():
+        if star in summary['stars']:
+            summary['stars'][star] += count
+
+
+def _finish_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    rated_count = summary['rated_count']
+    return {
+        'review_count': summary['count'],
+        'average_rating': round(summary['rating_sum'] / rated_count, 2) if rated_count else None,
+        'distribution': summary['stars']
+    }
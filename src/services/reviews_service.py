@@ -1,90 +1,215 @@
 import requests
 import os
-from typing import Dict, List, Any
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from bson import ObjectId
 import logging
+from contextlib import contextmanager
+from functools import lru_cache
 from src.modal.review import Review
-from pymongo.errors import DuplicateKeyError
+from src.modal.sync_state import ReviewSyncState
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from src.services.mongodb_service import MongoDBService
+from src.services.response_cache import GenerationCounter, REVIEWS_GENERATION
+from src.services.review_search import SearchIndexUnavailable, create_review_search
+from src.services.review_stats_service import ReviewStatsService
+from src.services.upstream_client import UpstreamClient
+from src.utils.json_stream import StreamedObject
+from src.utils.pagination import encode_cursor, keyset_filter
+from src.utils.prefetch import Prefetcher
+from src.utils.review_filters import cursor_sort_key, LEAN_REVIEW_FIELDS
 
 logger = logging.getLogger(__name__)
 
+# What the save path reads back for each stored review: the hash to skip
+# unchanged writes and the fields that place it in a daily stats bucket
+STORED_REVIEW_FIELDS = {'_id': 0, 'external_id': 1, 'content_hash': 1, 'location': 1, 'created_at': 1, 'rating': 1}
+
+class UpstreamPaginationError(Exception):
+    """Raised when the upstream page tokens repeat or run past REVIEWS_MAX_PAGES"""
+
 class ReviewsService:
     def __init__(self):
         self.api_url = os.getenv('REVIEWS_API_URL')
         self.api_cookie = os.getenv('REVIEWS_API_COOKIE')
         self.mongodb_service = MongoDBService()
-        
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Cookie': self.api_cookie,
-            'Content-Type': 'application/json',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        self.session.timeout = 30
+        self.bulk_chunk_size = int(os.getenv('REVIEWS_BULK_CHUNK_SIZE', 500))
+        self.export_batch_size = int(os.getenv('REVIEWS_EXPORT_BATCH_SIZE', 1000))
+        self.stream_chunk_size = int(os.getenv('REVIEWS_STREAM_CHUNK_BYTES', 64 * 1024))
+        self.prefetch_batches = int(os.getenv('REVIEWS_PREFETCH_BATCHES', 2))
+        self.max_pages = int(os.getenv('REVIEWS_MAX_PAGES', 1000))
+        self.per_host_concurrency = int(os.getenv('REVIEWS_PER_HOST_CONCURRENCY', 8))
+        self.keep_revisions = os.getenv('REVIEWS_KEEP_REVISIONS', 'false').lower() in ('1', 'true', 'yes')
+        # Bumped whenever a pull stores new or edited reviews; see src/services/response_cache.py
+        self.generation = GenerationCounter(
+            self.mongodb_service.cache_generations_collection,
+            REVIEWS_GENERATION,
+            float(os.getenv('REVIEWS_CACHE_GENERATION_CHECK_SECONDS', 1))
+        )
+        self.search_backend = create_review_search(
+            self.mongodb_service.reviews_collection, self.generation, self.export_batch_size
+        )
+        self.stats = ReviewStatsService(self.mongodb_service.reviews_collection, self.mongodb_service.review_stats_collection)
+        self.upstream = UpstreamClient(
+            headers={
+                'Cookie': self.api_cookie,
+                'Content-Type': 'application/json',
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            },
+            per_host_concurrency=self.per_host_concurrency
+        )
 
     def pull_reviews(self, business_url: str, options: Dict = None) -> Dict[str, Any]:
+        """Walk the upstream review pages for a location and persist them.
+
+        With ``options['incremental']`` the walk stops at the first review that
+        is not newer than the stored high-water mark for the location, relying
+        on the upstream returning reviews newest ``updateTime`` first. Page
+        bodies are streamed and saved in batches of ``bulk_chunk_size`` as
+        they are parsed, so memory stays bounded however large a page is.
+        Fetching and parsing run up to ``prefetch_batches`` batches ahead of
+        the database writes on a background thread; 0 fetches inline.
+        """
         if options is None:
             options = {}
+        incremental = options.get('incremental', False)
             
         try:
-            payload = {
-                'selectedLocation': business_url
+            sync_state = self._get_sync_state(business_url) if incremental else None
+            high_water_mark = self._as_utc(sync_state.latest_update_time) if sync_state else None
+            newest_update_time = high_water_mark
+            
+            totals = {
+                'inserted_count': 0,
+                'updated_count': 0,
+                'unchanged_count': 0,
+                'error_count': 0
             }
-
-            response = self.session.post(
-                f"{self.api_url}/google/getReviews",
-                json=payload
-            )
-            response.raise_for_status()
+            total_count = 0
+            page_token = None
+            pages_fetched = 0
+            reached_high_water_mark = False
             
-            data = response.json()
-            reviews = self._create_review_models(data.get('reviews', []))
-
-            saved_count, skipped_count = self._save_reviews_to_db(reviews)
+            # Upstream pages are fetched and parsed on a background thread up to
+            # prefetch_batches ahead, so the next request overlaps with saving this batch
+            with Prefetcher(self._iter_page_batches(business_url), self.prefetch_batches, 'review-prefetch') as items:
+                for kind, value in items:
+                    if kind == 'page_end':
+                        pages_fetched += 1
+                        page_token = value
+                        if reached_high_water_mark:
+                            break
+                        continue
+                    
+                    batch_reviews = []
+                    for review in self._create_review_models(value, business_url):
+                        review_time = self._review_time(review)
+                        if high_water_mark and review_time and review_time <= high_water_mark:
+                            reached_high_water_mark = True
+                            continue
+                        batch_reviews.append(review)
+                        if review_time and (newest_update_time is None or review_time > newest_update_time):
+                            newest_update_time = review_time
+                    
+                    # Persist each batch as it is parsed, so neither the page body
+                    # nor the location is ever held in memory as a whole
+                    if batch_reviews:
+                        counts = self._save_reviews_to_db(batch_reviews)
+                        for key in totals:
+                            totals[key] += counts[key]
+                        if counts['inserted_count'] or counts['updated_count']:
+                            self.generation.bump()
+                        total_count += len(batch_reviews)
+            
+            # Only advance the cursor once everything newer than it is stored,
+            # otherwise a failed batch would be skipped by the next incremental pull.
+            if totals['error_count'] == 0:
+                self._save_sync_state(business_url, newest_update_time, page_token)
             
             return {
                 'success': True,
-                'data': data,
-                'reviews': reviews,
-                'saved_count': saved_count,
-                'skipped_count': skipped_count
+                'total_count': total_count,
+                'saved_count': totals['inserted_count'],
+                'updated_count': totals['updated_count'],
+                'skipped_count': totals['unchanged_count'],
+                'error_count': totals['error_count'],
+                'pages_fetched': pages_fetched,
+                'incremental': incremental
             }
             
+        except UpstreamPaginationError:
+            # Fails the whole pull job rather than reporting a partial location as pulled
+            raise
         except requests.RequestException as e:
             logger.error(f"Error fetching reviews: {str(e)}")
             return {
                 'success': False,
-                'error': str(e),
-                'data': None
+                'error': str(e)
             }
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
             return {
                 'success': False,
-                'error': f"Unexpected error: {str(e)}",
-                'data': None
+                'error': f"Unexpected error: {str(e)}"
             }
     
-    def find_reviews(self, page: int = 1, limit: int = 24, query: Dict = None) -> Dict[str, Any]:
+    def find_reviews(
+        self,
+        page: int = 1,
+        limit: int = 24,
+        query: Dict = None,
+        after: Optional[Tuple[Any, ObjectId]] = None,
+        count: Optional[str] = None,
+        sort_field: str = 'created_at',
+        sort_direction: int = -1,
+        fields: Tuple[str, ...] = LEAN_REVIEW_FIELDS
+    ) -> Dict[str, Any]:
+        """Return one page of reviews ordered by (sort_field, _id), newest first by default.
+
+        Passing ``after`` (a decoded cursor) switches from skip-based page numbers
+        to keyset pagination on (sort_field, _id). ``count`` selects how the
+        total is computed: 'exact', 'estimated' or 'none'; it defaults to 'exact'
+        for page numbers and 'none' for cursors. Only ``fields`` are fetched from
+        Mongo and returned.
+        """
         try:
             if query is None:
                 query = {}
-            skip = (page - 1) * limit
-            total_count = self.mongodb_service.reviews_collection.count_documents(query)
-            total_pages = (total_count + limit - 1) // limit 
-            review_dicts = self.mongodb_service.reviews_collection.find(query)\
-                .sort("created_at", -1)\
-                .skip(skip)\
-                .limit(limit)
+            if count is None:
+                count = 'none' if after is not None else 'exact'
+            
+            find_query = query
+            if after is not None:
+                page_filter = keyset_filter(sort_field, after[0], after[1], sort_direction)
+                find_query = {'$and': [query, page_filter]} if query else page_filter
+            
+            cursor = self.mongodb_service.reviews_collection.find(find_query, self._projection(fields, sort_field))\
+                .sort([(sort_field, sort_direction), ("_id", sort_direction)])
+            if after is None:
+                cursor = cursor.skip((page - 1) * limit)
+            review_dicts = list(cursor.limit(limit + 1))
+            
+            has_more = len(review_dicts) > limit
+            review_dicts = review_dicts[:limit]
+            next_cursor = None
+            if has_more:
+                last = review_dicts[-1]
+                next_cursor = encode_cursor(last.get(sort_field), last['_id'], cursor_sort_key(sort_field, sort_direction))
             
-            reviews = [Review.from_dict(rd).to_dict() for rd in review_dicts]
+            reviews = [self._to_response_dict(rd, fields) for rd in review_dicts]
+            
+            total_count = self._count_reviews(query, count)
+            total_pages = (total_count + limit - 1) // limit if total_count is not None else None
             
             return {
                 'reviews': reviews,
                 'total_count': total_count,
                 'total_pages': total_pages,
-                'current_page': page,
-                'limit': limit
+                'current_page': page if after is None else None,
+                'limit': limit,
+                'next_cursor': next_cursor,
+                'has_more': has_more
             }
             
         except Exception as e:
@@ -94,38 +219,338 @@ class ReviewsService:
                 'total_count': 0,
                 'total_pages': 0,
                 'current_page': page,
-                'limit': limit
+                'limit': limit,
+                'next_cursor': None,
+                'has_more': False,
+                'error': str(e)
+            }
+    
+    def search_reviews(
+        self,
+        text: str,
+        page: int = 1,
+        limit: int = 24,
+        query: Dict = None,
+        count: str = 'exact',
+        fields: Tuple[str, ...] = LEAN_REVIEW_FIELDS
+    ) -> Dict[str, Any]:
+        """Return one page of reviews matching ``text``, most relevant first.
+
+        ``query`` holds the same filters as find_reviews and narrows the matches.
+        Each review carries its relevance ``score``; ``count`` is 'exact' or 'none'.
+        ``stale`` is true while the search backend still answers from an index
+        built before the latest write. Raises SearchIndexUnavailable while the
+        backend has no index to answer from yet.
+        """
+        try:
+            documents, total_count, stale = self.search_backend.search(
+                text,
+                query or {},
+                (page - 1) * limit,
+                limit + 1,
+                dict.fromkeys(fields, 1),
+                count != 'none'
+            )
+            has_more = len(documents) > limit
+            reviews = [
+                {**self._to_response_dict(document, fields), 'score': round(document['score'], 4)}
+                for document in documents[:limit]
+            ]
+            total_pages = (total_count + limit - 1) // limit if total_count is not None else None
+            
+            return {
+                'reviews': reviews,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'current_page': page,
+                'limit': limit,
+                'has_more': has_more,
+                'stale': stale
+            }
+            
+        except SearchIndexUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"Error searching reviews: {str(e)}")
+            return {
+                'reviews': [],
+                'total_count': 0,
+                'total_pages': 0,
+                'current_page': page,
+                'limit': limit,
+                'has_more': False,
+                'error': str(e)
             }
+    
+    def iter_reviews(
+        self,
+        query: Dict = None,
+        fields: Tuple[str, ...] = LEAN_REVIEW_FIELDS,
+        sort_field: str = 'created_at',
+        sort_direction: int = -1
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every matching review from a single cursor for streaming exports"""
+        projection = {'_id': 0, **dict.fromkeys(fields, 1)}
+        cursor = self.mongodb_service.reviews_collection.find(query or {}, projection)\
+            .sort([(sort_field, sort_direction), ("_id", sort_direction)])\
+            .batch_size(self.export_batch_size)
+        try:
+            for review_dict in cursor:
+                yield self._to_response_dict(review_dict, fields)
+        finally:
+            cursor.close()
+    
+    def get_review_raw(self, external_id: str) -> Optional[Dict[str, Any]]:
+        """Return the raw upstream payload stored for a review, or None if it does not exist"""
+        return self.mongodb_service.reviews_collection.find_one(
+            {'external_id': external_id},
+            {'_id': 0, 'external_id': 1, 'platform': 1, 'original_data': 1}
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _projection(fields: Tuple[str, ...], sort_field: str) -> Dict[str, int]:
+        # The sort field is always fetched so the next cursor can be built
+        return dict.fromkeys((*fields, sort_field), 1)
+    
+    @staticmethod
+    def _to_response_dict(review_dict: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+        """Copy the requested fields straight from the stored document.
+
+        Stored documents are already in response shape, so the Review model is
+        only used to fill in defaults for legacy documents missing a field.
+        """
+        try:
+            return {field: review_dict[field] for field in fields}
+        except KeyError:
+            normalized = Review.from_dict(review_dict).to_dict()
+            return {field: normalized[field] for field in fields}
+    
+    def _count_reviews(self, query: Dict, count: str) -> Optional[int]:
+        if count == 'none':
+            return None
+        # The collection metadata estimate ignores filters, so it only applies to unfiltered listings
+        if count == 'estimated' and not query:
+            return self.mongodb_service.reviews_collection.estimated_document_count()
+        return self.mongodb_service.reviews_collection.count_documents(query)
         
-    def _create_review_models(self, reviews_data: List[Dict]) -> List[Review]:
-        reviews = []
+    def _iter_page_batches(self, business_url: str) -> Iterator[Tuple[str, Any]]:
+        """Follow the upstream page tokens from the first page to the last.
+
+        Yields ('batch', raw reviews) for each parsed batch and ('page_end',
+        next page token or None) after each page. Raises UpstreamPaginationError
+        instead of requesting a page token that was already followed, or a page
+        past ``max_pages``, so a looping upstream cannot pin a worker forever.
+        """
+        page_token = None
+        seen_tokens = set()
+        pages = 0
+        while True:
+            with self._stream_reviews_page(business_url, page_token) as page:
+                for batch in page.batches():
+                    yield 'batch', batch
+                page_token = page.fields.get('nextPageToken')
+            pages += 1
+            yield 'page_end', page_token
+            if not page_token:
+                return
+            if page_token in seen_tokens:
+                raise UpstreamPaginationError(f"Upstream repeated page token {page_token!r} for {business_url}")
+            if pages >= self.max_pages:
+                raise UpstreamPaginationError(
+                    f"{business_url} has more than {self.max_pages} pages; raise REVIEWS_MAX_PAGES to pull it"
+                )
+            seen_tokens.add(page_token)
+    
+    @contextmanager
+    def _stream_reviews_page(self, business_url: str, page_token: Optional[str] = None) -> Iterator[StreamedObject]:
+        """Open one upstream page; its reviews are parsed batch by batch as the body arrives"""
+        payload = {
+            'selectedLocation': business_url
+        }
+        if page_token:
+            payload['pageToken'] = page_token
+
+        with self.upstream.post_stream(f"{self.api_url}/google/getReviews", payload) as response:
+            yield StreamedObject(response.iter_content(self.stream_chunk_size), 'reviews', self.bulk_chunk_size)
+    
+    def _get_sync_state(self, business_url: str) -> Optional[ReviewSyncState]:
+        state_dict = self.mongodb_service.sync_state_collection.find_one({'location': business_url})
+        if state_dict:
+            return ReviewSyncState.from_dict(state_dict)
+        return None
+    
+    def _save_sync_state(self, business_url: str, latest_update_time: Optional[datetime], page_token: Optional[str]):
+        sync_state = ReviewSyncState(
+            location=business_url,
+            latest_update_time=latest_update_time,
+            last_page_token=page_token
+        )
+        self.mongodb_service.sync_state_collection.update_one(
+            {'location': business_url},
+            {'$set': sync_state.to_dict()},
+            upsert=True
+        )
+    
+    @staticmethod
+    def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+        # BSON dates come back from MongoDB as naive UTC datetimes
+        if value and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+    
+    @staticmethod
+    def _review_time(review: Review) -> Optional[datetime]:
+        return ReviewsService._as_utc(review.updated_at or review.created_at)
+    
+    def _create_review_models(self, reviews_data: List[Dict], location: Optional[str] = None) -> List[Review]:
+        return Review.from_google_reviews(reviews_data, location)
+    
+    def _save_reviews_to_db(self, reviews: List[Review]) -> Dict[str, int]:
+        """Write new and edited reviews in unordered bulk batches keyed on external_id.
+
+        Each chunk's stored content hashes are fetched with a single $in query
+        and reviews whose hash is unchanged are not written at all. Returns
+        inserted, updated, unchanged and error counts.
+        """
+        counts = {
+            'inserted_count': 0,
+            'updated_count': 0,
+            'unchanged_count': 0,
+            'error_count': 0
+        }
         
-        for review_data in reviews_data:
+        for start in range(0, len(reviews), self.bulk_chunk_size):
+            chunk = reviews[start:start + self.bulk_chunk_size]
+            
             try:
-                review = Review.from_google_review(review_data)
-                reviews.append(review)
+                documents = self._review_documents(chunk)
+                stored = {
+                    document['external_id']: document
+                    for document in self.mongodb_service.reviews_collection.find(
+                        {'external_id': {'$in': list(documents)}},
+                        STORED_REVIEW_FIELDS
+                    )
+                }
+                stored_hashes = {external_id: document.get('content_hash') for external_id, document in stored.items()}
+                changed = self._changed_documents(documents, stored_hashes)
+                counts['unchanged_count'] += len(chunk) - len(changed)
+                if not changed:
+                    continue
+                if self.keep_revisions:
+                    self._record_revisions([document['external_id'] for document in changed
+                                            if document['external_id'] in stored])
             except Exception as e:
-                logger.warning(f"Error creating review model: {str(e)}")
+                counts['error_count'] += len(chunk)
+                logger.error(f"Error comparing review batch of {len(chunk)}: {str(e)}")
                 continue
-                
-        return reviews
-    
-    def _save_reviews_to_db(self, reviews: List[Review]) -> tuple[int, int]:
-        saved_count = 0
-        skipped_count = 0
-        
-        for review in reviews:
+            
+            operations = [
+                UpdateOne(
+                    {'external_id': document['external_id']},
+                    {'$set': document},
+                    upsert=True
+                )
+                for document in changed
+            ]
+            
             try:
-                review_dict = review.to_dict()
-                self.mongodb_service.reviews_collection.insert_one(review_dict)
-                saved_count += 1
-                logger.info(f"Saved review: {review.external_id}")
-            except DuplicateKeyError:
-                skipped_count += 1
-                logger.info(f"Review already exists, skipping: {review.external_id}")
+                result = self.mongodb_service.reviews_collection.bulk_write(operations, ordered=False)
+                self._add_bulk_counts(counts, result.upserted_count, result.matched_count, result.modified_count)
+                self._update_stats(changed, stored, set(result.upserted_ids or {}), set())
+            except BulkWriteError as e:
+                details = e.details
+                write_errors = details.get('writeErrors', [])
+                self._add_bulk_counts(counts, details.get('nUpserted', 0), details.get('nMatched', 0), details.get('nModified', 0))
+                counts['error_count'] += len(write_errors)
+                for error in write_errors:
+                    logger.error(f"Error saving review {changed[error['index']]['external_id']}: {error.get('errmsg')}")
+                self._update_stats(
+                    changed, stored,
+                    {upserted['index'] for upserted in details.get('upserted', [])},
+                    {error['index'] for error in write_errors}
+                )
             except Exception as e:
-                logger.error(f"Error saving review {review.external_id}: {str(e)}")
-                continue
+                counts['error_count'] += len(changed)
+                logger.error(f"Error saving review batch of {len(changed)}: {str(e)}")
         
-        logger.info(f"Reviews saved: {saved_count}, skipped: {skipped_count}")
-        return saved_count, skipped_count
\ No newline at end of file
+        logger.info(
+            f"Reviews inserted: {counts['inserted_count']}, updated: {counts['updated_count']}, "
+            f"unchanged: {counts['unchanged_count']}, errors: {counts['error_count']}"
+        )
+        return counts
+    
+    def _update_stats(self, written: List[Dict[str, Any]], stored: Dict[str, Dict[str, Any]],
+                      upserted_indexes: set, failed_indexes: set):
+        changes = self._stats_changes(written, stored, upserted_indexes, failed_indexes)
+        try:
+            self.stats.apply_changes(changes)
+        except Exception as e:
+            # The reviews are saved; rebuild-stats repairs buckets that missed this delta
+            logger.error(f"Error updating review stats for {len(changes)} reviews: {str(e)}")
+    
+    @staticmethod
+    def _stats_changes(written: List[Dict[str, Any]], stored: Dict[str, Dict[str, Any]],
+                       upserted_indexes: set, failed_indexes: set) -> List[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]:
+        """(previous, new) document pairs for the bulk operations that succeeded.
+
+        A review that was not stored when the chunk was read but did not upsert
+        either was inserted concurrently by another pull; its previous state is
+        unknown, so it is left for rebuild-stats to reconcile.
+        """
+        changes = []
+        for index, document in enumerate(written):
+            if index in failed_indexes:
+                continue
+            previous = stored.get(document['external_id'])
+            if previous is None and index not in upserted_indexes:
+                continue
+            changes.append((previous, document))
+        return changes
+    
+    def _record_revisions(self, external_ids: List[str]):
+        """Copy the stored versions of reviews about to be overwritten into review_revisions"""
+        if not external_ids:
+            return
+        superseded_at = datetime.utcnow()
+        revisions = [
+            self._revision_document(stored, superseded_at)
+            for stored in self.mongodb_service.reviews_collection.find(
+                {'external_id': {'$in': external_ids}}, {'_id': 0}
+            )
+        ]
+        if revisions:
+            self.mongodb_service.review_revisions_collection.insert_many(revisions, ordered=False)
+    
+    @staticmethod
+    def _review_documents(reviews: List[Review]) -> Dict[str, Dict[str, Any]]:
+        """Storage documents with their content hash, keyed on external_id (the last duplicate wins)"""
+        documents = {}
+        for review in reviews:
+            document = review.to_dict()
+            document['content_hash'] = Review.content_hash(document)
+            documents[review.external_id] = document
+        return documents
+    
+    @staticmethod
+    def _changed_documents(documents: Dict[str, Dict[str, Any]], stored_hashes: Dict[str, Optional[str]]) -> List[Dict[str, Any]]:
+        # Documents stored before hashing was introduced have no hash and are rewritten once
+        return [
+            document for external_id, document in documents.items()
+            if stored_hashes.get(external_id) != document['content_hash']
+        ]
+    
+    @staticmethod
+    def _revision_document(stored: Dict[str, Any], superseded_at: datetime) -> Dict[str, Any]:
+        return {
+            'external_id': stored['external_id'],
+            'content_hash': stored.get('content_hash'),
+            'document': stored,
+            'superseded_at': superseded_at
+        }
+    
+    @staticmethod
+    def _add_bulk_counts(counts: Dict[str, int], upserted: int, matched: int, modified: int):
+        counts['inserted_count'] += upserted
+        counts['updated_count'] += modified
+        counts['unchanged_count'] += matched - modified
@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pymongo.errors import DuplicateKeyError
+from src.utils.bloom_filter import BloomFilter
+from src.utils.created_at_poller import CreatedAtPoller
+
+logger = logging.getLogger(__name__)
+
+class RevocationList:
+    """Per-process view of revoked stateless refresh tokens.
+
+    Revoked jtis are written to the refresh_token_revocations collection, whose
+    TTL index drops them once the token would have expired anyway, and mirrored
+    into a Bloom filter that a background thread keeps in sync. A refresh whose
+    jti misses the filter is accepted without a database round trip; a hit is
+    confirmed against the collection to rule out false positives. A revocation
+    made in another process is seen here within one sync interval.
+
+    The sync thread starts on the first check or revocation in each process and
+    loads the filter there, so importing the app never waits on the database.
+    Until that load finishes every check goes to the collection.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001, sync_interval: float = 10):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.mongodb_service = None
+        self._filter = BloomFilter(capacity, error_rate)
+        self._loaded_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sync = CreatedAtPoller(
+            'refresh-token-revocations',
+            lambda: self.mongodb_service.refresh_token_revocations_collection,
+            {'_id': 0, 'jti': 1},
+            self._add_revoked,
+            sync_interval,
+            reload=self._rebuild,
+            # Bloom filters cannot forget entries, so rebuild once it fills with expired jtis
+            needs_reload=lambda: self._filter.count > self.capacity
+        )
+        self.checks = 0
+        self.filter_hits = 0
+        self.confirmed = 0
+
+    def attach(self, mongodb_service):
+        self.mongodb_service = mongodb_service
+
+    def revoke(self, jti: str, user_email: str, expires_at: datetime) -> bool:
+        """Record a revocation; returns False when the jti was already revoked"""
+        self._sync.ensure_started()
+        try:
+            self.mongodb_service.refresh_token_revocations_collection.insert_one({
+                'jti': jti,
+                'user_email': user_email,
+                'expires_at': expires_at,
+                'created_at': datetime.utcnow()
+            })
+        except DuplicateKeyError:
+            return False
+        with self._lock:
+            self._filter.add(jti)
+        return True
+
+    def is_revoked(self, jti: str) -> bool:
+        self._sync.ensure_started()
+        with self._lock:
+            self.checks += 1
+            # A filter inherited across a fork is not kept in sync until this process reloads it
+            if self._loaded_pid == os.getpid():
+                if jti not in self._filter:
+                    return False
+                self.filter_hits += 1
+        revoked = self.mongodb_service.refresh_token_revocations_collection.find_one(
+            {'jti': jti}, {'_id': 1}
+        ) is not None
+        if revoked:
+            with self._lock:
+                self.confirmed += 1
+        return revoked
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'filter_entries': self._filter.count,
+                'capacity': self.capacity,
+                'checks': self.checks,
+                'filter_hits': self.filter_hits,
+                'confirmed': self.confirmed
+            }
+
+    def _rebuild(self):
+        """Reload the filter from the collection, shedding jtis the TTL index has expired"""
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for revocation in self.mongodb_service.refresh_token_revocations_collection.find(
+            {}, {'_id': 0, 'jti': 1}
+        ):
+            bloom.add(revocation['jti'])
+        if bloom.count > self.capacity:
+            logger.warning(
+                f"{bloom.count} active refresh token revocations exceed the filter capacity of "
+                f"{self.capacity}; raise REVOCATION_FILTER_CAPACITY to keep false positives rare"
+            )
+        with self._lock:
+            self._filter = bloom
+            self._loaded_pid = os.getpid()
+
+    def _add_revoked(self, revocations: List[Dict[str, Any]]):
+        with self._lock:
+            for revocation in revocations:
+                if revocation['jti'] not in self._filter:
+                    self._filter.add(revocation['jti'])
+
+
+revocation_list = RevocationList(
+    capacity=int(os.getenv('REVOCATION_FILTER_CAPACITY', 100000)),
+    error_rate=float(os.getenv('REVOCATION_FILTER_ERROR_RATE', 0.001)),
+    sync_interval=float(os.getenv('REVOCATION_SYNC_SECONDS', 10))
+)
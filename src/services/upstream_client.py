@@ -0,0 +1,124 @@
+import os
+import time
+import random
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.host_limiter import HostConcurrencyLimiter
+from src.utils.rate_limiter import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+class UpstreamClient:
+    """HTTP client for the upstream reviews API.
+
+    Requests share one keep-alive session whose connection pool matches the
+    per-host concurrency cap, are paced by a per-host token bucket and use
+    explicit connect/read timeouts. 429 and 5xx responses, timeouts and
+    connection errors are retried with full-jitter exponential backoff, or
+    after the server's Retry-After when it sends one.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, per_host_concurrency: Optional[int] = None):
+        self.per_host_concurrency = per_host_concurrency or int(os.getenv('REVIEWS_PER_HOST_CONCURRENCY', 8))
+        self.timeout = (
+            float(os.getenv('REVIEWS_CONNECT_TIMEOUT_SECONDS', 5)),
+            float(os.getenv('REVIEWS_READ_TIMEOUT_SECONDS', 30))
+        )
+        self.max_retries = int(os.getenv('REVIEWS_MAX_RETRIES', 4))
+        self.backoff_base = float(os.getenv('REVIEWS_BACKOFF_BASE_SECONDS', 0.5))
+        self.backoff_max = float(os.getenv('REVIEWS_BACKOFF_MAX_SECONDS', 30))
+        self.max_retry_after = float(os.getenv('REVIEWS_MAX_RETRY_AFTER_SECONDS', 120))
+        self.host_limiter = HostConcurrencyLimiter(self.per_host_concurrency)
+        self.rate_limiter = HostRateLimiter(
+            float(os.getenv('REVIEWS_RATE_LIMIT_PER_SECOND', 10)),
+            float(os.getenv('REVIEWS_RATE_LIMIT_BURST', 20))
+        )
+        
+        self.session = requests.Session()
+        # The host limiter bounds in-flight requests, so the pool never needs more connections than that
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.per_host_concurrency, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+    
+    def post_json(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded response, retrying transient failures.
+
+        Raises requests.HTTPError or requests.RequestException once retries are exhausted.
+        """
+        with self._post(url, payload) as response:
+            return response.json()
+    
+    @contextmanager
+    def post_stream(self, url: str, payload: Dict[str, Any]) -> Iterator[requests.Response]:
+        """POST a JSON payload and yield the response with its body still unread.
+
+        Retries like post_json until a successful status arrives. The body is
+        read through ``response.iter_content`` inside the context; the host
+        slot is held, and the connection kept, until the context exits.
+        Failures while reading the body are not retried.
+        """
+        with self._post(url, payload, stream=True) as response:
+            yield response
+    
+    @contextmanager
+    def _post(self, url: str, payload: Dict[str, Any], stream: bool = False) -> Iterator[requests.Response]:
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(url)
+            with self.host_limiter.slot(url):
+                try:
+                    response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    logger.warning(f"Upstream request to {url} failed ({str(e)}), retrying in {delay:.1f}s")
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                        try:
+                            response.raise_for_status()
+                            # A streamed body is still being read, so the slot covers the whole context
+                            yield response
+                            return
+                        finally:
+                            response.close()
+                    retry_after = self._retry_after(response)
+                    delay = retry_after if retry_after is not None else self._backoff(attempt)
+                    logger.warning(f"Upstream returned {response.status_code} for {url}, retrying in {delay:.1f}s")
+                    response.close()
+            
+            # Sleep outside the host slot so other requests to the host can proceed
+            time.sleep(delay)
+            attempt += 1
+    
+    def close(self):
+        self.session.close()
+    
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Seconds to wait from a Retry-After header given as seconds or an HTTP date"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return min(max(0.0, seconds), self.max_retry_after)
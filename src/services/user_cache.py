@@ -0,0 +1,146 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from src.modal.user import User
+from src.utils.created_at_poller import CreatedAtPoller
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class UserCache:
+    """Per-process TTL/LRU cache of User records keyed by email.
+
+    Writers call invalidate(); when a cross-process channel is attached the
+    invalidation is also broadcast to every other worker process, and every
+    read or write makes sure this process is listening to the channel.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_size: int = 10000):
+        self.channel: Optional['UserInvalidationChannel'] = None
+        self._entries = TTLCache(max_size, ttl_seconds)
+
+    def get(self, email: str) -> Optional[User]:
+        if self.channel is not None:
+            self.channel.start()
+        return self._entries.get(email)
+
+    def set(self, user: User):
+        if self.channel is not None:
+            self.channel.start()
+        self._entries.set(user.email, user)
+
+    def invalidate(self, email: str):
+        self.invalidate_local(email)
+        if self.channel is not None:
+            self.channel.publish(email)
+
+    def invalidate_local(self, email: str):
+        self._entries.pop(email)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._entries.stats()
+
+
+class UserInvalidationChannel:
+    """Propagates user cache invalidations between processes through MongoDB.
+
+    'poll' mode writes each invalidation to the user_invalidations collection and
+    polls it; 'changestream' mode watches the users collection directly and
+    needs a replica set. The listener is started from the cache itself, once
+    per process, since one started before a fork does not run in the workers.
+    """
+
+    def __init__(self, cache: UserCache, mongodb_service, mode: str, poll_interval: float):
+        self.cache = cache
+        self.mongodb_service = mongodb_service
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self._poller = CreatedAtPoller(
+            'user-cache-invalidation',
+            lambda: self.mongodb_service.user_invalidations_collection,
+            {'_id': 0, 'email': 1},
+            self._invalidate,
+            poll_interval
+        )
+        self._started_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def publish(self, email: str):
+        if self.mode != 'poll':
+            return
+        try:
+            self.mongodb_service.user_invalidations_collection.insert_one({
+                'email': email,
+                'created_at': datetime.utcnow()
+            })
+        except Exception as e:
+            logger.error(f"Error publishing user cache invalidation for {email}: {str(e)}")
+
+    def start(self):
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return
+        with self._lock:
+            if self._started_pid == pid:
+                return
+            if self._started_pid is not None:
+                # Entries inherited across a fork missed every invalidation since
+                self.cache.clear()
+            self._started_pid = pid
+        if self.mode == 'changestream':
+            threading.Thread(target=self._watch_loop, name='user-cache-invalidation', daemon=True).start()
+        else:
+            self._poller.ensure_started()
+
+    def _invalidate(self, invalidations: List[Dict[str, Any]]):
+        for invalidation in invalidations:
+            self.cache.invalidate_local(invalidation['email'])
+
+    def _watch_loop(self):
+        while True:
+            try:
+                with self.mongodb_service.users_collection.watch(full_document='updateLookup') as stream:
+                    # Events may have been missed while (re)connecting
+                    self.cache.clear()
+                    for change in stream:
+                        email = (change.get('fullDocument') or {}).get('email')
+                        if email:
+                            self.cache.invalidate_local(email)
+                        else:
+                            self.cache.clear()
+            except Exception as e:
+                logger.error(f"User change stream interrupted: {str(e)}")
+                self.cache.clear()
+                time.sleep(self.poll_interval)
+
+
+user_cache = UserCache(
+    ttl_seconds=float(os.getenv('USER_CACHE_TTL_SECONDS', 30)),
+    max_size=int(os.getenv('USER_CACHE_MAX_SIZE', 10000))
+)
+
+
+def attach_invalidation_channel(mongodb_service):
+    """Attach the cross-process channel selected by USER_CACHE_INVALIDATION ('poll', 'changestream' or 'none').
+
+    The default 'poll' makes a role change or deactivation reach every worker
+    within USER_CACHE_POLL_SECONDS. 'none' is only safe with a single worker
+    process; otherwise other workers serve the old record for up to
+    USER_CACHE_TTL_SECONDS. Each process starts listening on its first cache access.
+    """
+    mode = os.getenv('USER_CACHE_INVALIDATION', 'poll')
+    if mode not in ('poll', 'changestream'):
+        return
+    if user_cache.channel is None:
+        user_cache.channel = UserInvalidationChannel(
+            user_cache,
+            mongodb_service,
+            mode,
+            float(os.getenv('USER_CACHE_POLL_SECONDS', 2))
+        )
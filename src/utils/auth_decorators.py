@@ -1,25 +1,48 @@
 from functools import wraps
 from flask import request, jsonify, g
 from src.services.jwt_service import JWTService
-from src.services.auth_service import AuthService
+from src.utils.token_cache import TokenCache
 import logging
+import os
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+jwt_service = JWTService()
+token_cache = TokenCache(
+    max_size=int(os.getenv('TOKEN_CACHE_MAX_SIZE', 10000)),
+    ttl_seconds=float(os.getenv('TOKEN_CACHE_TTL_SECONDS', 60))
+)
+
+def verify_authorization_header(auth_header: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Return the verified access token payload, or None and an error message"""
+    token = jwt_service.extract_token_from_header(auth_header)
+    
+    if not token:
+        return None, 'Missing or invalid authorization header'
+    
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt_service.verify_access_token(token)
+        if not payload:
+            return None, 'Invalid or expired token'
+        token_cache.set(token, payload)
+    
+    return payload, None
+
+def _verify_request_token():
+    """Return the verified access token payload, or an error response tuple"""
+    payload, error = verify_authorization_header(request.headers.get('Authorization'))
+    if error:
+        return None, (jsonify({'error': error}), 401)
+    return payload, None
+
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        jwt_service = JWTService()
-        
-        auth_header = request.headers.get('Authorization')
-        token = jwt_service.extract_token_from_header(auth_header)
-        
-        if not token:
-            return jsonify({'error': 'Missing or invalid authorization header'}), 401
-        
-        payload = jwt_service.verify_access_token(token)
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload, error = _verify_request_token()
+        if error:
+            return error
         
         g.current_user_email = payload['email']
         g.current_user_role = payload['role']
@@ -31,17 +54,9 @@ def require_auth(f):
 def require_admin(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        jwt_service = JWTService()
-        
-        auth_header = request.headers.get('Authorization')
-        token = jwt_service.extract_token_from_header(auth_header)
-        
-        if not token:
-            return jsonify({'error': 'Missing or invalid authorization header'}), 401
-        
-        payload = jwt_service.verify_access_token(token)
-        if not payload:
-            return jsonify({'error': 'Invalid or expired token'}), 401
+        payload, error = _verify_request_token()
+        if error:
+            return error
         
         if payload.get('role') != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
@@ -51,4 +66,4 @@ def require_admin(f):
         
         return f(*args, **kwargs)
     
-    return decorated_function
\ No newline at end of file
+    return decorated_function
@@ -0,0 +1,73 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CreatedAtPoller:
+    """Feeds documents inserted into a collection to ``handle``, polling on created_at.
+
+    Each poll re-reads a short window before the previous one so clock skew
+    between writers cannot drop documents; ``handle`` must tolerate repeats. A
+    failed poll is retried from the same point. With ``reload``, the first
+    poll, and any poll for which ``needs_reload`` returns True, calls it
+    instead of reading the window, for consumers that keep a full copy.
+
+    The thread is started by ensure_started(), once per process. A thread
+    started before a fork (gunicorn --preload) does not exist in the workers,
+    so callers invoke it from the methods that serve requests.
+    """
+
+    # Re-read a short window before the last poll so clock skew between writers cannot drop events
+    OVERLAP = timedelta(seconds=5)
+
+    def __init__(
+        self,
+        name: str,
+        collection: Callable[[], Any],
+        projection: Dict[str, int],
+        handle: Callable[[List[Dict[str, Any]]], None],
+        interval: float,
+        reload: Optional[Callable[[], None]] = None,
+        needs_reload: Optional[Callable[[], bool]] = None
+    ):
+        self.name = name
+        self.collection = collection
+        self.projection = projection
+        self.handle = handle
+        self.interval = interval
+        self.reload = reload
+        self.needs_reload = needs_reload
+        self._started_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> bool:
+        """Start the polling thread unless this process already runs it; True when it was started now"""
+        pid = os.getpid()
+        if self._started_pid == pid:
+            return False
+        with self._lock:
+            if self._started_pid == pid:
+                return False
+            self._started_pid = pid
+        threading.Thread(target=self._poll_loop, name=self.name, daemon=True).start()
+        return True
+
+    def _poll_loop(self):
+        last_poll: Optional[datetime] = None
+        while True:
+            started = datetime.utcnow()
+            try:
+                if self.reload is not None and (last_poll is None or (self.needs_reload and self.needs_reload())):
+                    self.reload()
+                else:
+                    since = (last_poll or started) - self.OVERLAP
+                    self.handle(list(self.collection().find({'created_at': {'$gte': since}}, self.projection)))
+                last_poll = started
+            except Exception as e:
+                logger.error(f"Error polling for {self.name}: {str(e)}")
+            time.sleep(self.interval)
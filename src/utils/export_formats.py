@@ -0,0 +1,75 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from src.utils.json_response import dumps, isoformat_utc
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+CHUNK_SIZE = 64 * 1024
+
+
+def ndjson_chunks(reviews: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for review in reviews:
+        buffer += dumps(review)
+        buffer += b'\n'
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def csv_columns(fields: Tuple[str, ...]) -> List[str]:
+    columns = []
+    for field in fields:
+        if field == 'reviewer':
+            columns.extend(('reviewer_name', 'reviewer_profile_photo'))
+        else:
+            columns.append(field)
+    return columns
+
+
+def csv_row(review: Dict[str, Any], fields: Tuple[str, ...]) -> List[Any]:
+    """Flatten the reviewer and JSON-encode original_data for a CSV row"""
+    row = []
+    for field in fields:
+        value = review.get(field)
+        if field == 'reviewer':
+            value = value or {}
+            row.extend((value.get('name'), value.get('profile_photo')))
+        elif field == 'original_data':
+            row.append(dumps(value).decode('utf-8'))
+        elif isinstance(value, datetime):
+            row.append(isoformat_utc(value))
+        else:
+            row.append(value)
+    return row
+
+
+def csv_chunks(reviews: Iterable[Dict[str, Any]], fields: Tuple[str, ...]) -> Iterator[bytes]:
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(csv_columns(fields))
+    for review in reviews:
+        writer.writerow(csv_row(review, fields))
+        if text.tell() >= CHUNK_SIZE:
+            yield text.getvalue().encode('utf-8')
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a stream of chunks into a single gzip member as it is produced"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class HostConcurrencyLimiter:
+    """Caps the number of in-flight requests per upstream host across threads."""
+
+    def __init__(self, per_host_limit: int):
+        self.per_host_limit = per_host_limit
+        self._semaphores: Dict[str, BoundedSemaphore] = {}
+        self._lock = Lock()
+
+    def _semaphore(self, host: str) -> BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str):
+        semaphore = self._semaphore(urlparse(url).netloc)
+        with semaphore:
+            yield
@@ -0,0 +1,155 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has', 'have',
+    'i', 'in', 'is', 'it', 'its', 'my', 'of', 'on', 'or', 'our', 'so', 'that', 'the',
+    'their', 'this', 'to', 'was', 'we', 'were', 'with', 'you'
+))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stop words; no stemming"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class InvertedIndex:
+    """Inverted index over numbered documents, ranked with BM25.
+
+    Documents are added, then the index is frozen once: freeze() replaces each
+    posting's term frequency with its precomputed BM25 impact and orders every
+    postings list by impact, best first. A single-term query then reads its
+    top results straight off the front of the list and multi-term queries only
+    add impacts up. Postings are parallel arrays, so memory grows by a few
+    bytes per posting rather than by a Python object per posting.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._lengths = array('f')
+        self._total_length = 0.0
+        self._document_count = 0
+        self.frozen = False
+
+    def __len__(self) -> int:
+        return self._document_count
+
+    @property
+    def term_count(self) -> int:
+        return len(self._postings)
+
+    def add(self, fields: Iterable[Tuple[Optional[str], float]]) -> int:
+        """Index one document given (text, weight) pairs and return its number"""
+        if self.frozen:
+            raise RuntimeError('Cannot add documents to a frozen index')
+        document = self._document_count
+        frequencies: Counter = Counter()
+        length = 0.0
+        for text, weight in fields:
+            if not text:
+                continue
+            for token in tokenize(text):
+                frequencies[token] += weight
+                length += weight
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('I'), array('f'))
+            postings[0].append(document)
+            postings[1].append(frequency)
+        self._lengths.append(length)
+        self._total_length += length
+        self._document_count += 1
+        return document
+
+    def freeze(self):
+        """Precompute impacts and order postings by them; no documents can be added afterwards"""
+        if self.frozen:
+            return
+        document_count = self._document_count
+        average_length = (self._total_length / document_count if document_count else 0.0) or 1.0
+        lengths = self._lengths
+        k1 = self.K1
+        base_weight = k1 * (1 - self.B)
+        length_weight = k1 * self.B / average_length
+        for term, (documents, frequencies) in self._postings.items():
+            idf = math.log(1 + (document_count - len(documents) + 0.5) / (len(documents) + 0.5))
+            impacts = [
+                idf * frequency * (k1 + 1) / (frequency + base_weight + length_weight * lengths[document])
+                for document, frequency in zip(documents, frequencies)
+            ]
+            # sorted() is stable, so equal impacts stay in document order
+            order = sorted(range(len(impacts)), key=impacts.__getitem__, reverse=True)
+            self._postings[term] = (
+                array('I', [documents[position] for position in order]),
+                array('f', [impacts[position] for position in order])
+            )
+        # Lengths only feed the impacts
+        self._lengths = array('f')
+        self.frozen = True
+
+    def search(
+        self,
+        text: str,
+        limit: int,
+        offset: int = 0,
+        accept: Optional[Callable[[int], bool]] = None,
+        count: bool = True
+    ) -> Tuple[Optional[int], List[Tuple[int, float]]]:
+        """Rank documents containing any query term.
+
+        Returns the number of accepted matches (None unless ``count``) and the
+        (document, score) pairs from ``offset`` to ``offset + limit``, best
+        first with ties in document order.
+        """
+        if not self.frozen:
+            raise RuntimeError('Freeze the index before searching it')
+        postings = [self._postings[term] for term in set(tokenize(text)) if term in self._postings]
+        if not postings:
+            return (0 if count else None), []
+        if len(postings) == 1:
+            return self._search_single(postings[0], limit, offset, accept, count)
+
+        # Start from the longest list so its accumulation runs in C
+        postings.sort(key=lambda entry: len(entry[0]), reverse=True)
+        scores: Dict[int, float] = dict(zip(*postings[0]))
+        for documents, impacts in postings[1:]:
+            get = scores.get
+            for document, impact in zip(documents, impacts):
+                scores[document] = get(document, 0.0) + impact
+        if accept is not None:
+            scores = {document: score for document, score in scores.items() if accept(document)}
+        ranked = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return (len(scores) if count else None), ranked[offset:]
+
+    @staticmethod
+    def _search_single(
+        postings: Tuple[array, array],
+        limit: int,
+        offset: int,
+        accept: Optional[Callable[[int], bool]],
+        count: bool
+    ) -> Tuple[Optional[int], List[Tuple[int, float]]]:
+        documents, impacts = postings
+        if accept is None:
+            end = min(len(documents), offset + limit)
+            return (len(documents) if count else None), list(zip(documents[offset:end], impacts[offset:end]))
+        ranked = []
+        matched = 0
+        for document, impact in zip(documents, impacts):
+            if not accept(document):
+                continue
+            matched += 1
+            if matched > offset and len(ranked) < limit:
+                ranked.append((document, impact))
+            elif not count and len(ranked) == limit:
+                break
+        return (matched if count else None), ranked
@@ -0,0 +1,188 @@
+import re
+import json
+import codecs
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _ValueScan:
+    """Finds where a string, object or array value ends, resuming where the previous chunk stopped.
+
+    Positions are kept relative to the value's start, which stays valid when
+    the buffer drops its consumed prefix.
+    """
+
+    def __init__(self):
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+
+    def end(self, buffer: str, start: int) -> Optional[int]:
+        """Return the index just past the value at ``start``, or None if it has not all arrived"""
+        pos = start + self.offset
+        while True:
+            if self.in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == '\\':
+                    # Leave a trailing backslash unscanned until the character it escapes arrives
+                    if match.end() == len(buffer):
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self.in_string = False
+                pos = match.end()
+                if self.depth == 0:
+                    return pos
+                continue
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self.in_string = True
+            elif char in '[{':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return pos
+        self.offset = pos - start
+        return None
+
+
+class StreamedObject:
+    """Incrementally parses a top-level JSON object from byte chunks.
+
+    The members of the ``array_key`` array are handed out in batches as soon
+    as their bytes have arrived, each decoded by the C scanner of the json
+    module, so memory holds about one chunk and one batch rather than the whole
+    document. Every other member is decoded whole into ``fields``, which is
+    complete once batches() is exhausted. Malformed input raises
+    json.JSONDecodeError.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], array_key: str, batch_size: int = 500):
+        self.array_key = array_key
+        self.batch_size = batch_size
+        self.fields: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def batches(self) -> Iterator[List[Any]]:
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                self._fail('Expecting property name enclosed in double quotes')
+            self._expect(':')
+            if key == self.array_key and self._peek() == '[':
+                self._pos += 1
+                yield from self._array_batches()
+            else:
+                self.fields[key] = self._value()
+            if self._delimiter('}'):
+                return
+
+    def _array_batches(self) -> Iterator[List[Any]]:
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        batch = []
+        while True:
+            batch.append(self._value())
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+            if self._delimiter(']'):
+                break
+        if batch:
+            yield batch
+
+    def _value(self) -> Any:
+        if self._peek() in '"[{':
+            # Decode once the whole value has arrived, rather than rescanning it from
+            # its start after every chunk, which is quadratic in the value's length
+            scan = _ValueScan()
+            while scan.end(self._buffer, self._pos) is None:
+                if not self._read_more():
+                    self._fail('Unexpected end of document')
+            value, self._pos = _DECODER.raw_decode(self._buffer, self._pos)
+            return value
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            # A number cut off by the end of a chunk decodes as a shorter number,
+            # so only accept a value once the next character cannot extend it
+            if end < len(self._buffer) and self._buffer[end] not in _NUMBER_CHARS:
+                self._pos = end
+                return value
+            start = self._pos
+            if not self._read_more():
+                # _read_more dropped the consumed prefix, shifting the buffer by start
+                self._pos = end - start
+                return value
+
+    def _delimiter(self, closing: str) -> bool:
+        """Consume ',' (returning False) or ``closing`` (returning True)"""
+        char = self._peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ',':
+            self._pos -= 1
+            self._fail(f"Expecting ',' delimiter or '{closing}'")
+        return False
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            self._fail(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                self._fail('Unexpected end of document')
+
+    def _read_more(self) -> bool:
+        # Drop what has been consumed so the buffer never grows past the unparsed tail
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        while not self._exhausted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._exhausted = True
+                text = self._decoder.decode(b'', final=True)
+            else:
+                text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        return False
+
+    def _fail(self, message: str):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
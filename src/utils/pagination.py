@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(value: Any, object_id: ObjectId, sort: Optional[str] = None) -> str:
+    """Encode the sort value and _id of the last document of a page as an opaque token"""
+    if isinstance(value, datetime):
+        value = {'$date': value.isoformat()}
+    raw = json.dumps({'v': value, 'id': str(object_id), 's': sort}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, sort: Optional[str] = None) -> Tuple[Any, ObjectId]:
+    """Decode a token produced by encode_cursor, raising ValueError if it is malformed
+    or was issued for a different sort order"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, object_id = data['v'], ObjectId(data['id'])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['$date'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+    if data.get('s') != sort:
+        raise ValueError('Cursor was issued for a different sort order')
+    return value, object_id
+
+
+def keyset_filter(field: str, value: Any, object_id: ObjectId, direction: int = -1) -> Dict[str, Any]:
+    """Filter matching documents after (value, _id) in a (field, _id) ordering.
+
+    Null values sort before everything else, so in descending order they come
+    last and in ascending order they come first.
+    """
+    op = '$lt' if direction < 0 else '$gt'
+    if value is None:
+        if direction < 0:
+            return {field: None, '_id': {op: object_id}}
+        return {'$or': [
+            {field: None, '_id': {op: object_id}},
+            {field: {'$ne': None}}
+        ]}
+    clauses = [
+        {field: {op: value}},
+        {field: value, '_id': {op: object_id}}
+    ]
+    if direction < 0:
+        clauses.append({field: None})
+    return {'$or': clauses}
@@ -0,0 +1,79 @@
+import queue
+import threading
+from typing import Any, Iterable, Iterator, Optional
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Prefetcher:
+    """Runs an iterator on a background thread, at most ``buffer_size`` items ahead of the consumer.
+
+    The producer blocks once the buffer is full, so memory stays bounded while
+    its I/O overlaps with the consumer's work. An exception raised by the
+    iterator is re-raised to the consumer at the point it would have occurred.
+    close() (or leaving the ``with`` block) stops the producer after the item it
+    is working on; it does not wait for that item to finish. With a
+    ``buffer_size`` below 1 the iterator simply runs inline in the consumer.
+    """
+
+    def __init__(self, iterable: Iterable[Any], buffer_size: int, name: str = 'prefetch'):
+        self._iterator = iter(iterable)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if buffer_size >= 1:
+            self._queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+            self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+            self._thread.start()
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._thread is None:
+            yield from self._iterator
+            return
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+
+    def __enter__(self) -> 'Prefetcher':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._thread is None:
+            close = getattr(self._iterator, 'close', None)
+            if close is not None:
+                close()
+            return
+        self._stopped.set()
+        # Free a slot so a producer blocked on a full buffer wakes up and sees the stop
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _produce(self):
+        try:
+            for item in self._iterator:
+                self._queue.put(item)
+                if self._stopped.is_set():
+                    return
+            self._queue.put(_DONE)
+        except BaseException as e:
+            # Nobody reads the buffer once stopped, so only report failures to a live consumer
+            if not self._stopped.is_set():
+                self._queue.put(_Failure(e))
+        finally:
+            close = getattr(self._iterator, 'close', None)
+            if close is not None:
+                close()
@@ -0,0 +1,149 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Tuple
+
+SORT_FIELDS = ('created_at', 'updated_at', 'rating')
+SORT_ORDERS = {'desc': -1, 'asc': 1}
+STATS_INTERVALS = ('day', 'week', 'month')
+REVIEW_FIELDS = (
+    'external_id', 'reviewer', 'rating', 'content', 'created_at',
+    'updated_at', 'platform', 'location', 'original_data'
+)
+# The raw upstream payload is often larger than the rest of the document, so
+# listings leave it out unless explicitly requested
+LEAN_REVIEW_FIELDS = tuple(field for field in REVIEW_FIELDS if field != 'original_data')
+
+
+def build_review_query(args: Mapping[str, str]) -> Tuple[Dict[str, Any], str, int]:
+    """Translate review listing query parameters into a Mongo filter and sort.
+
+    Supported parameters: ``rating``, ``min_rating``, ``max_rating``, ``platform``,
+    ``location``, ``reviewer``, ``since``/``until`` (ISO dates, on created_at; a
+    date-only ``until`` covers that whole UTC day, as in /stats),
+    ``sort`` (one of SORT_FIELDS) and ``order`` ('desc' or 'asc').
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    query: Dict[str, Any] = {}
+
+    rating = _parse_rating(args, 'rating')
+    min_rating = _parse_rating(args, 'min_rating')
+    max_rating = _parse_rating(args, 'max_rating')
+    if rating is not None:
+        query['rating'] = rating
+    elif min_rating is not None or max_rating is not None:
+        if min_rating is not None and max_rating is not None and min_rating > max_rating:
+            raise ValueError('min_rating must not be greater than max_rating')
+        query['rating'] = {}
+        if min_rating is not None:
+            query['rating']['$gte'] = min_rating
+        if max_rating is not None:
+            query['rating']['$lte'] = max_rating
+
+    for param, field in (('platform', 'platform'), ('location', 'location'), ('reviewer', 'reviewer.name')):
+        value = args.get(param)
+        if value:
+            query[field] = value
+
+    since = _parse_date(args, 'since')
+    until = _parse_date(args, 'until')
+    until_operator = '$lte'
+    if until is not None and _is_date_only(args['until']):
+        until, until_operator = until + timedelta(days=1), '$lt'
+    if since is not None and until is not None and since > until:
+        raise ValueError('since must not be after until')
+    if since is not None or until is not None:
+        query['created_at'] = {}
+        if since is not None:
+            query['created_at']['$gte'] = _storage_datetime(since)
+        if until is not None:
+            query['created_at'][until_operator] = _storage_datetime(until)
+
+    sort_field = args.get('sort', 'created_at')
+    if sort_field not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+    order = args.get('order', 'desc')
+    if order not in SORT_ORDERS:
+        raise ValueError(f"order must be one of: {', '.join(SORT_ORDERS)}")
+
+    return query, sort_field, SORT_ORDERS[order]
+
+
+def parse_stats_params(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Translate review stats query parameters into ReviewStatsService.get_stats arguments.
+
+    Supported parameters: ``location``, ``since``/``until`` (ISO dates, matched
+    against whole UTC days) and ``interval`` (one of STATS_INTERVALS).
+    Raises ValueError with a client-facing message on invalid input.
+    """
+    since = _parse_date(args, 'since')
+    until = _parse_date(args, 'until')
+    if since is not None and until is not None and since > until:
+        raise ValueError('since must not be after until')
+    interval = args.get('interval', 'day')
+    if interval not in STATS_INTERVALS:
+        raise ValueError(f"interval must be one of: {', '.join(STATS_INTERVALS)}")
+    return {
+        'location': args.get('location') or None,
+        'since': _storage_datetime(since) if since is not None else None,
+        'until': _storage_datetime(until) if until is not None else None,
+        'interval': interval
+    }
+
+
+def parse_review_fields(value: str) -> Tuple[str, ...]:
+    """Parse a comma separated ``fields`` parameter; 'all' selects every field.
+
+    Raises ValueError with a client-facing message on unknown fields.
+    """
+    if not value:
+        return LEAN_REVIEW_FIELDS
+    if value == 'all':
+        return REVIEW_FIELDS
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in REVIEW_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"fields must be 'all' or a comma separated list of: {', '.join(REVIEW_FIELDS)}")
+    return fields
+
+
+def cursor_sort_key(sort_field: str, sort_direction: int) -> str:
+    """Identifies the ordering a pagination cursor was issued for"""
+    return f"{sort_field}:{sort_direction}"
+
+
+def _parse_rating(args: Mapping[str, str], param: str):
+    value = args.get(param)
+    if value is None or value == '':
+        return None
+    try:
+        rating = int(value)
+    except ValueError:
+        raise ValueError(f"{param} must be an integer between 1 and 5")
+    if rating < 1 or rating > 5:
+        raise ValueError(f"{param} must be an integer between 1 and 5")
+    return rating
+
+
+def _parse_date(args: Mapping[str, str], param: str):
+    value = args.get(param)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"{param} must be an ISO 8601 date or datetime")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _is_date_only(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _storage_datetime(value: datetime) -> datetime:
+    # Review timestamps are stored as BSON dates, which MongoDB returns as naive UTC
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,28 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+from src.utils.ttl_cache import TTLCache
+
+
+class TokenCache(TTLCache):
+    """Bounded LRU cache of verified token payloads keyed by the token's SHA-256 digest.
+
+    Entries live for at most ``ttl_seconds`` and never past the token's own ``exp`` claim.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60):
+        super().__init__(max_size, ttl_seconds)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        return super().get(self._key(token))
+
+    def set(self, token: str, payload: Dict[str, Any]):
+        ttl_seconds = None
+        if 'exp' in payload:
+            # exp is wall-clock time; convert it to a lifetime for the monotonic expiry
+            ttl_seconds = float(payload['exp']) - time.time()
+        super().set(self._key(token), payload, ttl_seconds)
@@ -0,0 +1,23 @@
+import os
+
+# Set before the application modules are imported, since some read them at import time.
+# Tests never reach a real database, so constructors must not start the index migrator
+# or the user cache invalidation poller.
+os.environ.setdefault('MONGODB_AUTO_MIGRATE', 'false')
+os.environ.setdefault('USER_CACHE_INVALIDATION', 'none')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-key-of-at-least-32-bytes')
+os.environ.setdefault('MONGODB_URL', 'mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=100')
+
+import mongomock  # noqa: E402
+import pytest  # noqa: E402
+
+from src.services import mongodb_service  # noqa: E402
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    """Install an in-memory mongomock client as the process-wide MongoClient"""
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(mongodb_service, '_client', client)
+    monkeypatch.setattr(mongodb_service, '_client_pid', os.getpid())
+    return client
@@ -0,0 +1,236 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app
+from asgi_app import create_asgi_app
+from src.services.jwt_service import JWTService
+
+IGNORED_METHODS = {'HEAD', 'OPTIONS'}
+
+
+def routes(app):
+    return {
+        (rule.rule, frozenset(rule.methods - IGNORED_METHODS))
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint != 'static'
+    }
+
+
+@pytest.fixture
+def reviews(mongo_client):
+    collection = mongo_client['ai_hub'].reviews
+    started = datetime(2024, 1, 1)
+    collection.insert_many([
+        {
+            'external_id': f"review-{index}",
+            'reviewer': {'name': f"Reviewer {index}"},
+            'rating': index % 5 + 1,
+            'content': f"Review number {index}",
+            'created_at': started + timedelta(hours=index),
+            'updated_at': started + timedelta(hours=index),
+            'platform': 'google',
+            'location': 'accounts/1/locations/1' if index % 2 else 'accounts/1/locations/2'
+        }
+        for index in range(30)
+    ])
+    return collection
+
+
+def test_asgi_app_serves_the_same_routes():
+    assert routes(create_asgi_app()) == routes(create_app())
+
+
+@pytest.mark.parametrize('path', [
+    '/api/reviews/?limit=5&sort=rating&order=asc',
+    '/api/reviews/?location=accounts/1/locations/1&min_rating=2&fields=external_id,rating',
+    '/api/reviews/?until=2024-01-01&count=none',
+    '/api/reviews/?sort=bogus',
+    '/api/reviews/review-3/raw',
+    '/api/reviews/missing/raw',
+    '/api/reviews/export?format=csv&fields=external_id,rating',
+])
+def test_review_endpoints_answer_alike(reviews, path):
+    headers = {'Authorization': f"Bearer {JWTService().generate_access_token('user@example.com', 'user')}"}
+    wsgi_response = create_app().test_client().get(path, headers=headers)
+
+    async def asgi_get():
+        response = await create_asgi_app().test_client().get(path, headers=headers)
+        return response.status_code, await response.get_data(), response.headers
+
+    status, body, asgi_headers = asyncio.run(asgi_get())
+    assert status == wsgi_response.status_code
+    assert body == wsgi_response.get_data()
+    assert asgi_headers.get('ETag') == wsgi_response.headers.get('ETag')
+
+
+def test_unchanged_listing_revalidates_in_both_modes(reviews):
+    headers = {'Authorization': f"Bearer {JWTService().generate_access_token('user@example.com', 'user')}"}
+    etag = create_app().test_client().get('/api/reviews/', headers=headers).headers['ETag']
+    revalidate = {**headers, 'If-None-Match': etag}
+
+    async def asgi_status():
+        response = await create_asgi_app().test_client().get('/api/reviews/', headers=revalidate)
+        return response.status_code
+
+    assert create_app().test_client().get('/api/reviews/', headers=revalidate).status_code == 304
+    assert asyncio.run(asgi_status()) == 304
+
+
+@pytest.mark.parametrize('mode', ['stored', 'stateless'])
+def test_refresh_tokens_issued_by_either_mode_are_accepted_by_the_other(mongo_client, monkeypatch, mode):
+    from src.aio.routes import auth_controller as asgi_auth
+    from src.modal.user import User
+    from src.routes.auth import auth_controller as wsgi_auth
+    from src.services.revocation_service import revocation_list
+
+    for controller in (wsgi_auth, asgi_auth):
+        monkeypatch.setattr(controller.auth_service, 'refresh_token_mode', mode)
+    monkeypatch.setattr(revocation_list, 'mongodb_service', wsgi_auth.auth_service.mongodb_service)
+    mongo_client['ai_hub'].users.insert_one(User(email='user@example.com', password_hash='unused', role='user').to_dict())
+    refresh_token = wsgi_auth.auth_service._issue_refresh_token('user@example.com')
+
+    async def asgi_post(path):
+        response = await create_asgi_app().test_client().post(path, json={'refresh_token': refresh_token})
+        return response.status_code
+
+    assert asyncio.run(asgi_post('/api/auth/refresh')) == 200
+    assert asyncio.run(asgi_post('/api/auth/logout')) == 200
+    assert create_app().test_client().post('/api/auth/refresh', json={'refresh_token': refresh_token}).status_code == 401
+
+
+def test_saturated_hashing_pool_answers_503_in_both_modes(mongo_client, monkeypatch):
+    from src.services.password_service import PasswordHasherBusy, password_service
+
+    def busy(*args):
+        raise PasswordHasherBusy('Password hashing queue is full')
+
+    monkeypatch.setattr(password_service, '_run', busy)
+    credentials = {'email': 'user@example.com', 'password': 'secret-password'}
+
+    async def asgi_post():
+        response = await create_asgi_app().test_client().post('/api/auth/register', json=credentials)
+        return response.status_code, response.headers.get('Retry-After')
+
+    wsgi_response = create_app().test_client().post('/api/auth/register', json=credentials)
+    assert (wsgi_response.status_code, wsgi_response.headers.get('Retry-After')) == (503, '1')
+    assert asyncio.run(asgi_post()) == (503, '1')
+
+
+@pytest.mark.parametrize('path', ['/api/auth/register', '/api/auth/login'])
+def test_hashing_timeout_answers_503_in_both_modes(mongo_client, monkeypatch, path):
+    from concurrent.futures import Future
+    from src.modal.user import User
+    from src.services.password_service import password_service
+
+    mongo_client['ai_hub'].users.insert_one(User(email='existing@example.com', password_hash='unused', role='user').to_dict())
+    # A job the pool never finishes, as when every worker is stuck on slow hashes
+    monkeypatch.setattr(password_service, '_submit', lambda *args: Future())
+    monkeypatch.setattr(password_service, 'timeout', 0.01)
+    email = 'user@example.com' if path.endswith('register') else 'existing@example.com'
+    credentials = {'email': email, 'password': 'secret-password'}
+
+    async def asgi_post():
+        response = await create_asgi_app().test_client().post(path, json=credentials)
+        return response.status_code, response.headers.get('Retry-After')
+
+    wsgi_response = create_app().test_client().post(path, json=credentials)
+    assert (wsgi_response.status_code, wsgi_response.headers.get('Retry-After')) == (503, '1')
+    assert asyncio.run(asgi_post()) == (503, '1')
+
+
+@pytest.mark.parametrize('path', ['/api/auth/register', '/api/auth/login', '/api/auth/refresh', '/api/auth/logout'])
+def test_malformed_auth_bodies_answer_alike(mongo_client, path):
+    headers = {'Content-Type': 'application/json'}
+
+    async def asgi_post():
+        response = await create_asgi_app().test_client().post(path, data='{not json', headers=headers)
+        return response.status_code, await response.get_json()
+
+    wsgi_response = create_app().test_client().post(path, data='{not json', headers=headers)
+    assert (wsgi_response.status_code, wsgi_response.get_json()) == (400, {'error': 'No data provided'})
+    assert asyncio.run(asgi_post()) == (400, {'error': 'No data provided'})
+
+
+def test_search_answers_503_while_the_index_is_built_in_both_modes(mongo_client, monkeypatch):
+    from src.aio.routes import reviews_controller as asgi_reviews
+    from src.routes.reviews import reviews_controller as wsgi_reviews
+    from src.services.review_search import SearchIndexUnavailable
+
+    def unavailable(*args):
+        raise SearchIndexUnavailable('Review search index is still being built')
+
+    for controller in (wsgi_reviews, asgi_reviews):
+        monkeypatch.setattr(controller.reviews_service.search_backend, 'search', unavailable)
+    headers = {'Authorization': f"Bearer {JWTService().generate_access_token('user@example.com', 'user')}"}
+
+    async def asgi_get():
+        response = await create_asgi_app().test_client().get('/api/reviews/search?q=staff', headers=headers)
+        return response.status_code, response.headers.get('Retry-After')
+
+    wsgi_response = create_app().test_client().get('/api/reviews/search?q=staff', headers=headers)
+    assert (wsgi_response.status_code, wsgi_response.headers.get('Retry-After')) == (503, '5')
+    assert asyncio.run(asgi_get()) == (503, '5')
+
+
+@pytest.mark.parametrize('asgi', [False, True])
+def test_admin_user_endpoints(mongo_client, asgi):
+    from src.modal.user import User
+    from src.routes.auth import auth_controller as wsgi_auth
+
+    users = mongo_client['ai_hub'].users
+    users.insert_one(User(email='user@example.com', password_hash='unused', role='user').to_dict())
+    refresh_token = wsgi_auth.auth_service._issue_refresh_token('user@example.com')
+    jwt_service = JWTService()
+    admin = {'Authorization': f"Bearer {jwt_service.generate_access_token('admin@example.com', 'admin')}"}
+    user = {'Authorization': f"Bearer {jwt_service.generate_access_token('user@example.com', 'user')}"}
+    calls = [
+        ('PUT', '/api/auth/users/user@example.com/role', user, {'role': 'admin'}),
+        ('PUT', '/api/auth/users/user@example.com/role', admin, {'role': 'owner'}),
+        ('PUT', '/api/auth/users/missing@example.com/role', admin, {'role': 'admin'}),
+        ('PUT', '/api/auth/users/user@example.com/role', admin, {'role': 'admin'}),
+        ('POST', '/api/auth/users/user@example.com/deactivate', admin, None),
+    ]
+
+    async def asgi_statuses():
+        client = create_asgi_app().test_client()
+        return [
+            (await client.open(path, method=method, headers=headers, json=body)).status_code
+            for method, path, headers, body in calls
+        ]
+
+    if asgi:
+        statuses = asyncio.run(asgi_statuses())
+    else:
+        client = create_app().test_client()
+        statuses = [
+            client.open(path, method=method, headers=headers, json=body).status_code
+            for method, path, headers, body in calls
+        ]
+
+    assert statuses == [403, 400, 404, 200, 200]
+    assert users.find_one({'email': 'user@example.com'}, {'_id': 0, 'role': 1, 'is_active': 1}) == {
+        'role': 'admin', 'is_active': False
+    }
+    refresh = create_app().test_client().post('/api/auth/refresh', json={'refresh_token': refresh_token})
+    assert (refresh.status_code, refresh.get_json()['error']) == (401, 'User account is deactivated')
+
+
+@pytest.mark.parametrize('asgi', [False, True])
+def test_pool_stats_report_the_response_cache_and_search(reviews, asgi):
+    admin = {'Authorization': f"Bearer {JWTService().generate_access_token('admin@example.com', 'admin')}"}
+
+    async def asgi_get():
+        response = await create_asgi_app().test_client().get('/api/system/pool-stats', headers=admin)
+        return response.status_code, await response.get_json()
+
+    if asgi:
+        status, body = asyncio.run(asgi_get())
+    else:
+        response = create_app().test_client().get('/api/system/pool-stats', headers=admin)
+        status, body = response.status_code, response.get_json()
+
+    assert status == 200
+    assert {'backend', 'generation', 'hits', 'misses'} <= set(body['response_cache'])
+    assert body['review_search'] == {'backend': 'text'}
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from src.utils import json_stream
+from src.utils.json_stream import StreamedObject
+
+DOCUMENT = {
+    'before': {'nested': [1, -2.5e3, None, True], 'quote': 'say "hi"'},
+    'reviews': [
+        {'id': 'plain', 'rating': 5, 'comment': 'Great service'},
+        {'id': 'escapes', 'comment': 'back\\slash "quoted" tab\t newline\n é 😀 \\u0041'},
+        {'id': 'multibyte', 'comment': 'café 日本語 😀 ünïcödé', 'tags': ['é', '😀']},
+        {'id': 'brackets', 'comment': 'not [a] {nested} value', 'score': 12345.678},
+    ],
+    'nextPageToken': 'token-ä',
+    'count': 1234567890,
+}
+
+
+def parse(chunks, batch_size=2):
+    stream = StreamedObject(chunks, 'reviews', batch_size)
+    batches = list(stream.batches())
+    return [review for batch in batches for review in batch], stream.fields, batches
+
+
+def test_any_split_point_parses_the_same():
+    # ensure_ascii=False keeps multibyte characters raw, so splits land inside them
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode('utf-8')
+    fields = {key: value for key, value in DOCUMENT.items() if key != 'reviews'}
+    for split in range(len(data) + 1):
+        reviews, parsed_fields, _ = parse([data[:split], data[split:]])
+        assert (reviews, parsed_fields) == (DOCUMENT['reviews'], fields), f"split at byte {split}"
+
+
+@pytest.mark.parametrize('ensure_ascii', [True, False])
+def test_one_byte_chunks(ensure_ascii):
+    data = json.dumps(DOCUMENT, ensure_ascii=ensure_ascii, indent=2).encode('utf-8')
+    reviews, fields, batches = parse([data[index:index + 1] for index in range(len(data))])
+    assert reviews == DOCUMENT['reviews']
+    assert fields['nextPageToken'] == 'token-ä'
+    assert [len(batch) for batch in batches] == [2, 2]
+
+
+def test_long_values_are_decoded_once(monkeypatch):
+    attempts = []
+
+    class CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            attempts.append(idx)
+            return super().raw_decode(s, idx)
+
+    monkeypatch.setattr(json_stream, '_DECODER', CountingDecoder())
+    comment = 'x' * 5000 + '\\"' + 'é' * 5000
+    data = json.dumps({'reviews': [{'comment': comment}]}, ensure_ascii=False).encode('utf-8')
+    reviews, _, _ = parse([data[index:index + 7] for index in range(0, len(data), 7)])
+
+    assert reviews == [{'comment': comment}]
+    # The key and the review object, each decoded once despite spanning ~3000 chunks
+    assert len(attempts) == 2
+
+
+@pytest.mark.parametrize('data', [
+    b'{"reviews": [{"id": "cut',
+    b'{"reviews": [{"id": "a"}',
+    b'{"reviews": [{"id": "a"]}',
+    b'{"reviews": [], "token": "\\',
+])
+def test_malformed_input_raises(data):
+    with pytest.raises(json.JSONDecodeError):
+        parse([data[:10], data[10:]])
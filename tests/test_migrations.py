@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from src.migrations.datetime_migration import DatetimeMigration
+from src.migrations.review_stats_backfill import ReviewStatsBackfill
+from src.modal.refresh_token import RefreshToken
+from src.services.review_stats_service import ReviewStatsService
+
+
+def test_startup_conversion_runs_once(mongo_client):
+    db = mongo_client['ai_hub']
+    db.reviews.insert_one({'external_id': 'legacy', 'created_at': '2024-01-02T03:04:05Z', 'updated_at': 'garbage'})
+
+    DatetimeMigration(db, pause_seconds=0).ensure()
+
+    review = db.reviews.find_one({'external_id': 'legacy'})
+    assert review['created_at'] == datetime(2024, 1, 2, 3, 4, 5)
+    assert review['updated_at'] == 'garbage'
+    assert db.schema_metadata.find_one({'_id': 'datetimes'})['result']['reviews'] == {'converted': 1, 'failed': 1}
+
+    db.reviews.insert_one({'external_id': 'late', 'created_at': '2024-01-02T03:04:05Z'})
+    DatetimeMigration(db, pause_seconds=0).ensure()
+    assert db.reviews.find_one({'external_id': 'late'})['created_at'] == '2024-01-02T03:04:05Z'
+
+
+def test_refresh_token_accepts_legacy_string_timestamps():
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    token = RefreshToken.from_dict({
+        'token': 'abc',
+        'user_email': 'user@example.com',
+        'expires_at': expires_at.isoformat(),
+        'created_at': '2024-01-02T03:04:05+01:00'
+    })
+    assert token.is_valid()
+    assert token.expires_at == expires_at
+    assert token.created_at == datetime(2024, 1, 2, 2, 4, 5)
+
+    assert not RefreshToken.from_dict({'token': 'abc', 'expires_at': 'not a date'}).is_valid()
+
+
+def test_review_stats_backfill_replaces_partial_buckets_once(mongo_client):
+    db = mongo_client['ai_hub']
+    day = datetime(2024, 1, 2)
+    db.reviews.insert_many([
+        {'external_id': 'old-1', 'location': 'loc', 'rating': 4, 'created_at': day.replace(hour=3)},
+        {'external_id': 'old-2', 'location': 'loc', 'rating': 2, 'created_at': day.replace(hour=9)},
+    ])
+    # A rating edit (5 -> 4) saved before the backfill moved a never-counted bucket below zero
+    db.review_daily_stats.insert_one({
+        'location': 'loc', 'day': day, 'count': 0, 'rated_count': 0, 'rating_sum': -1,
+        'stars': {'4': 1, '5': -1}, 'updated_at': datetime(2024, 6, 1)
+    })
+    db.review_daily_stats.insert_one({'location': 'loc', 'day': datetime(2023, 1, 1), 'count': 1})
+
+    ReviewStatsBackfill(db).ensure()
+
+    assert db.review_daily_stats.count_documents({}) == 1
+    bucket = db.review_daily_stats.find_one({'day': day}, {'_id': 0, 'updated_at': 0})
+    assert bucket == {
+        'location': 'loc', 'day': day, 'count': 2, 'rated_count': 2, 'rating_sum': 6,
+        'stars': {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0}
+    }
+    assert db.schema_metadata.find_one({'_id': 'review_stats'})['result'] == {'buckets': 1, 'removed': 1}
+
+    db.reviews.insert_one({'external_id': 'late', 'location': 'loc', 'rating': 5, 'created_at': day})
+    ReviewStatsBackfill(db).ensure()
+    assert db.review_daily_stats.find_one({'day': day})['count'] == 2
+
+
+def test_stats_rebuild_keeps_buckets_saved_during_it(mongo_client):
+    db = mongo_client['ai_hub']
+    stats = ReviewStatsService(db.reviews, db.review_daily_stats)
+    future = datetime.utcnow() + timedelta(minutes=1)
+    # Written by a save that ran after the rebuild's aggregation read the reviews
+    db.review_daily_stats.insert_one({'location': 'new', 'day': datetime(2024, 2, 1), 'count': 1, 'updated_at': future})
+
+    assert stats.rebuild() == {'buckets': 0, 'removed': 0}
+    assert db.review_daily_stats.count_documents({'location': 'new'}) == 1
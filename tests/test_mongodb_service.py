@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from src.services.mongodb_service import MongoDBService, get_client
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+def test_service_built_before_fork_uses_the_childs_client():
+    service = MongoDBService()
+    parent_client = service.client
+    assert service.reviews_collection.database.client is parent_client
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Report through the pipe; assertions cannot propagate out of the child
+        os.close(read_fd)
+        client = get_client()
+        checks = (
+            client is not parent_client,
+            service.client is client,
+            service.db.client is client,
+            service.reviews_collection.database.client is client,
+            service.pull_jobs_collection.database.client is client,
+        )
+        os.write(write_fd, ''.join('1' if check else '0' for check in checks).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        report = pipe.read()
+    os.waitpid(pid, 0)
+    assert report == '11111'
+    assert service.client is parent_client
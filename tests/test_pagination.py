@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from src.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+RATINGS = [5, None, 3, 5, 1, None, 3, 3, 5, None, 1, 4]
+
+
+@pytest.fixture
+def collection():
+    collection = mongomock.MongoClient().db.reviews
+    documents = []
+    for index, rating in enumerate(RATINGS):
+        document = {'_id': ObjectId(), 'index': index}
+        # Nulls come both as an explicit None and as a missing field
+        if rating is not None:
+            document['rating'] = rating
+            document['created_at'] = datetime(2024, 1, rating, 12, 30)
+        elif index % 2:
+            document['rating'] = None
+            document['created_at'] = None
+        documents.append(document)
+    collection.insert_many(documents)
+    return collection
+
+
+def walk(collection, field, direction, limit):
+    """Collect every document by following next-page cursors, as find_reviews does"""
+    sort = f"{field}:{direction}"
+    seen = []
+    token = None
+    while True:
+        query = {}
+        if token is not None:
+            value, object_id = decode_cursor(token, sort)
+            query = keyset_filter(field, value, object_id, direction)
+        page = list(collection.find(query).sort([(field, direction), ('_id', direction)]).limit(limit + 1))
+        seen.extend(document['index'] for document in page[:limit])
+        if len(page) <= limit:
+            return seen
+        last = page[limit - 1]
+        token = encode_cursor(last.get(field), last['_id'], sort)
+
+
+@pytest.mark.parametrize('field', ['rating', 'created_at'])
+@pytest.mark.parametrize('direction', [-1, 1])
+@pytest.mark.parametrize('limit', [1, 2, 5])
+def test_cursor_walk_visits_every_document_once(collection, field, direction, limit):
+    expected = [
+        document['index']
+        for document in collection.find().sort([(field, direction), ('_id', direction)])
+    ]
+    assert walk(collection, field, direction, limit) == expected
+
+
+def test_nulls_sort_last_descending_and_first_ascending(collection):
+    nulls = {index for index, rating in enumerate(RATINGS) if rating is None}
+    assert set(walk(collection, 'rating', -1, 2)[-len(nulls):]) == nulls
+    assert set(walk(collection, 'rating', 1, 2)[:len(nulls)]) == nulls
+
+
+def test_cursor_rejects_another_sort_order():
+    token = encode_cursor(5, ObjectId(), 'rating:-1')
+    with pytest.raises(ValueError, match='different sort order'):
+        decode_cursor(token, 'rating:1')
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode_cursor('not-a-cursor', 'rating:-1')
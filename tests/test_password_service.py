@@ -0,0 +1,44 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from src.services.password_service import PasswordHasherBusy, PasswordService, in_hashing_process
+
+
+def test_only_hashing_pool_workers_are_marked():
+    service = PasswordService()
+    try:
+        assert service._run(in_hashing_process) is True
+    finally:
+        service.shutdown()
+
+    assert in_hashing_process() is False
+    # Server worker processes (uvicorn/hypercorn --workers) are children too, but are not marked
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        assert pool.apply(in_hashing_process) is False
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes():
+    service = PasswordService()
+    service._slots = threading.BoundedSemaphore(1)
+    service.timeout = 0.1
+    try:
+        with pytest.raises(PasswordHasherBusy, match='longer than'):
+            service._run(time.sleep, 1)
+        # The sleep is still running in the pool, so the only slot is still taken
+        with pytest.raises(PasswordHasherBusy):
+            service._run(time.sleep, 0)
+
+        service.timeout = 10
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                assert service._run(in_hashing_process) is True
+                break
+            except PasswordHasherBusy:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+    finally:
+        service.shutdown()
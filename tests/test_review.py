@@ -0,0 +1,20 @@
+from benchmarks.upstream_stub import make_page
+from src.modal.review import Review
+
+LOCATION = 'accounts/1/locations/1'
+
+
+def test_page_parser_matches_per_entry_parser():
+    page = make_page(LOCATION, 0, 20, 1)['reviews'] + [
+        {'reviewId': 'sparse'},
+        {'reviewId': 'numeric', 'starRating': 4, 'text': 'legacy body', 'reviewer': None, 'createTime': 'bad'},
+    ]
+
+    assert Review.from_google_reviews(page, LOCATION) == [
+        Review.from_google_review(review_data, LOCATION) for review_data in page
+    ]
+
+
+def test_page_parser_skips_malformed_entries():
+    reviews = Review.from_google_reviews([{'reviewId': 'kept'}, None, 'not a review'], LOCATION)
+    assert [review.external_id for review in reviews] == ['kept']
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import pytest
+
+from src.migrations.schema import INDEX_SCHEMA
+from src.utils.review_filters import SORT_FIELDS, build_review_query
+
+REVIEW_INDEX_PREFIXES = {tuple(name for name, _ in spec.keys[:2]) for spec in INDEX_SCHEMA['reviews']}
+
+
+@pytest.mark.parametrize('sort', SORT_FIELDS)
+@pytest.mark.parametrize('param', ['location', 'platform', 'reviewer', 'rating', None])
+def test_single_equality_filter_and_sort_have_an_index(param, sort):
+    query, sort_field, _ = build_review_query({param: '3', 'sort': sort} if param else {'sort': sort})
+    prefix = tuple(field for field in query if field != sort_field) + (sort_field,)
+    assert prefix in REVIEW_INDEX_PREFIXES or prefix + ('_id',) in REVIEW_INDEX_PREFIXES
+
+
+def test_date_only_until_covers_the_whole_day():
+    query, _, _ = build_review_query({'since': '2024-01-01T12:00:00', 'until': '2024-01-01'})
+    assert query['created_at'] == {'$gte': datetime(2024, 1, 1, 12), '$lt': datetime(2024, 1, 2)}
+
+    query, _, _ = build_review_query({'until': '2024-01-01T12:00:00Z'})
+    assert query['created_at'] == {'$lte': datetime(2024, 1, 1, 12)}
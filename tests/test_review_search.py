@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from src.services.response_cache import REVIEWS_GENERATION, GenerationCounter
+from src.services.review_search import InvertedIndexSearch, SearchIndexUnavailable
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def reviews(mongo_client):
+    db = mongo_client['ai_hub']
+    db.reviews.insert_one({'external_id': 'a', 'content': 'friendly staff', 'reviewer': {'name': 'Ann'}, 'rating': 5})
+    return db
+
+
+def test_searches_do_not_wait_for_the_first_build(reviews, monkeypatch):
+    release = threading.Event()
+    build = InvertedIndexSearch._build
+
+    def slow_build(self, generation):
+        release.wait(5)
+        return build(self, generation)
+
+    monkeypatch.setattr(InvertedIndexSearch, '_build', slow_build)
+    search = InvertedIndexSearch(reviews.reviews, GenerationCounter(reviews.cache_generations, REVIEWS_GENERATION, 0))
+
+    with pytest.raises(SearchIndexUnavailable):
+        search.search('staff', {}, 0, 10, {'external_id': 1})
+
+    release.set()
+    wait_for(lambda: search.stats()['documents'] == 1)
+    documents, total_count, stale = search.search('staff', {}, 0, 10, {'external_id': 1})
+    assert [document['external_id'] for document in documents] == ['a'] and total_count == 1 and not stale
+
+
+def test_rebuilds_are_debounced(reviews, monkeypatch):
+    monkeypatch.setenv('REVIEWS_SEARCH_REBUILD_SECONDS', '3600')
+    generation = GenerationCounter(reviews.cache_generations, REVIEWS_GENERATION, 0)
+    search = InvertedIndexSearch(reviews.reviews, generation)
+    wait_for(lambda: search.stats()['generation'] == 0 and not search.stats()['rebuilding'])
+
+    generation.bump()
+    _, _, stale = search.search('staff', {}, 0, 10, {'external_id': 1})
+    assert stale
+    # The first build started less than REVIEWS_SEARCH_REBUILD_SECONDS ago
+    assert not search.stats()['rebuilding']
+
+    search.rebuild_interval = 0
+    search.search('staff', {}, 0, 10, {'external_id': 1})
+    wait_for(lambda: search.stats()['generation'] == 1)
@@ -0,0 +1,121 @@
+import json
+from contextlib import contextmanager
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from benchmarks.upstream_stub import make_page
+from src.modal.review import Review
+from src.services.pull_engine import ReviewsPullEngine
+from src.services.reviews_service import ReviewsService, UpstreamPaginationError
+from src.utils.json_stream import StreamedObject
+
+LOCATION = 'accounts/1/locations/1'
+
+
+@pytest.fixture
+def service(mongo_client):
+    service = ReviewsService()
+    service.prefetch_batches = 0
+    return service
+
+
+def serve_pages(monkeypatch, service, next_token):
+    """Answer page N with make_page's reviews and next_token(N) as its nextPageToken"""
+    requested = []
+
+    @contextmanager
+    def stream_page(business_url, page_token=None):
+        number = int(page_token or 0)
+        requested.append(page_token)
+        page = {'reviews': make_page(business_url, number, 2, number + 1)['reviews']}
+        token = next_token(number)
+        if token is not None:
+            page['nextPageToken'] = token
+        yield StreamedObject([json.dumps(page).encode()], 'reviews', service.bulk_chunk_size)
+
+    monkeypatch.setattr(service, '_stream_reviews_page', stream_page)
+    return requested
+
+
+def test_repeated_page_token_fails_the_pull(service, monkeypatch):
+    requested = serve_pages(monkeypatch, service, lambda number: '1')
+
+    with pytest.raises(UpstreamPaginationError, match='repeated page token'):
+        service.pull_reviews(LOCATION)
+    assert requested == [None, '1']
+    # The cursor is not advanced past reviews of a walk that never finished
+    assert service.mongodb_service.sync_state_collection.count_documents({}) == 0
+
+    with pytest.raises(UpstreamPaginationError):
+        ReviewsPullEngine(service).pull_locations([LOCATION])
+
+
+def test_page_walk_stops_at_max_pages(service, monkeypatch):
+    service.max_pages = 3
+    serve_pages(monkeypatch, service, lambda number: str(number + 1) if number < 2 else None)
+    assert service.pull_reviews(LOCATION)['pages_fetched'] == 3
+
+    requested = serve_pages(monkeypatch, service, lambda number: str(number + 1))
+    with pytest.raises(UpstreamPaginationError, match='REVIEWS_MAX_PAGES'):
+        service.pull_reviews(LOCATION)
+    assert requested == [None, '1', '2']
+
+
+def page_reviews(count, **overrides):
+    """Review models for the first ``count`` entries of make_page, with fields of the raw entries replaced"""
+    raw = make_page(LOCATION, 0, count, 1)['reviews']
+    for index, changes in overrides.items():
+        raw[int(index.lstrip('r'))].update(changes)
+    return [Review.from_google_review(review_data, LOCATION) for review_data in raw]
+
+
+def stats_totals(service):
+    stats = service.stats.get_stats(location=LOCATION)
+    return stats['review_count'], stats['distribution']
+
+
+def test_save_counts_and_stats_follow_edits(service):
+    # make_page rates review i with STAR_RATINGS[i % 5]: 1, 2, 3, 4, 5 stars
+    counts = service._save_reviews_to_db(page_reviews(5))
+    assert counts == {'inserted_count': 5, 'updated_count': 0, 'unchanged_count': 0, 'error_count': 0}
+    assert stats_totals(service) == (5, {'1': 1, '2': 1, '3': 1, '4': 1, '5': 1})
+
+    assert service._save_reviews_to_db(page_reviews(5))['unchanged_count'] == 5
+
+    # A re-pull in which review 0 was edited from 1 star to 5
+    counts = service._save_reviews_to_db(page_reviews(5, r0={'starRating': 'FIVE', 'comment': 'Changed my mind'}))
+    assert counts == {'inserted_count': 0, 'updated_count': 1, 'unchanged_count': 4, 'error_count': 0}
+    assert stats_totals(service) == (5, {'1': 0, '2': 1, '3': 1, '4': 1, '5': 2})
+    assert service.mongodb_service.reviews_collection.find_one({'external_id': f"{LOCATION}-0"})['rating'] == 5
+
+
+def test_failed_bulk_writes_are_counted_and_left_out_of_stats(service, monkeypatch):
+    service._save_reviews_to_db(page_reviews(2))
+    collection = service.mongodb_service.reviews_collection
+    update_one = collection.update_one
+
+    def fail_second(operations, ordered=True):
+        """Apply every operation but the one at index 1, reporting it as a write error"""
+        # Written one by one, since mongomock numbers 'upserted' by upsert rather than by operation
+        details = {'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'E11000 duplicate key'}],
+                   'nUpserted': 0, 'nMatched': 0, 'nModified': 0, 'upserted': []}
+        for index, operation in enumerate(operations):
+            if index == 1:
+                continue
+            result = update_one(operation._filter, operation._doc, upsert=True)
+            details['nMatched'] += result.matched_count
+            details['nModified'] += result.modified_count
+            if result.upserted_id is not None:
+                details['nUpserted'] += 1
+                details['upserted'].append({'index': index, '_id': result.upserted_id})
+        raise BulkWriteError(details)
+
+    monkeypatch.setattr(collection, 'bulk_write', fail_second)
+    # Review 0 is edited (1 -> 3 stars), review 1 is edited but fails, reviews 2 and 3 are new
+    counts = service._save_reviews_to_db(page_reviews(4, r0={'starRating': 'THREE'}, r1={'starRating': 'FIVE'}))
+
+    assert counts == {'inserted_count': 2, 'updated_count': 1, 'unchanged_count': 0, 'error_count': 1}
+    assert collection.find_one({'external_id': f"{LOCATION}-1"})['rating'] == 2
+    # Review 1 keeps its stored 2 stars; the new reviews 2 and 3 add 3 and 4 stars
+    assert stats_totals(service) == (4, {'1': 0, '2': 1, '3': 2, '4': 1, '5': 0})
@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.revocation_service import RevocationList
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def sync_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'refresh-token-revocations']
+
+
+@pytest.fixture
+def revocations(mongo_client):
+    return mongo_client['ai_hub'].refresh_token_revocations
+
+
+def revoked_elsewhere(collection, jti):
+    collection.insert_one({'jti': jti, 'user_email': 'user@example.com', 'created_at': datetime.utcnow(),
+                           'expires_at': datetime.utcnow() + timedelta(days=1)})
+
+
+def test_attach_does_not_touch_the_database(revocations):
+    revocation_list = RevocationList(sync_interval=0.05)
+    revocation_list.attach(SimpleNamespace(refresh_token_revocations_collection=None))
+    assert revocation_list.stats()['filter_entries'] == 0
+
+
+def test_checks_before_the_first_load_go_to_the_collection(revocations):
+    revoked_elsewhere(revocations, 'old')
+    revocation_list = RevocationList(sync_interval=3600)
+    revocation_list.attach(SimpleNamespace(refresh_token_revocations_collection=revocations))
+
+    assert revocation_list.is_revoked('old')
+    assert wait_for(lambda: revocation_list.stats()['filter_entries'] == 1)
+    assert not revocation_list.is_revoked('new')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+def test_forked_worker_syncs_revocations_made_elsewhere(revocations):
+    revocation_list = RevocationList(sync_interval=3600)
+    revocation_list.attach(SimpleNamespace(refresh_token_revocations_collection=revocations))
+    revocation_list.is_revoked('warm-up')
+    assert wait_for(lambda: revocation_list.stats()['filter_entries'] == 0 and len(sync_threads()) >= 1)
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Report through the pipe; assertions cannot propagate out of the child
+        os.close(read_fd)
+        revocation_list._sync.interval = 0.05
+        checks = [not sync_threads()]
+        revoked_elsewhere(revocations, 'other-worker')
+        checks.append(revocation_list.is_revoked('other-worker'))
+        checks.append(len(sync_threads()) == 1)
+        # Later revocations by other workers reach this worker's filter through its own sync thread
+        revoked_elsewhere(revocations, 'later')
+        checks.append(wait_for(lambda: revocation_list.stats()['filter_entries'] == 2))
+        os.write(write_fd, ''.join('1' if check else '0' for check in checks).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        report = pipe.read()
+    os.waitpid(pid, 0)
+    assert report == '1111'
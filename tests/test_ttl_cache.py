@@ -0,0 +1,34 @@
+import time
+
+from src.utils.token_cache import TokenCache
+from src.utils.ttl_cache import TTLCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 3, 'misses': 1, 'evictions': 1}
+
+
+def test_entries_expire_and_ttl_can_only_shrink():
+    cache = TTLCache(max_size=10, ttl_seconds=0.05)
+    cache.set('short', 1)
+    cache.set('long', 2, ttl_seconds=60)
+    time.sleep(0.06)
+
+    assert cache.get('short') is None
+    assert cache.get('long') is None
+
+
+def test_token_entries_never_outlive_the_token():
+    cache = TokenCache(ttl_seconds=60)
+    cache.set('expired', {'email': 'user@example.com', 'exp': time.time() - 1})
+    cache.set('valid', {'email': 'user@example.com', 'exp': time.time() + 60})
+
+    assert cache.get('expired') is None
+    assert cache.get('valid')['email'] == 'user@example.com'
@@ -0,0 +1,98 @@
+import threading
+import time
+from argparse import Namespace
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from benchmarks.upstream_stub import StubState, make_handler
+from src.services.upstream_client import UpstreamClient
+from src.utils.rate_limiter import HostRateLimiter
+
+STUB_DEFAULTS = dict(pages=3, page_size=5, latency=0.0, fail_rate=0.0, throttle_rate=0.0, retry_after=1.0, max_rps=0)
+
+
+@pytest.fixture
+def upstream_stub():
+    """Start benchmarks/upstream_stub.py on a free port; call the result with stub options to get (url, state)"""
+    servers = []
+
+    def start(**options):
+        state = StubState(Namespace(**{**STUB_DEFAULTS, **options}))
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}/google/getReviews", state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_holds_the_host_slot_until_the_body_is_read(upstream_stub):
+    url, _ = upstream_stub()
+    client = UpstreamClient(per_host_concurrency=1)
+    slot = client.host_limiter._semaphore(urlparse(url).netloc)
+
+    with client.post_stream(url, {'selectedLocation': 'a'}) as response:
+        assert not slot.acquire(blocking=False)
+        assert b'reviews' in b''.join(response.iter_content(1024))
+
+    assert slot.acquire(blocking=False)
+    slot.release()
+    client.close()
+
+
+def test_retry_after_is_honoured_instead_of_backoff(upstream_stub):
+    url, state = upstream_stub(throttle_rate=1.0, retry_after=0.2)
+    client = UpstreamClient()
+    client.max_retries = 2
+    client.backoff_base = 30
+
+    started = time.monotonic()
+    with pytest.raises(requests.HTTPError):
+        client.post_json(url, {'selectedLocation': 'a'})
+
+    # Two 0.2s waits from Retry-After, not the 30s backoff
+    assert 0.4 <= time.monotonic() - started < 5
+    assert state.statuses[429] == 3
+    client.close()
+
+
+def test_backoff_stops_after_max_retries(upstream_stub):
+    url, state = upstream_stub(fail_rate=1.0)
+    client = UpstreamClient()
+    client.max_retries = 3
+    client.backoff_base = 0.01
+
+    with pytest.raises(requests.HTTPError) as raised:
+        client.post_json(url, {'selectedLocation': 'a'})
+
+    assert raised.value.response.status_code == 503
+    assert state.statuses[503] == client.max_retries + 1
+    client.close()
+
+
+def test_rate_limit_keeps_requests_under_the_stub_limit(upstream_stub):
+    url, state = upstream_stub(max_rps=5, retry_after=5)
+    client = UpstreamClient()
+    client.rate_limiter = HostRateLimiter(4, 1)
+
+    started = time.monotonic()
+    for page in range(6):
+        assert client.post_json(url, {'selectedLocation': 'a', 'pageToken': str(page % 3)})['reviews']
+
+    # A burst of one at 4/s spaces six requests over at least 1.25s, so the stub never throttles
+    assert time.monotonic() - started >= 1.2
+    assert state.statuses == {200: 6}
+
+    # Without the limiter the same requests overrun the stub
+    client.rate_limiter = HostRateLimiter(0, 1)
+    client.max_retries = 0
+    with pytest.raises(requests.HTTPError):
+        for page in range(6):
+            client.post_json(url, {'selectedLocation': 'a', 'pageToken': str(page % 3)})
+    client.close()
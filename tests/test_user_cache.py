@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.modal.user import User
+from src.services.user_cache import UserCache, UserInvalidationChannel
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def listener_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'user-cache-invalidation']
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+def test_forked_worker_listens_for_invalidations(mongo_client):
+    invalidations = mongo_client['ai_hub'].user_invalidations
+    cache = UserCache(ttl_seconds=3600)
+    cache.channel = UserInvalidationChannel(
+        cache, SimpleNamespace(user_invalidations_collection=invalidations), 'poll', 3600
+    )
+    cache.set(User(email='stale@example.com', password_hash='unused', role='user'))
+    assert listener_threads()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Report through the pipe; assertions cannot propagate out of the child
+        os.close(read_fd)
+        cache.channel._poller.interval = 0.05
+        checks = [not listener_threads()]
+        cache.set(User(email='user@example.com', password_hash='unused', role='user'))
+        checks.append(len(listener_threads()) == 1)
+        # The entry inherited from the parent missed invalidations made since the fork
+        checks.append(cache.get('stale@example.com') is None)
+        # Another worker deactivates the user
+        invalidations.insert_one({'email': 'user@example.com', 'created_at': datetime.utcnow()})
+        checks.append(wait_for(lambda: cache.get('user@example.com') is None))
+        os.write(write_fd, ''.join('1' if check else '0' for check in checks).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        report = pipe.read()
+    os.waitpid(pid, 0)
+    assert report == '1111'